@@ -14,6 +14,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.resolve()
 OUTPUT_DIR = PROJECT_ROOT / "output"
 LOG_DIR = OUTPUT_DIR / "logs"
+STATS_REPORT_FILE = LOG_DIR / "stats_report.json"   # Cardinality/percentile/technique summary per run
 
 # Ensure output directories exist on import
 OUTPUT_DIR.mkdir(exist_ok=True)
@@ -26,6 +27,16 @@ SPLUNK_HEC_URL = os.getenv("SPLUNK_HEC_URL", "https://localhost:8088")
 SPLUNK_HEC_TOKEN = os.getenv("SPLUNK_HEC_TOKEN", "YOUR-HEC-TOKEN-HERE")
 SPLUNK_INDEX = os.getenv("SPLUNK_INDEX", "attack_sim")
 SPLUNK_VERIFY_SSL = False  # Set True in production with valid certs
+HEC_ROUTES_FILE = os.getenv("HEC_ROUTES_FILE")  # Optional sourcetype → url/token/index table (JSON)
+
+# ─────────────────────────────────────────────
+# SYSLOG NETWORK SINK
+# ─────────────────────────────────────────────
+SYSLOG_HOST = os.getenv("SYSLOG_HOST", "127.0.0.1")
+SYSLOG_PORT = int(os.getenv("SYSLOG_PORT", "514"))
+SYSLOG_PROTOCOL = os.getenv("SYSLOG_PROTOCOL", "tcp")   # udp | tcp
+SYSLOG_FRAMING = "octet"             # TCP framing: RFC 6587 "octet" counting or "lf"
+SYSLOG_SNDBUF = 4 * 1024 * 1024      # SO_SNDBUF bytes (absorbs collector stalls)
 
 # ─────────────────────────────────────────────
 # SIMULATION DEFAULTS
@@ -34,6 +45,33 @@ DEFAULT_EVENT_COUNT = 500       # Events per generator run
 DEFAULT_TIME_SPAN_HOURS = 24   # Spread events across this window
 BENIGN_TRAFFIC_RATIO = 0.7     # 70% normal, 30% malicious (realistic mix)
 
+# ─────────────────────────────────────────────
+# CONTINUOUS DAEMON MODE
+# ─────────────────────────────────────────────
+DAEMON_LOG_DIR = LOG_DIR / "daemon"                            # Appended, rotated feed files
+DAEMON_CHECKPOINT_FILE = OUTPUT_DIR / "daemon_checkpoint.json"  # Resume state
+DAEMON_MAX_LOG_BYTES = 100 * 1024 * 1024   # Rotate each feed file at 100 MB
+DAEMON_LOG_BACKUPS = 5                     # Rotated files kept per feed
+
+# ─────────────────────────────────────────────
+# SEEDED RUNS / DATASET CACHE
+# ─────────────────────────────────────────────
+DATASET_CACHE_DIR = OUTPUT_DIR / "cache"                # Content-addressed generated logs
+DATASET_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024        # LRU-evict beyond 2 GB
+DATASET_CACHE_MODE = "hardlink"                         # hardlink | copy
+SEED_ANCHOR_SECONDS = 3600   # Seeded runs end at "now" floored to this (cache hits within the hour)
+
+# ─────────────────────────────────────────────
+# BENIGN BACKGROUND CORPUS
+# ─────────────────────────────────────────────
+BACKGROUND_DIR = OUTPUT_DIR / "background"   # Pre-serialized benign traffic per generator/format
+
+# ─────────────────────────────────────────────
+# OFFLINE DETECTION ENGINE
+# ─────────────────────────────────────────────
+DETECTION_OUTPUT_DIR = OUTPUT_DIR / "detections"   # Alerts (JSONL) from detection_engine runs
+BASELINE_CHECKPOINT_FILE = DETECTION_OUTPUT_DIR / "exfil_baselines.json"  # Per-host volume baselines
+
 # ─────────────────────────────────────────────
 # NETWORK SIMULATION RANGES (RFC 1918)
 # ─────────────────────────────────────────────
@@ -63,6 +101,34 @@ TARGET_HOSTS = {
     "workstation-042": {"ip": "10.0.1.42", "os": "Windows 11", "services": ["rdp", "smb"]},
 }
 
+# ─────────────────────────────────────────────
+# SYNTHETIC ASSET INVENTORY (scale-out beyond TARGET_HOSTS)
+# ─────────────────────────────────────────────
+INVENTORY_HOST_COUNT = int(os.getenv("INVENTORY_HOST_COUNT", "0"))  # Extra generated hosts
+INVENTORY_USER_COUNT = int(os.getenv("INVENTORY_USER_COUNT", "0"))  # Generated user accounts
+INVENTORY_SUBNETS = [
+    # (CIDR, role/hostname prefix, share of generated hosts)
+    ("10.16.0.0/14",   "ws",    0.80),   # Corporate workstations (~262k addresses)
+    ("10.32.0.0/16",   "srv",   0.15),   # Server farm
+    ("192.168.0.0/20", "admin", 0.05),   # IT admin segment
+]
+INVENTORY_SKEW = 1.1    # Zipf exponent for host/user activity (higher = more skewed)
+INVENTORY_SEED = 1337   # Inventory is generated identically on every run
+
+# ─────────────────────────────────────────────
+# EXTERNAL PAYLOAD / CREDENTIAL CORPORA
+# ─────────────────────────────────────────────
+# Point these at large newline-delimited wordlists (e.g. SecLists) to
+# replace the small built-in lists. Files are memory-mapped and indexed
+# on first use (a `<file>.idx` sidecar is written next to each one).
+PAYLOAD_CORPORA = {
+    "sqli":           os.getenv("CORPUS_SQLI"),
+    "xss":            os.getenv("CORPUS_XSS"),
+    "path_traversal": os.getenv("CORPUS_PATH_TRAVERSAL"),
+    "cmd_injection":  os.getenv("CORPUS_CMD_INJECTION"),
+    "usernames":      os.getenv("CORPUS_USERNAMES"),
+}
+
 # ─────────────────────────────────────────────
 # LOG FORMAT TEMPLATES
 # ─────────────────────────────────────────────
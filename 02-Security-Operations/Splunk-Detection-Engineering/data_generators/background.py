@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+background.py — Reusable Benign Background Corpus with Attack Injection
+
+Benign traffic is statistically the same from run to run, so it only
+needs to be generated and serialized once. `--build` writes a large,
+time-sorted, already formatted benign corpus per generator; later runs
+(`run_all_generators.py --background`) stream that corpus with its
+timestamps rebased to "now", generate only the malicious events, and
+merge the two into each generator's log file (and HEC/syslog feed).
+
+Corpus layout (config.BACKGROUND_DIR):
+    <generator>.<format>.log     # benign lines, oldest first
+    <generator>.<format>.json    # event count, span, newest timestamp, code version
+
+A corpus can cover a longer span than a run needs: only the part that
+falls inside the run's --time-span window is emitted.
+
+Usage:
+    python data_generators/background.py --build --all --events 1000000 --format json
+    python data_generators/background.py --list
+    python data_generators/run_all_generators.py --all --background --events 2000 --hec
+"""
+
+import sys
+import json
+import heapq
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_reader import iter_lines, last_line, line_timestamp
+from utils.dataset_cache import code_version
+from data_generators.replay_logs import TimestampShifter, hec_envelope
+
+
+def corpus_paths(gen_name: str, log_format: str) -> Tuple[Path, Path]:
+    base = config.BACKGROUND_DIR / gen_name
+    return base.with_name(f"{gen_name}.{log_format}.log"), base.with_name(f"{gen_name}.{log_format}.json")
+
+
+def build_background(
+    gen_name: str,
+    generator_class: type,
+    kwargs: Dict[str, Any],
+    event_count: int,
+    log_format: str,
+    time_span: int,
+) -> Dict[str, Any]:
+    """Generate `event_count` benign events for one generator and store them pre-serialized."""
+    generator = generator_class(
+        event_count=event_count,
+        log_format=log_format,
+        time_span_hours=time_span,
+        benign_ratio=1.0,
+        **kwargs,
+    )
+    log_path, meta_path = corpus_paths(gen_name, log_format)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = log_path.with_suffix(".tmp")
+    fmt = generator.formatter.format
+    with open(tmp, "w") as f:
+        for event in generator.iter_events():
+            f.write(fmt(event) + "\n")
+    tmp.replace(log_path)
+
+    meta = {
+        "generator": gen_name,
+        "sourcetype": generator.sourcetype,
+        "format": log_format,
+        "events": generator.benign_count,
+        "time_span_hours": time_span,
+        "newest": (line_timestamp(last_line(log_path) or b"", log_format) or b"").decode(),
+        "version": code_version(),
+        "built": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    meta_path.write_text(json.dumps(meta, indent=2))
+    return meta
+
+
+def load_background(gen_name: str, log_format: str) -> Optional[Dict[str, Any]]:
+    """
+    Metadata of the corpus for `gen_name` in `log_format`, or None if it
+    was never built. Raises ValueError if the corpus holds another format.
+    """
+    log_path, meta_path = corpus_paths(gen_name, log_format)
+    if not (log_path.exists() and meta_path.exists()):
+        return None
+    meta = json.loads(meta_path.read_text())
+    if meta.get("format") != log_format:
+        raise ValueError(f"{meta_path.name} describes a {meta.get('format')} corpus, not {log_format}")
+    meta["path"] = log_path
+    return meta
+
+
+# ── Streams ──────────────────────────────────────────────────
+def _background_lines(
+    path: Path, fmt: str, shifter: TimestampShifter, window_start: datetime
+) -> Iterator[Tuple[bytes, int, bytes]]:
+    """Rebased (timestamp, 0, line) for corpus lines inside the run window."""
+    shift = shifter.shift_s
+    # Compare in corpus time so lines before the window are skipped unshifted
+    first = (window_start - timedelta(seconds=shift)).strftime("%Y-%m-%dT%H:%M:%S").encode()
+    for line in iter_lines(path):
+        ts = line_timestamp(line, fmt)
+        if not ts or ts < first:
+            continue
+        if shift:
+            new_ts = shifter(ts)[0]
+            yield new_ts, 0, line.replace(ts, new_ts)
+        else:
+            yield ts, 0, line
+
+
+def _attack_lines(generator) -> Iterator[Tuple[bytes, int, bytes]]:
+    """Freshly generated malicious (timestamp, 1, line) in time order."""
+    fmt = generator.formatter.format
+    for event in generator.iter_events():
+        yield event["timestamp"].encode(), 1, fmt(event).encode("utf-8")
+
+
+# ── Run mode ─────────────────────────────────────────────────
+def run_with_background(
+    jobs: List[Tuple[str, type, Dict[str, Any]]],
+    event_count: int,
+    log_format: str,
+    time_span: int,
+    hec_sender=None,
+    syslog_sender=None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    For each (name, generator class, kwargs) job, merge the rebased
+    background corpus with `event_count` fresh malicious events into
+    `config.LOG_DIR/<name>.log` and any network sinks.
+
+    Returns:
+        Per-generator background/malicious event counts
+    """
+    start_time = datetime.utcnow()
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(hours=time_span)
+    epoch_of = TimestampShifter(0)
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Background Corpus + Attack Injection")
+    print(f"  Started: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"  Generators: {', '.join(name for name, _, _ in jobs)}")
+    print(f"  Malicious events per generator: {event_count} | Window: {time_span}h")
+    print("=" * 70)
+
+    counts: Dict[str, Dict[str, int]] = {}
+    for name, cls, kwargs in jobs:
+        try:
+            meta = load_background(name, log_format)
+        except ValueError as e:
+            print(f"\n  [WARNING] Background corpus for '{name}' unusable ({e}) — rebuild it with: "
+                  f"python data_generators/background.py --build --generators {name} --format {log_format}")
+            continue
+        if meta is None:
+            print(f"\n  [WARNING] No {log_format} background corpus for '{name}' — "
+                  f"build it with: python data_generators/background.py --build --generators {name} "
+                  f"--format {log_format}")
+            continue
+        if meta.get("version") != code_version():
+            print(f"  [WARNING] Background corpus for '{name}' was built from different "
+                  f"generator code — consider rebuilding it")
+
+        generator = cls(
+            event_count=event_count,
+            log_format=log_format,
+            time_span_hours=time_span,
+            benign_ratio=0.0,
+            **kwargs,
+        )
+        shifter = TimestampShifter.to_now(meta["newest"].encode(), now)
+        sourcetype = generator.sourcetype.encode()
+        index = (hec_sender.index_for(generator.sourcetype) if hec_sender else config.SPLUNK_INDEX).encode()
+        source = f"background:{name}".encode()
+        output_file = config.LOG_DIR / f"{name}.log"
+        output_file.unlink(missing_ok=True)  # may be a dataset-cache hardlink
+
+        background = attacks = 0
+        hec_buffer, syslog_buffer = [], []
+        with open(output_file, "wb") as f:
+            merged = heapq.merge(
+                _background_lines(meta["path"], log_format, shifter, window_start),
+                _attack_lines(generator),
+            )
+            for ts, kind, line in merged:
+                f.write(line + b"\n")
+                if kind:
+                    attacks += 1
+                else:
+                    background += 1
+                if hec_sender:
+                    hec_buffer.append(hec_envelope(line, log_format, index, sourcetype, source, epoch_of(ts)[1]))
+                    if len(hec_buffer) >= hec_sender.batch_size:
+                        hec_sender.send_serialized(b"\n".join(hec_buffer), len(hec_buffer))
+                        hec_buffer.clear()
+                if syslog_sender:
+                    syslog_buffer.append(line.decode("utf-8"))
+                    if len(syslog_buffer) >= syslog_sender.batch_size:
+                        syslog_sender.send_lines(syslog_buffer)
+                        syslog_buffer.clear()
+        if hec_buffer:
+            hec_sender.send_serialized(b"\n".join(hec_buffer), len(hec_buffer))
+        if syslog_buffer:
+            syslog_sender.send_lines(syslog_buffer)
+
+        counts[name] = {"background": background, "malicious": attacks}
+        if not background:
+            print(f"  [WARNING] Background corpus for '{name}' produced no lines inside the "
+                  f"{time_span}h window (corpus spans {meta['time_span_hours']}h up to {meta['newest']})")
+        print(f"  → {name:20s} {background:>9d} background + {attacks:>7d} malicious "
+              f"(shift {shifter.shift_s:+d}s) → {output_file.name}")
+
+    elapsed = (datetime.utcnow() - start_time).total_seconds()
+    total = sum(c["background"] + c["malicious"] for c in counts.values())
+    print("\n" + "=" * 70)
+    print("  BACKGROUND RUN COMPLETE")
+    print(f"  Total events:   {total} "
+          f"({sum(c['malicious'] for c in counts.values())} freshly generated)")
+    print(f"  Output dir:     {config.LOG_DIR}")
+    print(f"  Elapsed time:   {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} EPS)")
+    if hec_sender:
+        hec_sender.flush()
+        stats = hec_sender.get_stats()
+        print(f"  HEC sent:       {stats['events_sent']}")
+        print(f"  HEC failed:     {stats['events_failed']}")
+    if syslog_sender:
+        stats = syslog_sender.get_stats()
+        print(f"  Syslog sent:    {stats['messages_sent']}")
+        print(f"  Syslog dropped: {stats['dropped']}")
+    print("=" * 70)
+    return counts
+
+
+def main():
+    # Imported here: run_all_generators imports this module for --background
+    from data_generators.run_all_generators import GENERATORS
+
+    parser = argparse.ArgumentParser(description="Build or inspect benign background corpora")
+    parser.add_argument("--build", action="store_true", help="Generate the background corpora")
+    parser.add_argument("--list", action="store_true", help="Show the corpora that exist")
+    parser.add_argument("--all", action="store_true", help="Every registered generator")
+    parser.add_argument("--generators", type=str, default="",
+                        help=f"Comma-separated list: {','.join(GENERATORS.keys())}")
+    parser.add_argument("--events", type=int, default=100_000,
+                        help="Benign events per generator corpus (default: 100000)")
+    parser.add_argument("--format", choices=config.LOG_FORMATS, default=config.DEFAULT_LOG_FORMAT)
+    parser.add_argument("--time-span", type=int, default=config.DEFAULT_TIME_SPAN_HOURS,
+                        help="Hours the corpus covers (runs can use any window up to this)")
+    args = parser.parse_args()
+
+    if args.list or not args.build:
+        for meta_path in sorted(config.BACKGROUND_DIR.glob("*.json")):
+            meta = json.loads(meta_path.read_text())
+            stale = "" if meta.get("version") == code_version() else "  (stale)"
+            print(f"  {meta['generator']:20s} {meta['format']:6s} {meta['events']:>10d} events "
+                  f"{meta['time_span_hours']:>4d}h  built {meta['built']}{stale}")
+        return
+
+    if args.all:
+        selected = list(GENERATORS)
+    elif args.generators:
+        selected = [g.strip() for g in args.generators.split(",")]
+    else:
+        parser.error("Specify --all or --generators=name1,name2")
+    unknown = [g for g in selected if g not in GENERATORS]
+    if unknown:
+        parser.error(f"Unknown generator(s): {', '.join(unknown)}")
+
+    for name in selected:
+        start = datetime.utcnow()
+        meta = build_background(name, GENERATORS[name]["class"], GENERATORS[name]["kwargs"],
+                                args.events, args.format, args.time_span)
+        elapsed = (datetime.utcnow() - start).total_seconds()
+        print(f"  Built {name:20s} {meta['events']:>10d} {args.format} events in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,13 +19,18 @@ import random
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
 # Add project root to path for config imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 from utils.log_formatter import LogFormatter
 from utils.splunk_hec_sender import SplunkHECSender
+from utils.syslog_sender import SyslogSender
+from utils.corpus import open_corpus
+from utils.sampler import StratifiedSampler
+from utils.event_stats import EventStats
+from data_generators.inventory import get_inventory
 
 
 class BaseGenerator(ABC):
@@ -55,13 +60,34 @@ class BaseGenerator(ABC):
         self.benign_ratio = benign_ratio
         self.formatter = LogFormatter(format_type=log_format)
 
+        # Shared host/user population with O(1) lookups
+        self.inventory = get_inventory()
+
         # Output file path
         self.output_file = config.LOG_DIR / f"{self.name}.log"
 
+        # Timeline end (None = now); fixed for reproducible seeded runs
+        self.end_time: Optional[datetime] = None
+
+        # Optional StratifiedSampler applied inside iter_events()
+        self.sampler: Optional[StratifiedSampler] = None
+
         # Counters for summary
         self.malicious_count = 0
         self.benign_count = 0
 
+        # Streaming distribution summary of every emitted event
+        self.stats = EventStats()
+
+    @staticmethod
+    def _load_corpus(name: str, default: Sequence[str]) -> Sequence[str]:
+        """
+        Return the memory-mapped corpus configured for `name` in
+        config.PAYLOAD_CORPORA, or the built-in `default` list.
+        """
+        path = config.PAYLOAD_CORPORA.get(name)
+        return open_corpus(path) if path else default
+
     # ── Abstract methods subclasses MUST implement ───────────
     @abstractmethod
     def generate_malicious_event(self, timestamp: str) -> Dict[str, Any]:
@@ -80,7 +106,7 @@ class BaseGenerator(ABC):
         the configured time window, with slight clustering to mimic
         real-world traffic patterns (more events during work hours).
         """
-        now = datetime.utcnow()
+        now = self.end_time or datetime.utcnow()
         start = now - timedelta(hours=self.time_span_hours)
         timestamps = []
 
@@ -92,16 +118,71 @@ class BaseGenerator(ABC):
 
         return sorted(timestamps)
 
+    # ── Single-event dispatch ────────────────────────────────
+    def generate_event(self, timestamp: str, malicious: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Produce one event, choosing benign vs. malicious according to
+        `benign_ratio` (unless `malicious` is given) and updating the
+        summary counters.
+        """
+        if malicious is None:
+            malicious = random.random() >= self.benign_ratio
+        if not malicious:
+            self.benign_count += 1
+            return self.generate_benign_event(timestamp)
+        self.malicious_count += 1
+        return self.generate_malicious_event(timestamp)
+
+    def _event_slots(self) -> Iterator[Tuple[str, bool]]:
+        """(timestamp, malicious) per event in timestamp order; the split is drawn lazily."""
+        for ts in self._generate_timestamps():
+            yield ts, random.random() >= self.benign_ratio
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield this generator's events in timestamp order, so
+        several generators can be merged into one stream without
+        materializing their output.
+
+        With a `sampler` attached, the benign/malicious draw happens
+        first and events the sampler would discard are never built.
+        """
+        sampler = self.sampler
+        add_stats = self.stats.add
+        if sampler is None:
+            for ts, malicious in self._event_slots():
+                event = self.generate_event(ts, malicious)
+                add_stats(event)
+                yield event
+            return
+
+        sourcetype = self.sourcetype
+        for ts, malicious in self._event_slots():
+            rate = sampler.admit(malicious, sourcetype)
+            if rate is None:
+                continue
+            event = sampler.finalize(self.generate_event(ts, malicious), rate, sourcetype)
+            if event is not None:
+                add_stats(event)
+                yield event
+            elif malicious:  # dropped by the host stage — keep the counters on kept events
+                self.malicious_count -= 1
+            else:
+                self.benign_count -= 1
+
     # ── Main execution pipeline ──────────────────────────────
     def run(
         self,
         hec_sender: Optional[SplunkHECSender] = None,
+        syslog_sender: Optional[SyslogSender] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Generate events, write to file, optionally send to HEC.
+        Generate events, write to file, optionally send to HEC and/or syslog.
         
         Args:
-            hec_sender: If provided, events are also sent to Splunk HEC
+            hec_sender:    If provided, events are also sent to Splunk HEC
+            syslog_sender: If provided, formatted lines are also streamed
+                           to a syslog collector
         
         Returns:
             List of all generated event dictionaries
@@ -113,19 +194,7 @@ class BaseGenerator(ABC):
               f"Time span: {self.time_span_hours}h")
         print(f"{'='*60}")
 
-        timestamps = self._generate_timestamps()
-        all_events = []
-
-        for ts in timestamps:
-            # Decide if this event is benign or malicious
-            if random.random() < self.benign_ratio:
-                event = self.generate_benign_event(ts)
-                self.benign_count += 1
-            else:
-                event = self.generate_malicious_event(ts)
-                self.malicious_count += 1
-
-            all_events.append(event)
+        all_events = list(self.iter_events())
 
         # Write formatted logs to file
         self._write_to_file(all_events)
@@ -136,7 +205,18 @@ class BaseGenerator(ABC):
             results = hec_sender.send_batch(
                 all_events, sourcetype=self.sourcetype
             )
-            print(f"  HEC Results: {results['sent']} sent, {results['failed']} failed")
+            if "queued" in results:
+                print(f"  HEC Results: {results['queued']} queued for "
+                      f"index {hec_sender.index_for(self.sourcetype)}")
+            else:
+                print(f"  HEC Results: {results['sent']} sent, {results['failed']} failed")
+
+        # Optionally stream the formatted lines to a syslog collector
+        if syslog_sender:
+            print(f"  Sending {len(all_events)} events to syslog "
+                  f"{syslog_sender.protocol}://{syslog_sender.host}:{syslog_sender.port}...")
+            results = syslog_sender.send_lines(self.formatter.format(e) for e in all_events)
+            print(f"  Syslog Results: {results['sent']} sent, {results['dropped']} dropped")
 
         # Print summary
         self._print_summary()
@@ -144,6 +224,8 @@ class BaseGenerator(ABC):
 
     def _write_to_file(self, events: List[Dict[str, Any]]) -> None:
         """Write all events to the output log file."""
+        # Replace rather than truncate: the old file may be a dataset-cache hardlink
+        self.output_file.unlink(missing_ok=True)
         with open(self.output_file, "w") as f:
             for event in events:
                 f.write(self.formatter.format(event) + "\n")
@@ -155,7 +237,8 @@ class BaseGenerator(ABC):
         print(f"\n  Summary:")
         print(f"    Total events:     {total}")
         print(f"    Malicious events: {self.malicious_count} "
-              f"({self.malicious_count / total:.1%})")
+              f"({self.malicious_count / max(total, 1):.1%})")
         print(f"    Benign events:    {self.benign_count} "
-              f"({self.benign_count / total:.1%})")
+              f"({self.benign_count / max(total, 1):.1%})")
         print(f"    File size:        {self.output_file.stat().st_size / 1024:.1f} KB")
+        self.stats.print_summary()
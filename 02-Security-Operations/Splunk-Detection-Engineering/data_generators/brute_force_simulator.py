@@ -75,6 +75,9 @@ class BruteForceSimulator(BaseGenerator):
         self.service = self.SERVICES.get(service, self.SERVICES["ssh"])
         self.service_name = service
 
+        # Built-in username list unless an external corpus is configured
+        self.target_usernames = self._load_corpus("usernames", self.TARGET_USERNAMES)
+
         # Track per-attacker state for realistic burst patterns
         self._attacker_state = {}
 
@@ -89,8 +92,8 @@ class BruteForceSimulator(BaseGenerator):
         - Source IPs rotate to simulate distributed attacks
         """
         attacker_ip = random.choice(config.EXTERNAL_ATTACKER_IPS)
-        target = random.choice(list(config.TARGET_HOSTS.values()))
-        username = random.choice(self.TARGET_USERNAMES)
+        host_name, host_ip = self.inventory.sample_host()
+        username = random.choice(self.target_usernames)
 
         # 2% chance the attacker succeeds (realistic compromise)
         is_success = random.random() < 0.02
@@ -106,9 +109,9 @@ class BruteForceSimulator(BaseGenerator):
         event = {
             "timestamp": timestamp,
             "event_type": "authentication",
-            "hostname": [k for k, v in config.TARGET_HOSTS.items() if v == target][0],
+            "hostname": host_name,
             "src_ip": attacker_ip,
-            "dst_ip": target["ip"],
+            "dst_ip": host_ip,
             "dst_port": self.service["port"],
             "protocol": self.service["protocol"],
             "process": self.service["process"],
@@ -134,9 +137,12 @@ class BruteForceSimulator(BaseGenerator):
         These form the baseline that detection rules must NOT alert on.
         """
         src_subnet = random.choice(config.INTERNAL_SUBNETS)
-        src_ip = self._random_ip_from_subnet(src_subnet)
-        target = random.choice(list(config.TARGET_HOSTS.values()))
-        username = random.choice(self.LEGITIMATE_USERS)
+        src_ip = self.inventory.random_ip(src_subnet)
+        host_name, host_ip = self.inventory.sample_host()
+        if self.inventory.user_count:
+            username = self.inventory.sample_user()
+        else:
+            username = random.choice(self.LEGITIMATE_USERS)
 
         # Normal logins: 95% success, 5% typo/failure
         action = "success" if random.random() < 0.95 else "failure"
@@ -144,9 +150,9 @@ class BruteForceSimulator(BaseGenerator):
         return {
             "timestamp": timestamp,
             "event_type": "authentication",
-            "hostname": [k for k, v in config.TARGET_HOSTS.items() if v == target][0],
+            "hostname": host_name,
             "src_ip": src_ip,
-            "dst_ip": target["ip"],
+            "dst_ip": host_ip,
             "dst_port": self.service["port"],
             "protocol": self.service["protocol"],
             "process": self.service["process"],
@@ -164,14 +170,6 @@ class BruteForceSimulator(BaseGenerator):
             return f"Failed password for {username} from {src_ip} port {self.service['port']}"
         return f"Accepted password for {username} from {src_ip} port {self.service['port']}"
 
-    @staticmethod
-    def _random_ip_from_subnet(subnet: str) -> str:
-        """Generate a random IP within the given CIDR subnet."""
-        base = subnet.split("/")[0]
-        octets = base.split(".")
-        octets[3] = str(random.randint(10, 254))
-        return ".".join(octets)
-
 
 # ── CLI Entry Point ──────────────────────────────────────────
 def main():
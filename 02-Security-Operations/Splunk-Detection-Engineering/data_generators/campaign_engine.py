@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+campaign_engine.py — Stateful Multi-Actor Attack Campaign Engine
+
+The per-event simulators draw every malicious event independently, so
+there are no bursts, spray sequences or multi-host infections. This
+engine instead drives a large population of long-lived actors, each
+with its own state, and emits their actions in time order:
+
+    Brute-forcer  — bursts of failures (classic, spray or credential
+                    stuffing), pauses, retries, occasionally succeeds
+    Beacon        — an implant calling back to its C2 domain on a
+                    jittered interval over HTTP or DNS
+    Exfil host    — a compromised host pushing large uploads in chunks
+
+Actors are correlated: a brute-force success can implant a beacon on
+the compromised host, and a beacon can later start exfiltration from
+the same host — the Brute Force → C2 → Exfil chains the correlation
+searches look for.
+
+Data layout:
+    Actor state is struct-of-arrays — one packed `array` column per
+    field (≈22 bytes per actor). The scheduler is a binary heap of
+    packed ints `(due_ms << 24) | actor_id`, so a pending wake-up costs
+    one small int rather than a tuple. Up to 16.7M actors.
+
+    MITRE ATT&CK: T1110, T1110.003, T1071.001, T1071.004, T1048.001
+
+Usage:
+    python campaign_engine.py --brute-forcers 200000 --beacons 20000 --exfil-hosts 1000
+    python campaign_engine.py --duration 2 --seed 42 --format syslog
+"""
+
+import sys
+import time
+import heapq
+import random
+import argparse
+from array import array
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_formatter import LogFormatter
+from utils.entropy_pool import get_pool
+from utils.splunk_hec_sender import SplunkHECSender
+from data_generators.base_generator import BaseGenerator
+from data_generators.inventory import get_inventory, int_to_ip
+from data_generators.brute_force_simulator import BruteForceSimulator
+from data_generators.malware_callback_sim import MalwareCallbackSimulator, HEX_ALPHABET
+from data_generators.data_exfil_simulator import DataExfilSimulator
+
+ID_BITS = 24
+ID_MASK = (1 << ID_BITS) - 1
+
+KIND_BRUTE, KIND_BEACON, KIND_EXFIL = 0, 1, 2
+
+# Brute-forcer modes (flags bits 0-1)
+MODE_BRUTE, MODE_SPRAY, MODE_STUFF = 0, 1, 2
+# Beacon flags
+FLAG_DNS = 0x1
+FLAG_EXFIL_SPAWNED = 0x2
+
+# First octets used for synthetic public attacker addresses
+PUBLIC_FIRST_OCTETS = [5, 23, 31, 37, 45, 46, 62, 77, 80, 85, 91, 103, 104,
+                       138, 141, 159, 176, 178, 185, 188, 193, 195, 212, 217]
+
+
+class CampaignEngine:
+    """
+    Priority-queue driven simulation of many concurrent attack actors.
+    """
+
+    def __init__(
+        self,
+        duration_hours: float = 4.0,
+        brute_forcers: int = 1000,
+        beacons: int = 100,
+        exfil_hosts: int = 10,
+        success_prob: float = 0.02,
+        chain_prob: float = 0.5,
+        exfil_prob: float = 0.002,
+        beacon_interval: int = 60,
+        jitter: float = 0.15,
+        dns_ratio: float = 0.25,
+        seed: Optional[int] = None,
+    ):
+        if seed is not None:
+            random.seed(seed)
+        total = brute_forcers + beacons + exfil_hosts
+        if total > ID_MASK:
+            raise ValueError(f"At most {ID_MASK} actors are supported, got {total}")
+
+        self.duration_ms = int(duration_hours * 3600 * 1000)
+        self.start = datetime.utcnow().replace(microsecond=0) - timedelta(hours=duration_hours)
+        self.success_prob = success_prob
+        self.chain_prob = chain_prob
+        self.exfil_prob = exfil_prob
+        self.jitter = jitter
+        self.dns_ratio = dns_ratio
+
+        self.inventory = get_inventory()
+        self.usernames = BaseGenerator._load_corpus("usernames", BruteForceSimulator.TARGET_USERNAMES)
+        self.c2_domains = MalwareCallbackSimulator.C2_DOMAINS
+        self.c2_uris = MalwareCallbackSimulator.C2_URI_PATHS
+        self.exfil_destinations = DataExfilSimulator.EXFIL_DESTINATIONS
+        self.dns_server_ip = self.inventory.ip_for_host("dc-01")
+        self._hex_pool = get_pool(HEX_ALPHABET)
+        # Each C2 domain belongs to one campaign with its own base interval
+        self._c2_interval_ms = [
+            int(beacon_interval * 1000 * random.uniform(0.5, 2.0)) for _ in self.c2_domains
+        ]
+        self._c2_ips = [random.choice(config.EXTERNAL_ATTACKER_IPS) for _ in self.c2_domains]
+
+        # ── Actor state tables (one column per field) ──
+        self.kind = array("B")          # actor type
+        self.flags = array("B")         # mode / protocol / chain bits
+        self.host = array("I")          # inventory host id (target or infected host)
+        self.src = array("I")           # attacker / C2 address as int
+        self.aux = array("I")           # username cursor, C2 domain or destination index
+        self.remaining = array("I")     # attempts left in burst / chunks left
+        self.interval_ms = array("I")   # base inter-action gap
+
+        self._heap = []
+        self._spawned = []
+        self._ts_sec = -1
+        self._ts_prefix = ""
+        self.spawned_chains = 0
+
+        for _ in range(brute_forcers):
+            self._spawn_brute(random.randrange(self.duration_ms))
+        for _ in range(beacons):
+            self._spawn_beacon(self.inventory.sample_host_id(), random.randrange(self.duration_ms))
+        for _ in range(exfil_hosts):
+            self._spawn_exfil(self.inventory.sample_host_id(), random.randrange(self.duration_ms))
+        self._flush_spawned()
+
+    # ── Actor lifecycle ──────────────────────────────────────
+    def _new_actor(self, kind: int, flags: int, host: int, src: int, aux: int,
+                   remaining: int, interval_ms: int) -> int:
+        actor = len(self.kind)
+        if actor > ID_MASK:
+            raise ValueError("Actor table full")
+        self.kind.append(kind)
+        self.flags.append(flags)
+        self.host.append(host)
+        self.src.append(src)
+        self.aux.append(aux)
+        self.remaining.append(remaining)
+        self.interval_ms.append(interval_ms)
+        return actor
+
+    def _defer(self, actor: int, due_ms: int) -> None:
+        """Queue a new actor's first wake-up (pushed after the current step)."""
+        if due_ms < self.duration_ms:
+            self._spawned.append((due_ms << ID_BITS) | actor)
+
+    def _flush_spawned(self) -> None:
+        for packed in self._spawned:
+            heapq.heappush(self._heap, packed)
+        self._spawned.clear()
+
+    @staticmethod
+    def _random_public_ip() -> int:
+        return (random.choice(PUBLIC_FIRST_OCTETS) << 24) | random.getrandbits(24)
+
+    def _spawn_brute(self, due_ms: int) -> None:
+        mode = random.choices((MODE_BRUTE, MODE_SPRAY, MODE_STUFF), weights=(0.5, 0.3, 0.2))[0]
+        actor = self._new_actor(
+            KIND_BRUTE, mode,
+            host=self.inventory.sample_host_id(),
+            src=self._random_public_ip(),
+            aux=random.randrange(len(self.usernames)),
+            remaining=random.randint(10, 200),
+            interval_ms=random.randint(200, 3000),
+        )
+        self._defer(actor, due_ms)
+
+    def _spawn_beacon(self, host: int, due_ms: int) -> None:
+        domain = random.randrange(len(self.c2_domains))
+        flags = FLAG_DNS if random.random() < self.dns_ratio else 0
+        actor = self._new_actor(
+            KIND_BEACON, flags, host=host, src=0, aux=domain,
+            remaining=0, interval_ms=self._c2_interval_ms[domain],
+        )
+        self._defer(actor, due_ms)
+
+    def _spawn_exfil(self, host: int, due_ms: int) -> None:
+        actor = self._new_actor(
+            KIND_EXFIL, 0, host=host, src=0,
+            aux=random.randrange(len(self.exfil_destinations)),
+            remaining=random.randint(3, 20),
+            interval_ms=random.randint(30_000, 300_000),
+        )
+        self._defer(actor, due_ms)
+
+    # ── Timestamp formatting ─────────────────────────────────
+    def _timestamp(self, t_ms: int) -> str:
+        sec, ms = divmod(t_ms, 1000)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = (self.start + timedelta(seconds=sec)).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._ts_prefix}.{ms:03d}000Z"
+
+    # ── Actor steps: emit one event, return next due time (-1 = retire) ──
+    def _step_brute(self, actor: int, now: int):
+        # Hot path: random() arithmetic instead of randint()/randrange()
+        rand = random.random
+        mode = self.flags[actor]
+        users = self.usernames
+        if mode == MODE_STUFF:
+            username = users[int(rand() * len(users))]
+        else:
+            username = users[self.aux[actor] % len(users)]
+            if mode == MODE_SPRAY:
+                self.aux[actor] += 1
+
+        self.remaining[actor] -= 1
+        last = self.remaining[actor] == 0
+        success = last and rand() < self.success_prob
+        action = "success" if success else "failure"
+        host = self.host[actor]
+        src_ip = int_to_ip(self.src[actor])
+        technique = config.MITRE_TECHNIQUES["password_spraying" if mode == MODE_SPRAY else "brute_force"]
+
+        event = {
+            "timestamp": self._timestamp(now),
+            "event_type": "authentication",
+            "hostname": self.inventory.hostnames[host],
+            "src_ip": src_ip,
+            "dst_ip": self.inventory.ip_strs[host],
+            "dst_port": 22,
+            "protocol": "ssh",
+            "process": "sshd",
+            "pid": 1000 + int(rand() * 64536),
+            "username": username,
+            "action": action,
+            "severity": 2 if success else 4,
+            "attack_pattern": ("brute_force", "password_spray", "credential_stuff")[mode],
+            "mitre_technique": technique["id"],
+            "mitre_tactic": technique["tactic"],
+            "message": (f"{'Accepted' if success else 'Failed'} password for {username} "
+                        f"from {src_ip} port 22"),
+            "is_malicious": True,
+            "sourcetype": "attack_sim:auth",
+            "actor_id": actor,
+        }
+
+        if success:
+            event["alert_note"] = "POTENTIAL COMPROMISE — successful login after brute force"
+            if random.random() < self.chain_prob:
+                self.spawned_chains += 1
+                self._spawn_beacon(host, now + random.randint(5, 30) * 60_000)
+            return event, -1
+        if not last:
+            gap = self.interval_ms[actor]
+            return event, now + gap // 2 + int(rand() * gap)
+        if rand() < 0.5:
+            # Persistent attacker: new burst after a cool-down
+            self.remaining[actor] = random.randint(10, 200)
+            if mode == MODE_STUFF:
+                self.src[actor] = self._random_public_ip()
+            return event, now + random.randint(10, 60) * 60_000
+        return event, -1
+
+    def _step_beacon(self, actor: int, now: int):
+        host = self.host[actor]
+        host_name, host_ip = self.inventory.hostnames[host], self.inventory.ip_strs[host]
+        domain_idx = self.aux[actor]
+        domain = self.c2_domains[domain_idx]
+        flags = self.flags[actor]
+
+        if flags & FLAG_DNS:
+            label = self._hex_pool.text(random.randint(20, 60))
+            query_name = f"{label}.{domain}"
+            technique = config.MITRE_TECHNIQUES["c2_dns"]
+            event = {
+                "timestamp": self._timestamp(now),
+                "event_type": "dns_query",
+                "hostname": host_name,
+                "src_ip": host_ip,
+                "dst_ip": self.dns_server_ip,
+                "dst_port": 53,
+                "query_name": query_name,
+                "query_type": random.choice(["A", "TXT", "TXT", "CNAME", "NULL"]),
+                "domain": domain,
+                "subdomain_length": len(label),
+                "response_code": "NOERROR",
+                "severity": 3,
+                "mitre_technique": technique["id"],
+                "mitre_tactic": technique["tactic"],
+                "message": f"DNS tunnel query from {host_ip}: {query_name}",
+                "is_malicious": True,
+                "sourcetype": "attack_sim:proxy",
+                "actor_id": actor,
+            }
+        else:
+            uri = self.c2_uris[(actor + now // self.interval_ms[actor]) % len(self.c2_uris)]
+            technique = config.MITRE_TECHNIQUES["c2_http"]
+            payload_size = random.randint(64, 2048)
+            event = {
+                "timestamp": self._timestamp(now),
+                "event_type": "http_request",
+                "hostname": host_name,
+                "src_ip": host_ip,
+                "dst_ip": self._c2_ips[domain_idx],
+                "dst_port": 443,
+                "method": "POST",
+                "url": f"https://{domain}{uri}",
+                "domain": domain,
+                "status_code": 200,
+                "bytes_out": payload_size,
+                "bytes_in": random.choice([128, 256, 512, 4096, 8192]),
+                "content_type": "application/octet-stream",
+                "severity": 3,
+                "mitre_technique": technique["id"],
+                "mitre_tactic": technique["tactic"],
+                "beacon_interval": self.interval_ms[actor] // 1000,
+                "message": f"C2 HTTP beacon from {host_ip} to {domain}{uri}",
+                "is_malicious": True,
+                "sourcetype": "attack_sim:proxy",
+                "actor_id": actor,
+            }
+
+        if not flags & FLAG_EXFIL_SPAWNED and random.random() < self.exfil_prob:
+            self.flags[actor] = flags | FLAG_EXFIL_SPAWNED
+            self.spawned_chains += 1
+            self._spawn_exfil(host, now + random.randint(1, 10) * 60_000)
+
+        base = self.interval_ms[actor]
+        return event, now + max(int(base * (1 + self.jitter * random.uniform(-1, 1))), 5000)
+
+    def _step_exfil(self, actor: int, now: int):
+        host = self.host[actor]
+        host_ip = self.inventory.ip_strs[host]
+        destination = self.exfil_destinations[self.aux[actor]]
+        bytes_out = random.randint(5_000_000, 500_000_000)
+        bytes_in = random.randint(100, 5000)
+        technique = config.MITRE_TECHNIQUES["exfil_http"]
+
+        event = {
+            "timestamp": self._timestamp(now),
+            "event_type": "network_flow",
+            "hostname": self.inventory.hostnames[host],
+            "src_ip": host_ip,
+            "dst_ip": destination["ip"],
+            "dst_port": 443,
+            "protocol": "https",
+            "domain": destination["domain"],
+            "destination_type": destination["type"],
+            "bytes_out": bytes_out,
+            "bytes_in": bytes_in,
+            "duration_seconds": round(bytes_out / random.randint(500_000, 5_000_000), 1),
+            "transfer_ratio": round(bytes_out / bytes_in, 1),
+            "severity": 2,
+            "mitre_technique": technique["id"],
+            "mitre_tactic": technique["tactic"],
+            "message": (
+                f"Large data transfer: {host_ip} → {destination['domain']} "
+                f"({bytes_out / 1_000_000:.1f} MB out, {bytes_in / 1000:.1f} KB in)"
+            ),
+            "is_malicious": True,
+            "sourcetype": "attack_sim:netflow",
+            "actor_id": actor,
+        }
+
+        self.remaining[actor] -= 1
+        if self.remaining[actor] == 0:
+            return event, -1
+        gap = self.interval_ms[actor]
+        return event, now + random.randint(gap // 2, gap * 3 // 2)
+
+    # ── Main loop ────────────────────────────────────────────
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Yield every actor action across the campaign window, in time order."""
+        heap = self._heap
+        kinds = self.kind
+        steps = (self._step_brute, self._step_beacon, self._step_exfil)
+        duration = self.duration_ms
+
+        while heap:
+            packed = heap[0]
+            actor = packed & ID_MASK
+            event, next_due = steps[kinds[actor]](actor, packed >> ID_BITS)
+            if 0 <= next_due < duration:
+                heapq.heapreplace(heap, (next_due << ID_BITS) | actor)
+            else:
+                heapq.heappop(heap)
+            if self._spawned:
+                self._flush_spawned()
+            yield event
+
+    @property
+    def actor_count(self) -> int:
+        return len(self.kind)
+
+    def state_bytes_per_actor(self) -> int:
+        """Bytes of per-actor state across all state-table columns."""
+        return sum(col.itemsize for col in (
+            self.kind, self.flags, self.host, self.src,
+            self.aux, self.remaining, self.interval_ms,
+        ))
+
+
+# ── CLI Entry Point ──────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate correlated multi-actor attack campaigns"
+    )
+    parser.add_argument("--brute-forcers", type=int, default=1000)
+    parser.add_argument("--beacons", type=int, default=100)
+    parser.add_argument("--exfil-hosts", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=4.0,
+                        help="Campaign window in hours, ending now (default: 4)")
+    parser.add_argument("--success-prob", type=float, default=0.02,
+                        help="Chance a brute-force burst ends in a successful login")
+    parser.add_argument("--chain-prob", type=float, default=0.5,
+                        help="Chance a compromise implants a beacon on the host")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["json", "syslog", "cef"], default="json")
+    parser.add_argument("--hec", action="store_true", help="Send events to Splunk HEC")
+    parser.add_argument("--hec-url", type=str, default=config.SPLUNK_HEC_URL)
+    parser.add_argument("--hec-token", type=str, default=config.SPLUNK_HEC_TOKEN)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = CampaignEngine(
+        duration_hours=args.duration,
+        brute_forcers=args.brute_forcers,
+        beacons=args.beacons,
+        exfil_hosts=args.exfil_hosts,
+        success_prob=args.success_prob,
+        chain_prob=args.chain_prob,
+        seed=args.seed,
+    )
+    setup_s = time.perf_counter() - started
+
+    hec_sender = None
+    if args.hec:
+        hec_sender = SplunkHECSender(
+            hec_url=args.hec_url,
+            hec_token=args.hec_token,
+            index=config.SPLUNK_INDEX,
+        )
+
+    print(f"\n{'='*60}")
+    print("  Campaign Engine")
+    print(f"  Actors: {engine.actor_count} | Window: {args.duration}h | "
+          f"State: {engine.state_bytes_per_actor()} B/actor")
+    print(f"{'='*60}")
+
+    formatter = LogFormatter(format_type=args.format)
+    output_file = config.LOG_DIR / "campaign.log"
+    counts = {}
+    hec_buffer = []
+    peak_queue = len(engine._heap)
+    loop_start = time.perf_counter()
+    with open(output_file, "w") as f:
+        for n, event in enumerate(engine.iter_events()):
+            sourcetype = event["sourcetype"]
+            counts[sourcetype] = counts.get(sourcetype, 0) + 1
+            f.write(formatter.format(event) + "\n")
+            if hec_sender:
+                hec_buffer.append((sourcetype, event))
+                if len(hec_buffer) >= hec_sender.batch_size:
+                    hec_sender.send_tagged_batch(hec_buffer)
+                    hec_buffer.clear()
+            if not n & 0xFFFF:
+                peak_queue = max(peak_queue, len(engine._heap))
+    if hec_buffer:
+        hec_sender.send_tagged_batch(hec_buffer)
+    elapsed = time.perf_counter() - loop_start
+
+    total = sum(counts.values())
+    print("\n  Summary:")
+    for sourcetype, count in sorted(counts.items()):
+        print(f"    {sourcetype:22s} {count:>10d}")
+    print(f"    Total events:     {total}")
+    print(f"    Actors:           {engine.actor_count} ({engine.spawned_chains} spawned by chains)")
+    print(f"    Peak queue:       {peak_queue}")
+    print(f"    Setup / run:      {setup_s:.1f}s / {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:,.0f} EPS incl. formatting + disk)")
+    print(f"    Output:           {output_file}")
+
+
+if __name__ == "__main__":
+    main()
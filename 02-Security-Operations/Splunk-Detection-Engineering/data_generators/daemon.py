@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+daemon.py — Continuous Generation with Checkpointing and Append-Resume
+
+Runs the selected generators indefinitely as a long-lived feed. Events
+are produced in fixed-size batches (bounded memory), appended to
+rotating per-generator files under `config.DAEMON_LOG_DIR`, optionally
+pushed to HEC, and a checkpoint is written after every batch.
+
+Exact resume:
+    The simulated timeline is deterministic — event i is stamped
+    `timeline_start + i / eps` and comes from generator `i mod N` — and
+    the checkpoint stores the RNG state, the next event index, every
+    feed file's committed byte offset and the HEC position. On restart,
+    bytes written after the last checkpoint are truncated and generation
+    continues with the identical RNG stream, so the files contain no
+    gaps and no duplicates. After downtime the daemon backfills the
+    missed stretch at full speed, then paces itself to the wall clock.
+
+    HEC delivery is at-least-once: a crash between a batch POST and the
+    checkpoint write re-sends that one batch.
+
+Usage:
+    python daemon.py --all --eps 20
+    python daemon.py --generators brute_force,web_attack --eps 100 --hec
+    python daemon.py --all --eps 20 --reset      # discard checkpoint, start fresh
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.rotating_writer import RotatingFileWriter
+from utils.splunk_hec_sender import SplunkHECSender
+from data_generators.run_all_generators import GENERATORS
+
+CHECKPOINT_VERSION = 1
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+class GeneratorDaemon:
+    """
+    Long-running, resumable event feed over one or more generators.
+    """
+
+    def __init__(
+        self,
+        selected: List[str],
+        eps: float,
+        log_format: str = config.DEFAULT_LOG_FORMAT,
+        checkpoint_file: Path = config.DAEMON_CHECKPOINT_FILE,
+        hec_sender: Optional[SplunkHECSender] = None,
+        seed: Optional[int] = None,
+        max_bytes: int = config.DAEMON_MAX_LOG_BYTES,
+        backup_count: int = config.DAEMON_LOG_BACKUPS,
+    ):
+        if eps <= 0:
+            raise ValueError(f"EPS must be positive, got {eps}")
+        self.checkpoint_file = Path(checkpoint_file)
+        self.hec_sender = hec_sender
+        self._stop = False
+
+        checkpoint = self._load_checkpoint()
+        if checkpoint:
+            for key, value in (("generators", selected), ("eps", eps), ("format", log_format)):
+                if checkpoint[key] != value:
+                    raise ValueError(
+                        f"Checkpoint was created with {key}={checkpoint[key]!r}, "
+                        f"not {value!r} — pass --reset to start a new feed"
+                    )
+            seed = checkpoint["seed"]
+        elif seed is None:
+            seed = random.randrange(2 ** 32)
+
+        self.selected = selected
+        self.eps = eps
+        self.log_format = log_format
+        self.seed = seed
+        self.batch_events = max(1, int(eps))  # one simulated second per batch
+
+        # Seed before instantiating so per-generator setup (e.g. the
+        # infected host sample) is identical on every restart
+        random.seed(seed)
+        self.generators = {}
+        for name in selected:
+            gen_config = GENERATORS[name]
+            self.generators[name] = gen_config["class"](
+                log_format=log_format, **gen_config["kwargs"]
+            )
+
+        config.DAEMON_LOG_DIR.mkdir(parents=True, exist_ok=True)
+        offsets = checkpoint["files"] if checkpoint else {}
+        self.writers = {
+            name: RotatingFileWriter(
+                config.DAEMON_LOG_DIR / f"{name}.log",
+                max_bytes=max_bytes,
+                backup_count=backup_count,
+                resume_offset=offsets.get(name, 0 if checkpoint else None),
+            )
+            for name in selected
+        }
+
+        if checkpoint:
+            self.timeline_start = datetime.strptime(checkpoint["timeline_start"], TIMESTAMP_FORMAT)
+            self.event_index = checkpoint["event_index"]
+            state = checkpoint["rng_state"]
+            random.setstate((state[0], tuple(state[1]), state[2]))
+            if hec_sender:
+                hec_sender.events_sent = checkpoint["hec"]["events_sent"]
+                hec_sender.events_failed = checkpoint["hec"]["events_failed"]
+            print(f"  Resuming feed at event #{self.event_index} "
+                  f"(last timestamp {checkpoint['last_timestamp']})")
+        else:
+            self.timeline_start = datetime.utcnow()
+            self.event_index = 0
+            print(f"  Starting new feed (seed {seed})")
+
+    # ── Checkpointing ────────────────────────────────────────
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_file.exists():
+            return None
+        with open(self.checkpoint_file) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.checkpoint_file}")
+        return checkpoint
+
+    def _write_checkpoint(self) -> None:
+        """Atomically replace the checkpoint (write temp file, fsync, rename)."""
+        state = random.getstate()
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "generators": self.selected,
+            "eps": self.eps,
+            "format": self.log_format,
+            "seed": self.seed,
+            "timeline_start": self.timeline_start.strftime(TIMESTAMP_FORMAT),
+            "event_index": self.event_index,
+            "last_timestamp": self._timestamp(self.event_index - 1).strftime(TIMESTAMP_FORMAT),
+            "rng_state": [state[0], list(state[1]), state[2]],
+            "files": {name: w.offset for name, w in self.writers.items()},
+            "hec": {
+                "position": self.event_index if self.hec_sender else 0,
+                "events_sent": self.hec_sender.events_sent if self.hec_sender else 0,
+                "events_failed": self.hec_sender.events_failed if self.hec_sender else 0,
+            },
+            "updated": datetime.utcnow().strftime(TIMESTAMP_FORMAT),
+        }
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_file)
+
+    # ── Generation loop ──────────────────────────────────────
+    def _timestamp(self, index: int) -> datetime:
+        return self.timeline_start + timedelta(seconds=index / self.eps)
+
+    def _run_batch(self) -> None:
+        """Generate, write and deliver one batch, then checkpoint."""
+        hec_buffers = {name: [] for name in self.selected}
+        for _ in range(self.batch_events):
+            name = self.selected[self.event_index % len(self.selected)]
+            generator = self.generators[name]
+            ts = self._timestamp(self.event_index).strftime(TIMESTAMP_FORMAT)
+            event = generator.generate_event(ts)
+            self.writers[name].write(generator.formatter.format(event))
+            if self.hec_sender:
+                hec_buffers[name].append(event)
+            self.event_index += 1
+
+        for writer in self.writers.values():
+            writer.flush()
+        if self.hec_sender:
+            for name, buffer in hec_buffers.items():
+                if buffer:
+                    self.hec_sender.send_batch(buffer, sourcetype=self.generators[name].sourcetype)
+        # Commit the batch before rotating: a crash mid-rotation then resumes
+        # after it instead of regenerating it into the fresh file. Once
+        # rotated, checkpoint again so the new file's offset is recorded.
+        self._write_checkpoint()
+        rotating = [writer for writer in self.writers.values() if writer.should_rotate()]
+        for writer in rotating:
+            writer.rotate()
+        if rotating:
+            self._write_checkpoint()
+
+    def run(self, max_events: Optional[int] = None) -> None:
+        """Generate until stopped by SIGINT/SIGTERM (or `max_events`, for testing)."""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        started = self.event_index
+        last_report = time.monotonic()
+        try:
+            while not self._stop:
+                if max_events is not None and self.event_index - started >= max_events:
+                    break
+                # Hold the feed to the wall clock once any backlog is filled
+                wait = (self._timestamp(self.event_index) - datetime.utcnow()).total_seconds()
+                if wait > 0:
+                    time.sleep(wait)
+                    if self._stop:
+                        break
+                self._run_batch()
+
+                if time.monotonic() - last_report >= 60:
+                    lag = (datetime.utcnow() - self._timestamp(self.event_index)).total_seconds()
+                    print(f"  [daemon] {self.event_index} events | "
+                          f"{'backfilling, ' + format(lag, '.0f') + 's behind' if lag > 1 else 'live'}")
+                    last_report = time.monotonic()
+        finally:
+            for writer in self.writers.values():
+                writer.close()
+            print(f"\n  Daemon stopped at event #{self.event_index} "
+                  f"({self.event_index - started} this session)")
+            print(f"  Checkpoint: {self.checkpoint_file}")
+
+    def _request_stop(self, signum, frame) -> None:
+        # Finish the current batch so the checkpoint stays consistent
+        self._stop = True
+
+
+# ── CLI Entry Point ──────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(
+        description="Continuously generate attack simulation events with checkpoint/resume"
+    )
+    parser.add_argument("--all", action="store_true", help="Run all generators")
+    parser.add_argument("--generators", type=str, default="",
+                        help=f"Comma-separated list: {','.join(GENERATORS.keys())}")
+    parser.add_argument("--eps", type=float, default=10.0,
+                        help="Aggregate events per second (default: 10)")
+    parser.add_argument("--format", choices=["json", "syslog", "cef"],
+                        default=config.DEFAULT_LOG_FORMAT)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="RNG seed for a new feed (ignored when resuming)")
+    parser.add_argument("--checkpoint", type=str, default=str(config.DAEMON_CHECKPOINT_FILE))
+    parser.add_argument("--reset", action="store_true",
+                        help="Delete the checkpoint and start a new feed")
+    parser.add_argument("--max-events", type=int, default=None,
+                        help="Stop after this many events (testing)")
+    parser.add_argument("--hec", action="store_true", help="Send events to Splunk HEC")
+    parser.add_argument("--hec-url", type=str, default=config.SPLUNK_HEC_URL)
+    parser.add_argument("--hec-token", type=str, default=config.SPLUNK_HEC_TOKEN)
+    args = parser.parse_args()
+
+    if args.all:
+        selected = list(GENERATORS.keys())
+    elif args.generators:
+        selected = [g.strip() for g in args.generators.split(",")]
+    else:
+        parser.error("Specify --all or --generators=name1,name2")
+    unknown = [g for g in selected if g not in GENERATORS]
+    if unknown:
+        parser.error(f"Unknown generator(s): {', '.join(unknown)}")
+
+    checkpoint = Path(args.checkpoint)
+    if args.reset and checkpoint.exists():
+        checkpoint.unlink()
+
+    hec_sender = None
+    if args.hec:
+        hec_sender = SplunkHECSender(
+            hec_url=args.hec_url,
+            hec_token=args.hec_token,
+            index=config.SPLUNK_INDEX,
+        )
+
+    try:
+        daemon = GeneratorDaemon(
+            selected=selected,
+            eps=args.eps,
+            log_format=args.format,
+            checkpoint_file=checkpoint,
+            hec_sender=hec_sender,
+            seed=args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    daemon.run(max_events=args.max_events)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,7 @@ import random
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
@@ -67,6 +67,9 @@ class DataExfilSimulator(BaseGenerator):
         {"domain": "sharepoint.com",         "ip": "13.107.136.9",  "type": "corporate_cloud"},
     ]
 
+    # Hours (UTC) that count as off-business for shifted transfers
+    OFF_HOURS = (22, 23, 0, 1, 2, 3, 4)
+
     def __init__(self, protocol: str = "https", off_hours: bool = False, **kwargs):
         super().__init__(
             name="data_exfiltration",
@@ -85,7 +88,7 @@ class DataExfilSimulator(BaseGenerator):
         - Destinations are file-sharing / paste sites
         - Timing clustered during off-hours
         """
-        host_name, host_info = random.choice(list(config.TARGET_HOSTS.items()))
+        host_name, host_ip = self.inventory.sample_host()
         destination = random.choice(self.EXFIL_DESTINATIONS)
 
         # Exfil transfers are notably larger than normal
@@ -103,7 +106,7 @@ class DataExfilSimulator(BaseGenerator):
             "timestamp": timestamp,
             "event_type": "network_flow",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
+            "src_ip": host_ip,
             "dst_ip": destination["ip"],
             "dst_port": 443 if self.protocol == "https" else 53,
             "protocol": self.protocol,
@@ -117,7 +120,7 @@ class DataExfilSimulator(BaseGenerator):
             "mitre_technique": config.MITRE_TECHNIQUES["exfil_http"]["id"],
             "mitre_tactic": config.MITRE_TECHNIQUES["exfil_http"]["tactic"],
             "message": (
-                f"Large data transfer: {host_info['ip']} → {destination['domain']} "
+                f"Large data transfer: {host_ip} → {destination['domain']} "
                 f"({bytes_out / 1_000_000:.1f} MB out, {bytes_in / 1000:.1f} KB in)"
             ),
             "is_malicious": True,
@@ -128,7 +131,7 @@ class DataExfilSimulator(BaseGenerator):
         Normal network transfer — cloud sync, backups, web browsing.
         These represent the baseline that exfil detection must NOT flag.
         """
-        host_name, host_info = random.choice(list(config.TARGET_HOSTS.items()))
+        host_name, host_ip = self.inventory.sample_host()
         destination = random.choice(self.LEGIT_DESTINATIONS)
 
         # Normal transfers: 1KB–5MB (occasional larger backups)
@@ -144,7 +147,7 @@ class DataExfilSimulator(BaseGenerator):
             "timestamp": timestamp,
             "event_type": "network_flow",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
+            "src_ip": host_ip,
             "dst_ip": destination["ip"],
             "dst_port": 443,
             "protocol": "https",
@@ -156,18 +159,36 @@ class DataExfilSimulator(BaseGenerator):
             "transfer_ratio": round(bytes_out / max(bytes_in, 1), 1),
             "severity": 6,
             "message": (
-                f"Normal transfer: {host_info['ip']} → {destination['domain']} "
+                f"Normal transfer: {host_ip} → {destination['domain']} "
                 f"({bytes_out / 1000:.1f} KB)"
             ),
             "is_malicious": False,
         }
 
-    @staticmethod
-    def _shift_to_off_hours(timestamp: str) -> str:
-        """Move an event timestamp to off-business-hours (22:00–05:00)."""
+    def _event_slots(self) -> Iterator[Tuple[str, bool]]:
+        """
+        Off-hours shifting moves malicious events within their day, which
+        breaks timestamp order. Shift them while drawing the slots and sort
+        only the (timestamp, malicious) list, so events are still built
+        one at a time and merged streams stay sorted.
+        """
+        if not self.off_hours:
+            return super()._event_slots()
+        slots = []
+        for ts in self._generate_timestamps():
+            malicious = random.random() >= self.benign_ratio
+            slots.append((self._shift_to_off_hours(ts) if malicious else ts, malicious))
+        slots.sort(key=lambda slot: slot[0])
+        return iter(slots)
+
+    @classmethod
+    def _shift_to_off_hours(cls, timestamp: str) -> str:
+        """Move an event timestamp to off-business-hours (22:00–05:00); off-hours ones stay put."""
         try:
             dt = datetime.fromisoformat(timestamp.replace("Z", ""))
-            off_hour = random.choice([22, 23, 0, 1, 2, 3, 4])
+            if dt.hour in cls.OFF_HOURS:
+                return timestamp
+            off_hour = random.choice(cls.OFF_HOURS)
             dt = dt.replace(hour=off_hour, minute=random.randint(0, 59))
             return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
         except ValueError:
@@ -0,0 +1,250 @@
+"""
+inventory.py — Synthetic Asset Inventory Shared by All Generators
+
+Builds one host/user population per process and gives the simulators
+constant-time lookups into it, replacing the per-event linear scans
+over `config.TARGET_HOSTS`.
+
+Population:
+    - The core `config.TARGET_HOSTS` are always present, unchanged
+    - `config.INVENTORY_HOST_COUNT` extra hosts are generated across the
+      arbitrary-size CIDRs in `config.INVENTORY_SUBNETS`
+    - `config.INVENTORY_USER_COUNT` generated user accounts
+
+Data layout:
+    - Host IPs are stored as a packed unsigned-int array; hostnames and
+      dotted-quad strings are parallel lists indexed by host id
+    - hostname → id and IP → id are dict indexes (O(1) both ways)
+    - Host and user activity is Zipf-skewed (a few busy machines, a long
+      tail of quiet ones) and sampled in O(1) with Vose alias tables
+
+The inventory is generated from its own seeded RNG, so it is identical
+across runs and does not disturb the global `random` stream.
+
+Usage:
+    from data_generators.inventory import get_inventory
+
+    inventory = get_inventory()
+    host_name, host_ip = inventory.sample_host()
+    src_ip = inventory.random_ip("10.16.0.0/14")
+"""
+
+import sys
+import random
+import socket
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def ip_to_int(ip: str) -> int:
+    return struct.unpack("!I", socket.inet_aton(ip))[0]
+
+
+def int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+
+class AliasSampler:
+    """
+    Vose's alias method: O(n) setup, O(1) weighted sampling with one
+    random draw. Tables are packed arrays (12 bytes per outcome).
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasSampler needs at least one weight")
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.n = n
+        self.prob = array("d", [0.0]) * n
+        self.alias = array("I", [0]) * n
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in large + small:  # leftovers are 1.0 up to rounding
+            self.prob[i] = 1.0
+
+    def sample(self, rng=random) -> int:
+        u = rng.random() * self.n
+        i = int(u)
+        return i if (u - i) < self.prob[i] else self.alias[i]
+
+
+class AssetInventory:
+    """
+    Host and user population with O(1) lookups and weighted sampling.
+    """
+
+    FIRST_NAMES = [
+        "john", "jane", "mike", "sarah", "alex", "pat", "chris", "sam",
+        "lee", "kim", "maria", "omar", "li", "ana", "raj", "eva",
+    ]
+    LAST_NAMES = [
+        "doe", "smith", "ops", "dev", "admin", "security", "network",
+        "brown", "garcia", "chen", "patel", "murphy", "kelly", "walsh",
+    ]
+
+    def __init__(
+        self,
+        core_hosts: Dict[str, Dict],
+        host_count: int = 0,
+        user_count: int = 0,
+        subnets: Sequence[Tuple[str, str, float]] = (),
+        skew: float = 1.1,
+        seed: int = 1337,
+    ):
+        rng = random.Random(seed)
+        self.hostnames: List[str] = []
+        self.ip_strs: List[str] = []
+        self.ips = array("I")
+        self.roles = array("B")
+        self.role_names: List[str] = ["core"]
+        self._host_index: Dict[str, int] = {}
+        self._ip_index: Dict[int, int] = {}
+        self._subnet_cache: Dict[str, Tuple[int, int]] = {}
+
+        for name, info in core_hosts.items():
+            self._add_host(name, info["ip"], 0)
+
+        if host_count:
+            self._generate_hosts(rng, host_count, subnets)
+
+        # Core hosts are the busiest; generated hosts follow a Zipf tail,
+        # with ranks shuffled so busy hosts are spread across every subnet
+        ranks = list(range(len(self.hostnames) - len(core_hosts)))
+        rng.shuffle(ranks)
+        weights = [1.0] * len(core_hosts)
+        weights += [1.0 / (rank + 2) ** skew for rank in ranks]
+        self._host_sampler = AliasSampler(weights)
+
+        self.users = self._generate_users(rng, user_count)
+        self._user_sampler = (
+            AliasSampler([1.0 / (rank + 1) ** skew for rank in range(len(self.users))])
+            if self.users else None
+        )
+
+    # ── Construction ─────────────────────────────────────────
+    def _add_host(self, name: str, ip: str, role: int) -> None:
+        ip_int = ip_to_int(ip)
+        idx = len(self.hostnames)
+        self.hostnames.append(name)
+        self.ip_strs.append(ip)
+        self.ips.append(ip_int)
+        self.roles.append(role)
+        self._host_index[name] = idx
+        self._ip_index[ip_int] = idx
+
+    def _generate_hosts(self, rng: random.Random, count: int, subnets) -> None:
+        if not subnets:
+            raise ValueError("INVENTORY_SUBNETS is empty — cannot generate hosts")
+        total_share = sum(share for _, _, share in subnets)
+        remaining = count
+        for i, (cidr, role, share) in enumerate(subnets):
+            n = remaining if i == len(subnets) - 1 else round(count * share / total_share)
+            remaining -= n
+            network, size = self._parse_cidr(cidr)
+            usable = max(size - 2, 1)
+            if n > usable:
+                raise ValueError(f"Subnet {cidr} has {usable} usable addresses, {n} hosts requested")
+            self.role_names.append(role)
+            role_id = len(self.role_names) - 1
+            for j, offset in enumerate(rng.sample(range(1, usable + 1), n)):
+                ip_int = network + offset
+                if ip_int in self._ip_index:
+                    continue  # already taken by a core host
+                self._add_host(f"{role}-{j:05d}", int_to_ip(ip_int), role_id)
+
+    def _generate_users(self, rng: random.Random, count: int) -> List[str]:
+        users = []
+        combos = len(self.FIRST_NAMES) * len(self.LAST_NAMES)
+        for i in range(count):
+            first = self.FIRST_NAMES[i % len(self.FIRST_NAMES)]
+            last = self.LAST_NAMES[(i // len(self.FIRST_NAMES)) % len(self.LAST_NAMES)]
+            suffix = "" if i < combos else str(i // combos)
+            users.append(f"{first}.{last}{suffix}")
+        rng.shuffle(users)
+        return users
+
+    def _parse_cidr(self, cidr: str) -> Tuple[int, int]:
+        """Return (network address as int, block size) for a CIDR, cached."""
+        cached = self._subnet_cache.get(cidr)
+        if cached is None:
+            base, _, prefix = cidr.partition("/")
+            bits = 32 - int(prefix or 32)
+            network = ip_to_int(base) & ~((1 << bits) - 1) & 0xFFFFFFFF
+            cached = self._subnet_cache[cidr] = (network, 1 << bits)
+        return cached
+
+    # ── Sampling ─────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self.hostnames)
+
+    @property
+    def user_count(self) -> int:
+        return len(self.users)
+
+    def sample_host_id(self) -> int:
+        return self._host_sampler.sample()
+
+    def sample_host(self) -> Tuple[str, str]:
+        """Weighted random (hostname, ip) pair."""
+        idx = self._host_sampler.sample()
+        return self.hostnames[idx], self.ip_strs[idx]
+
+    def sample_hosts(self, k: int) -> List[Tuple[str, str]]:
+        """`k` distinct weighted (hostname, ip) pairs."""
+        k = min(k, len(self.hostnames))
+        chosen = {}
+        while len(chosen) < k:
+            idx = self._host_sampler.sample()
+            chosen.setdefault(idx, (self.hostnames[idx], self.ip_strs[idx]))
+        return list(chosen.values())
+
+    def sample_user(self) -> str:
+        if not self._user_sampler:
+            raise ValueError("Inventory has no generated users (INVENTORY_USER_COUNT = 0)")
+        return self.users[self._user_sampler.sample()]
+
+    def random_ip(self, cidr: str) -> str:
+        """Uniform random host address inside any CIDR (network/broadcast excluded)."""
+        network, size = self._parse_cidr(cidr)
+        if size <= 2:
+            return int_to_ip(network + size - 1)
+        return int_to_ip(network + random.randint(1, size - 2))
+
+    # ── Lookups ──────────────────────────────────────────────
+    def ip_for_host(self, hostname: str) -> str:
+        return self.ip_strs[self._host_index[hostname]]
+
+    def host_for_ip(self, ip: str) -> Optional[str]:
+        idx = self._ip_index.get(ip_to_int(ip))
+        return None if idx is None else self.hostnames[idx]
+
+    def role_of(self, hostname: str) -> str:
+        return self.role_names[self.roles[self._host_index[hostname]]]
+
+
+@lru_cache(maxsize=None)
+def get_inventory() -> AssetInventory:
+    """The process-wide inventory built from config (created on first use)."""
+    return AssetInventory(
+        core_hosts=config.TARGET_HOSTS,
+        host_count=config.INVENTORY_HOST_COUNT,
+        user_count=config.INVENTORY_USER_COUNT,
+        subnets=config.INVENTORY_SUBNETS,
+        skew=config.INVENTORY_SKEW,
+        seed=config.INVENTORY_SEED,
+    )
@@ -35,6 +35,9 @@ from typing import Dict, Any, List
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 from data_generators.base_generator import BaseGenerator
+from utils.entropy_pool import get_pool
+
+HEX_ALPHABET = string.digits + "abcdef"
 
 
 class MalwareCallbackSimulator(BaseGenerator):
@@ -89,9 +92,16 @@ class MalwareCallbackSimulator(BaseGenerator):
         self.protocol = protocol  # "http" or "dns"
 
         # Select infected hosts (subset of internal machines)
-        self.infected_hosts = random.sample(
-            list(config.TARGET_HOSTS.items()), k=min(3, len(config.TARGET_HOSTS))
-        )
+        self.infected_hosts = self.inventory.sample_hosts(k=3)
+        self.dns_server_ip = self.inventory.ip_for_host("dc-01")
+
+        # Shared random hex buffer for DNS tunnel labels, and per-domain
+        # implant User-Agents (domain fingerprint hashed once, not per event)
+        self._hex_pool = get_pool(HEX_ALPHABET)
+        self._c2_user_agents = {
+            domain: f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) {hashlib.md5(domain.encode()).hexdigest()[:8]}"
+            for domain in self.C2_DOMAINS
+        }
 
     def generate_malicious_event(self, timestamp: str) -> Dict[str, Any]:
         """
@@ -111,14 +121,13 @@ class MalwareCallbackSimulator(BaseGenerator):
         - Small POST body with encoded data
         - Custom or generic User-Agent
         """
-        host_name, host_info = random.choice(self.infected_hosts)
+        host_name, host_ip = random.choice(self.infected_hosts)
         c2_domain = random.choice(self.C2_DOMAINS)
         c2_ip = random.choice(config.EXTERNAL_ATTACKER_IPS)
         uri = random.choice(self.C2_URI_PATHS)
 
-        # Simulated encoded payload (base64-like data)
+        # Simulated encoded payload — only its size reaches the proxy log
         payload_size = random.randint(64, 2048)
-        payload_data = "".join(random.choices(string.ascii_letters + string.digits, k=payload_size))
 
         # Response size varies — small for check-ins, large for commands
         response_size = random.choice([128, 256, 512, 4096, 8192])
@@ -127,7 +136,7 @@ class MalwareCallbackSimulator(BaseGenerator):
             "timestamp": timestamp,
             "event_type": "http_request",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
+            "src_ip": host_ip,
             "dst_ip": c2_ip,
             "dst_port": random.choice([80, 443, 8080, 8443]),
             "method": random.choice(["POST", "GET"]),
@@ -136,13 +145,13 @@ class MalwareCallbackSimulator(BaseGenerator):
             "status_code": 200,
             "bytes_out": payload_size,
             "bytes_in": response_size,
-            "user_agent": f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) {hashlib.md5(c2_domain.encode()).hexdigest()[:8]}",
+            "user_agent": self._c2_user_agents[c2_domain],
             "content_type": "application/octet-stream",
             "severity": 3,
             "mitre_technique": config.MITRE_TECHNIQUES["c2_http"]["id"],
             "mitre_tactic": config.MITRE_TECHNIQUES["c2_http"]["tactic"],
             "beacon_interval": self.beacon_interval,
-            "message": f"C2 HTTP beacon from {host_info['ip']} to {c2_domain}{uri}",
+            "message": f"C2 HTTP beacon from {host_ip} to {c2_domain}{uri}",
             "is_malicious": True,
         }
 
@@ -154,11 +163,11 @@ class MalwareCallbackSimulator(BaseGenerator):
         Detection key: Unusually long subdomain labels, high query frequency
         to a single domain, TXT record requests.
         """
-        host_name, host_info = random.choice(self.infected_hosts)
+        host_name, host_ip = random.choice(self.infected_hosts)
         c2_domain = random.choice(self.C2_DOMAINS)
 
         # Encode simulated exfil data as hex subdomain
-        encoded_data = "".join(random.choices(string.hexdigits.lower(), k=random.randint(20, 60)))
+        encoded_data = self._hex_pool.text(random.randint(20, 60))
         query_name = f"{encoded_data}.{c2_domain}"
 
         # DNS tunneling often uses TXT or NULL record types
@@ -168,8 +177,8 @@ class MalwareCallbackSimulator(BaseGenerator):
             "timestamp": timestamp,
             "event_type": "dns_query",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
-            "dst_ip": "10.0.2.5",  # Internal DNS server
+            "src_ip": host_ip,
+            "dst_ip": self.dns_server_ip,  # Internal DNS server
             "dst_port": 53,
             "query_name": query_name,
             "query_type": record_type,
@@ -179,7 +188,7 @@ class MalwareCallbackSimulator(BaseGenerator):
             "severity": 3,
             "mitre_technique": config.MITRE_TECHNIQUES["c2_dns"]["id"],
             "mitre_tactic": config.MITRE_TECHNIQUES["c2_dns"]["tactic"],
-            "message": f"DNS tunnel query from {host_info['ip']}: {query_name}",
+            "message": f"DNS tunnel query from {host_ip}: {query_name}",
             "is_malicious": True,
         }
 
@@ -194,14 +203,14 @@ class MalwareCallbackSimulator(BaseGenerator):
 
     def _generate_benign_http(self, timestamp: str) -> Dict[str, Any]:
         """Normal web browsing traffic."""
-        host_name, host_info = random.choice(list(config.TARGET_HOSTS.items()))
+        host_name, host_ip = self.inventory.sample_host()
         domain = random.choice(self.LEGIT_DOMAINS)
 
         return {
             "timestamp": timestamp,
             "event_type": "http_request",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
+            "src_ip": host_ip,
             "dst_ip": f"{random.randint(1,223)}.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}",
             "dst_port": 443,
             "method": "GET",
@@ -212,21 +221,21 @@ class MalwareCallbackSimulator(BaseGenerator):
             "bytes_in": random.randint(1000, 50000),
             "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/121.0.0.0",
             "severity": 6,
-            "message": f"Normal HTTP traffic from {host_info['ip']} to {domain}",
+            "message": f"Normal HTTP traffic from {host_ip} to {domain}",
             "is_malicious": False,
         }
 
     def _generate_benign_dns(self, timestamp: str) -> Dict[str, Any]:
         """Normal DNS lookup."""
-        host_name, host_info = random.choice(list(config.TARGET_HOSTS.items()))
+        host_name, host_ip = self.inventory.sample_host()
         domain = random.choice(self.LEGIT_DOMAINS)
 
         return {
             "timestamp": timestamp,
             "event_type": "dns_query",
             "hostname": host_name,
-            "src_ip": host_info["ip"],
-            "dst_ip": "10.0.2.5",
+            "src_ip": host_ip,
+            "dst_ip": self.dns_server_ip,
             "dst_port": 53,
             "query_name": domain,
             "query_type": "A",
@@ -234,7 +243,7 @@ class MalwareCallbackSimulator(BaseGenerator):
             "subdomain_length": 0,
             "response_code": "NOERROR",
             "severity": 6,
-            "message": f"Normal DNS query from {host_info['ip']}: {domain}",
+            "message": f"Normal DNS query from {host_ip}: {domain}",
             "is_malicious": False,
         }
 
@@ -243,7 +252,7 @@ class MalwareCallbackSimulator(BaseGenerator):
         Override base to produce beacon-like intervals for malicious events.
         Uses fixed interval + jitter to mimic real C2 timing.
         """
-        now = datetime.utcnow()
+        now = self.end_time or datetime.utcnow()
         start = now - timedelta(hours=self.time_span_hours)
         timestamps = []
 
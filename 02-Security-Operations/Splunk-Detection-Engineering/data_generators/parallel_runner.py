@@ -0,0 +1,331 @@
+"""
+parallel_runner.py — Multi-Process Generation over Shared-Memory Rings
+
+Spreads the selected generators across worker processes. Workers format
+their events into log lines (and HEC envelopes when HEC is enabled) and
+push them in batches into a per-worker `ShmRing`; one or more writer
+processes drain the rings straight from shared memory into the log
+files and HEC. Event dicts never cross a process boundary, so nothing
+is pickled on the hot path.
+
+Topology:
+    generator jobs ──round-robin──▶ worker 0..W-1 ──ring per worker──▶ writer (ring i → writer i mod M)
+
+Every generator runs entirely inside one worker and every ring has one
+writer, so each output file has exactly one writer process and keeps
+its time order. Full rings block the workers (backpressure), and the
+parent can abort all rings on Ctrl-C so every process exits cleanly.
+
+Used by `run_all_generators.py --workers N [--writers M]`.
+"""
+
+import os
+import sys
+import time
+import queue
+import random
+import signal
+import multiprocessing as mp
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.shm_ring import ShmRing, RingClosed, KIND_LINES, KIND_HEC
+from utils.splunk_hec_sender import SplunkHECSender
+from utils.sampler import StratifiedSampler
+from utils.entropy_pool import get_pool
+from utils.event_stats import EventStats, write_report
+
+DEFAULT_RING_BYTES = 32 * 1024 * 1024
+DEFAULT_BATCH_LINES = 512
+
+
+# ── Worker (producer) ────────────────────────────────────────
+def _worker_main(
+    ring_name: str,
+    jobs: List[Tuple[int, str, type, Dict[str, Any]]],
+    event_count: int,
+    log_format: str,
+    time_span: int,
+    to_file: bool,
+    hec_sender: Optional[SplunkHECSender],
+    batch_lines: int,
+    seed: Optional[int],
+    sampler: Optional[StratifiedSampler],
+    end_time: Optional[datetime],
+    results,
+) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent coordinates shutdown
+    ring = ShmRing.attach(ring_name)
+    # Forked workers inherit the parent's RNG state; reseed so they diverge
+    if seed is None:
+        random.seed()
+    try:
+        for stream_id, name, cls, kwargs in jobs:
+            if seed is not None:
+                random.seed(seed + stream_id)
+                get_pool.cache_clear()  # same output as a sequential run with this seed
+            generator = cls(
+                event_count=event_count,
+                log_format=log_format,
+                time_span_hours=time_span,
+                **kwargs,
+            )
+            generator.end_time = end_time
+            if sampler is not None:
+                # Fresh counters per job; inherited RNG state would repeat across forks
+                generator.sampler = StratifiedSampler(
+                    sampler.rates, seed=None if seed is None else seed + stream_id)
+            fmt = generator.formatter.format
+            lines, envelopes = [], []
+            hec_batch = hec_sender.batch_size if hec_sender else 0
+
+            for event in generator.iter_events():
+                if to_file:
+                    lines.append(fmt(event))
+                    if len(lines) >= batch_lines:
+                        ring.put(("\n".join(lines) + "\n").encode("utf-8"), stream_id, len(lines), KIND_LINES)
+                        lines.clear()
+                if hec_sender:
+                    envelopes.append(hec_sender.serialize_event(event, generator.sourcetype))
+                    if len(envelopes) >= hec_batch:
+                        ring.put("\n".join(envelopes).encode("utf-8"), stream_id, len(envelopes), KIND_HEC)
+                        envelopes.clear()
+            if lines:
+                ring.put(("\n".join(lines) + "\n").encode("utf-8"), stream_id, len(lines), KIND_LINES)
+            if envelopes:
+                ring.put("\n".join(envelopes).encode("utf-8"), stream_id, len(envelopes), KIND_HEC)
+
+            results.put(("generator", name, {
+                "malicious": generator.malicious_count,
+                "benign": generator.benign_count,
+                "sampled": (dict(generator.sampler.seen), dict(generator.sampler.kept))
+                           if generator.sampler else None,
+                "stats": generator.stats.to_dict(),
+            }))
+        results.put(("worker", ring_name, ring.stats()))
+    except RingClosed:
+        pass
+    finally:
+        ring.close_writer()
+        ring.close()
+
+
+# ── Writer (consumer) ────────────────────────────────────────
+def _writer_main(
+    ring_names: List[str],
+    output_files: Dict[int, str],
+    hec_sender: Optional[SplunkHECSender],
+    results,
+) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    rings = [ShmRing.attach(name) for name in ring_names]
+    for path in output_files.values():
+        Path(path).unlink(missing_ok=True)  # may be a dataset-cache hardlink
+    files = {sid: open(path, "wb") for sid, path in output_files.items()}
+    written = dict.fromkeys(output_files, 0)
+    try:
+        active = list(rings)
+        delay = 20e-6
+        while active:
+            progressed = False
+            for ring in list(active):
+                if ring.aborted:
+                    active.remove(ring)
+                    continue
+                record = ring.try_read()
+                if record is None:
+                    if ring.drained:
+                        active.remove(ring)
+                    continue
+                if record.kind == KIND_LINES:
+                    files[record.stream].write(record.data)
+                    written[record.stream] += record.count
+                elif record.kind == KIND_HEC:
+                    hec_sender.send_serialized(record.data, record.count)
+                ring.release()
+                progressed = True
+            if progressed:
+                delay = 20e-6
+            elif active:
+                time.sleep(delay)
+                delay = min(delay * 2, 2e-3)
+
+        if hec_sender:
+            hec_sender.flush()
+        results.put(("writer", os.getpid(), {
+            "written": written,
+            "hec": hec_sender.get_stats() if hec_sender else None,
+            "empty_polls": sum(r.empty_polls for r in rings),
+        }))
+    except BaseException:
+        # Unblock the producers instead of leaving them waiting on a full ring
+        for ring in rings:
+            ring.abort()
+        raise
+    finally:
+        for f in files.values():
+            f.close()
+        for ring in rings:
+            ring.close()
+
+
+# ── Orchestration ────────────────────────────────────────────
+def run_parallel(
+    jobs: List[Tuple[str, type, Dict[str, Any]]],
+    event_count: int,
+    log_format: str,
+    time_span: int,
+    workers: int,
+    writers: int = 1,
+    hec_sender: Optional[SplunkHECSender] = None,
+    to_file: bool = True,
+    ring_bytes: int = DEFAULT_RING_BYTES,
+    batch_lines: int = DEFAULT_BATCH_LINES,
+    seed: Optional[int] = None,
+    sampler: Optional[StratifiedSampler] = None,
+    end_time: Optional[datetime] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Run generator jobs in `workers` processes, with `writers` processes
+    draining their output rings to disk and HEC.
+
+    Args:
+        jobs:        (name, generator class, extra kwargs) per generator
+        workers:     Generator processes (capped at the number of jobs)
+        writers:     File/HEC writer processes (capped at `workers`)
+        to_file:     Write `{name}.log` files under config.LOG_DIR
+        ring_bytes:  Shared-memory ring size per worker
+        batch_lines: Log lines per ring record
+        seed:        Base seed; generator k is seeded with seed + k
+        sampler:     StratifiedSampler whose rates every generator applies
+        end_time:    Fixed timeline end (seeded runs); None = now
+
+    Returns:
+        Per-generator malicious/benign counts and EventStats report
+    """
+    if not jobs:
+        raise ValueError("No generators to run")
+    workers = max(1, min(workers, len(jobs)))
+    writers = max(1, min(writers, workers))
+    start_time = datetime.utcnow()
+    started = time.perf_counter()
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Parallel Generation")
+    print(f"  Started: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"  Generators: {', '.join(name for name, _, _ in jobs)}")
+    print(f"  Events per generator: {event_count}")
+    print(f"  Workers: {workers} | Writers: {writers} | "
+          f"Ring: {ring_bytes // (1024 * 1024)} MB/worker")
+    print("=" * 70)
+
+    # One file per registry entry (as in scenario mode), so HTTP and DNS C2
+    # — both MalwareCallbackSimulator — never share a file or a writer
+    output_files = {sid: str(config.LOG_DIR / f"{name}.log") for sid, (name, _, _) in enumerate(jobs)}
+
+    rings = [ShmRing.create(ring_bytes) for _ in range(workers)]
+    results = mp.Queue()
+    worker_jobs = [[] for _ in range(workers)]
+    for sid, (name, cls, kwargs) in enumerate(jobs):
+        worker_jobs[sid % workers].append((sid, name, cls, kwargs))
+
+    writer_procs = []
+    for w in range(writers):
+        mine = list(range(w, workers, writers))
+        streams = {sid: output_files[sid] for i in mine for sid, *_ in worker_jobs[i]} if to_file else {}
+        writer_procs.append(mp.Process(
+            target=_writer_main,
+            args=([rings[i].name for i in mine], streams, hec_sender, results),
+            name=f"ring-writer-{w}",
+        ))
+    worker_procs = [
+        mp.Process(
+            target=_worker_main,
+            args=(rings[i].name, worker_jobs[i], event_count, log_format, time_span,
+                  to_file, hec_sender, batch_lines, seed, sampler, end_time, results),
+            name=f"gen-worker-{i}",
+        )
+        for i in range(workers)
+    ]
+
+    gen_counts, worker_stats, writer_stats = {}, [], []
+    expected = len(jobs) + workers + writers
+    interrupted = False
+    try:
+        for proc in writer_procs + worker_procs:
+            proc.start()
+        # Collect results while the children run (a full Queue would block their exit)
+        while len(gen_counts) + len(worker_stats) + len(writer_stats) < expected:
+            if not any(p.is_alive() for p in writer_procs + worker_procs) and results.empty():
+                break
+            # A killed worker never closes its ring, so its writer would poll it forever
+            for proc, ring in zip(worker_procs, rings):
+                if proc.exitcode not in (0, None) and not ring.writer_closed and not ring.aborted:
+                    print(f"\n  [ERROR] {proc.name} died (exit code {proc.exitcode}) — aborting its ring")
+                    ring.abort()
+            try:
+                kind, key, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if kind == "generator":
+                gen_counts[key] = payload
+                if payload["sampled"]:
+                    seen, kept = payload["sampled"]
+                    sampler.seen.update(seen)
+                    sampler.kept.update(kept)
+            elif kind == "worker":
+                worker_stats.append(payload)
+            else:
+                writer_stats.append(payload)
+    except KeyboardInterrupt:
+        interrupted = True
+        # A repeated Ctrl-C must not cut the cleanup below short
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        print("\n  [INTERRUPTED] Aborting workers and writers")
+        for ring in rings:
+            ring.abort()
+    finally:
+        for proc in worker_procs + writer_procs:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        for ring in rings:
+            ring.unlink()
+        if interrupted:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    failed = [p.name for p in worker_procs + writer_procs if p.exitcode not in (0, None)]
+    elapsed = time.perf_counter() - started
+    total = sum(c["malicious"] + c["benign"] for c in gen_counts.values())
+
+    print("\n" + "=" * 70)
+    print("  PARALLEL GENERATION " + ("INTERRUPTED" if interrupted else "FAILED" if failed else "COMPLETE"))
+    for name, counts in gen_counts.items():
+        print(f"    {name:20s} {counts['malicious'] + counts['benign']:>10d} events "
+              f"({counts['malicious']} malicious, {counts['benign']} benign)")
+    print(f"  Total events:   {total}")
+    if sampler:
+        sampler.print_report()
+    print(f"  Output dir:     {config.LOG_DIR}")
+    if gen_counts:
+        write_report(config.STATS_REPORT_FILE,
+                     {name: EventStats.from_dict(c["stats"]) for name, c in gen_counts.items()})
+        print(f"  Stats report:   {config.STATS_REPORT_FILE}")
+    print(f"  Elapsed time:   {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} EPS)")
+    blocked = sum(s["blocked_s"] for s in worker_stats)
+    print(f"  Backpressure:   {sum(s['full_waits'] for s in worker_stats)} full-ring waits, "
+          f"{blocked:.2f}s worker time blocked")
+    if hec_sender:
+        sent = sum(s["hec"]["events_sent"] for s in writer_stats if s["hec"])
+        failed_hec = sum(s["hec"]["events_failed"] for s in writer_stats if s["hec"])
+        print(f"  HEC sent:       {sent}")
+        print(f"  HEC failed:     {failed_hec}")
+    if failed:
+        print(f"  [WARNING] Processes exited with errors: {', '.join(failed)}")
+    print("=" * 70)
+
+    return gen_counts
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+replay_logs.py — Re-Ingest Generated Log Files without Regenerating
+
+Streams existing `config.LOG_DIR/*.log` files (json, syslog or cef —
+detected per file) into Splunk HEC, so a fresh index can be populated
+from yesterday's dataset at a fraction of the cost of generating it.
+
+Throughput:
+    Lines are sliced from an mmap and never parsed into dicts. The
+    timestamp, hostname and (for mixed files) sourcetype are located
+    with a few `find()` calls, and the HEC envelope is assembled as
+    bytes around the original line (JSON lines are embedded verbatim).
+    Files are merged by timestamp so HEC sees one time-ordered feed.
+
+Timestamp rebasing (--rebase):
+    Every timestamp is shifted by the same whole number of seconds so
+    the newest event across all files lands at "now". Because the shift
+    is whole seconds, only the "YYYY-MM-DDTHH:MM:SS" prefix changes; it
+    is rewritten through a per-second cache instead of a datetime
+    round-trip per event.
+
+Pacing:
+    Full speed by default. --speed N replays the original timeline N
+    times faster than real time (1 = original pace), using the Pacer's
+    absolute-deadline schedule.
+
+Usage:
+    python replay_logs.py --hec                                   # all LOG_DIR/*.log, full speed
+    python replay_logs.py --files brute_force.log web_attack.log --rebase --hec
+    python replay_logs.py --rebase --speed 60 --hec               # 24h of data in 24 minutes
+    python replay_logs.py --rebase --output-dir output/replay     # rebased copies, no HEC
+"""
+
+import sys
+import json
+import time
+import heapq
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_reader import default_files, iter_lines, last_line, detect_format, line_timestamp, line_field
+from utils.splunk_hec_sender import SplunkHECSender
+from utils.hec_router import HECRouter
+from utils.pacer import Pacer
+
+# Sourcetype by file stem — generator names and run_all_generators registry keys
+SOURCETYPES = {
+    "brute_force":       "attack_sim:auth",
+    "web_attack":        "attack_sim:web",
+    "malware_callback":  "attack_sim:proxy",
+    "malware_c2_http":   "attack_sim:proxy",
+    "malware_c2_dns":    "attack_sim:proxy",
+    "data_exfiltration": "attack_sim:netflow",
+    "data_exfil":        "attack_sim:netflow",
+}
+DEFAULT_SOURCETYPE = "attack_sim"
+TS_PREFIX = 19  # len("YYYY-MM-DDTHH:MM:SS")
+
+
+def _parse_ts(ts: bytes) -> datetime:
+    return datetime.fromisoformat(ts[:TS_PREFIX].decode()).replace(tzinfo=timezone.utc)
+
+
+class TimestampShifter:
+    """
+    Shift ISO timestamps by a whole number of seconds through a
+    per-second prefix cache (a shift of 0 just converts to epoch).
+    """
+
+    def __init__(self, shift_s: int = 0):
+        self.shift_s = shift_s
+        self._prefix_cache: Dict[bytes, Tuple[bytes, int]] = {}
+
+    @classmethod
+    def to_now(cls, newest: Optional[bytes], now: Optional[datetime] = None) -> "TimestampShifter":
+        """A shifter that moves `newest` to `now` (default: the current time)."""
+        if not newest:
+            return cls(0)
+        now = now or datetime.now(timezone.utc)
+        return cls(int((now - _parse_ts(newest)).total_seconds()))
+
+    def __call__(self, ts: bytes) -> Tuple[bytes, float]:
+        """Return (shifted timestamp, shifted epoch seconds) for an ISO timestamp."""
+        prefix = ts[:TS_PREFIX]
+        cached = self._prefix_cache.get(prefix)
+        if cached is None:
+            shifted = _parse_ts(ts) + timedelta(seconds=self.shift_s)
+            cached = (shifted.strftime("%Y-%m-%dT%H:%M:%S").encode(), int(shifted.timestamp()))
+            if len(self._prefix_cache) > 1_000_000:
+                self._prefix_cache.clear()
+            self._prefix_cache[prefix] = cached
+        fraction = ts[TS_PREFIX:].rstrip(b"Z")
+        return cached[0] + ts[TS_PREFIX:], cached[1] + (float(fraction) if fraction else 0.0)
+
+
+def hec_envelope(
+    line: bytes,
+    fmt: str,
+    index: bytes,
+    sourcetype: bytes,
+    source: bytes,
+    epoch: Optional[float] = None,
+) -> bytes:
+    """Wrap one raw log line in an HEC event envelope without parsing it."""
+    host = line_field(line, "hostname", fmt) or b"detection-lab"
+    event = line if fmt == "json" else json.dumps(line.decode("utf-8", "replace")).encode()
+    time_field = b',"time":%.6f' % epoch if epoch is not None else b""
+    return (b'{"index":"%s","sourcetype":"%s","source":"%s","host":"%s"%s,"event":%s}'
+            % (index, sourcetype, source, host, time_field, event))
+
+
+class LogReplayer:
+    """
+    Merge generated log files by timestamp and push the lines to HEC
+    (and/or rewritten copies on disk), optionally rebased and paced.
+    """
+
+    def __init__(
+        self,
+        paths: List[Path],
+        hec_sender: Optional[SplunkHECSender] = None,
+        rebase: bool = False,
+        speed: float = 0.0,
+        output_dir: Optional[Path] = None,
+        source_prefix: str = "replay",
+    ):
+        if not paths:
+            raise ValueError("No log files to replay")
+        if speed < 0:
+            raise ValueError(f"Speed must be >= 0, got {speed}")
+        self.paths = [Path(p) for p in paths]
+        self.hec_sender = hec_sender
+        self.speed = speed
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.source_prefix = source_prefix
+
+        self.formats: Dict[Path, str] = {}
+        newest = None
+        for path in self.paths:
+            tail = last_line(path)
+            if tail is None:
+                print(f"  [WARNING] {path.name} is empty — skipping")
+                continue
+            fmt = self.formats[path] = detect_format(tail)
+            ts = line_timestamp(tail, fmt)
+            if ts and (newest is None or ts > newest):
+                newest = ts
+
+        # Whole-second shift that moves the newest event to now
+        self._rebase = TimestampShifter.to_now(newest if rebase else None)
+        self.shift_s = self._rebase.shift_s
+
+        self.counts: Dict[str, int] = {}
+        self.bytes_read = 0
+
+    # ── Input streams ────────────────────────────────────────
+    def _stream(self, index: int, path: Path):
+        """Yield (timestamp, file index, line) for one file."""
+        fmt = self.formats[path]
+        for line in iter_lines(path):
+            yield line_timestamp(line, fmt) or b"", index, line
+
+    # ── Main loop ────────────────────────────────────────────
+    def run(self) -> Dict[str, int]:
+        paths = [p for p in self.paths if p in self.formats]
+        start_time = datetime.utcnow()
+
+        print("\n" + "=" * 70)
+        print("  SPLUNK DETECTION ENGINEERING LAB — Log Replay")
+        print(f"  Started: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        for path in paths:
+            print(f"    {path.name:28s} {self.formats[path]:6s} → "
+                  f"{SOURCETYPES.get(path.stem, 'per-event sourcetype')}")
+        print(f"  Rebase: {f'{self.shift_s:+d}s' if self.shift_s else 'off'} | "
+              f"Speed: {f'{self.speed:g}x real time' if self.speed else 'full'}")
+        print("=" * 70)
+
+        indexes: Dict[bytes, bytes] = {}  # sourcetype → index (per route with HECRouter)
+        batch_size = self.hec_sender.batch_size if self.hec_sender else 0
+        formats = [self.formats[p] for p in paths]
+        fixed_sourcetypes = [SOURCETYPES.get(p.stem) for p in paths]
+        sources = [f"{self.source_prefix}:{p.name}".encode() for p in paths]
+        names = [p.name for p in paths]
+        counts = [0] * len(paths)
+        outputs = []
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            outputs = [open(self.output_dir / p.name, "wb") for p in paths]
+
+        pacer = Pacer() if self.speed else None
+        need_time = bool(self.hec_sender or pacer or self.shift_s)
+        first_epoch = None
+        entries: List[bytes] = []
+        bytes_read = 0
+        started = time.perf_counter()
+
+        streams = [self._stream(i, p) for i, p in enumerate(paths)]
+        try:
+            if pacer:
+                pacer.start()
+            for ts, i, line in heapq.merge(*streams):
+                bytes_read += len(line) + 1
+                counts[i] += 1
+                epoch = None
+                if ts and need_time:
+                    new_ts, epoch = self._rebase(ts)
+                    if self.shift_s:
+                        line = line.replace(ts, new_ts)
+
+                if pacer and epoch is not None:
+                    if first_epoch is None:
+                        first_epoch = epoch
+                    pacer.wait_until((epoch - first_epoch) / self.speed)
+
+                if outputs:
+                    outputs[i].write(line + b"\n")
+
+                if self.hec_sender:
+                    fmt = formats[i]
+                    sourcetype = fixed_sourcetypes[i]
+                    sourcetype = (sourcetype.encode() if sourcetype
+                                  else line_field(line, "sourcetype", fmt) or DEFAULT_SOURCETYPE.encode())
+                    index = indexes.get(sourcetype)
+                    if index is None:
+                        index = indexes[sourcetype] = self.hec_sender.index_for(sourcetype.decode()).encode()
+                    entries.append(hec_envelope(line, fmt, index, sourcetype, sources[i], epoch))
+                    if len(entries) >= batch_size:
+                        self.hec_sender.send_serialized(b"\n".join(entries), len(entries))
+                        entries.clear()
+            if entries:
+                self.hec_sender.send_serialized(b"\n".join(entries), len(entries))
+            if self.hec_sender:
+                self.hec_sender.flush()
+        except KeyboardInterrupt:
+            print("\n  [INTERRUPTED] Stopping replay")
+        finally:
+            for f in outputs:
+                f.close()
+
+        elapsed = time.perf_counter() - started
+        self.counts = dict(zip(names, counts))
+        self.bytes_read = bytes_read
+        self._print_summary(elapsed, pacer)
+        return self.counts
+
+    def _print_summary(self, elapsed: float, pacer: Optional[Pacer]) -> None:
+        total = sum(self.counts.values())
+        print("\n" + "=" * 70)
+        print("  REPLAY COMPLETE")
+        for name, count in self.counts.items():
+            print(f"    {name:28s} {count:>10d} events")
+        print(f"  Total events:   {total}")
+        print(f"  Read:           {self.bytes_read / 1e6:.1f} MB")
+        print(f"  Elapsed time:   {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} EPS)")
+        if pacer:
+            report = pacer.report()
+            print(f"  Paced:          {report['late_events']} late events, max lag {report['max_lag_ms']} ms")
+        if self.output_dir:
+            print(f"  Output dir:     {self.output_dir}")
+        if self.hec_sender:
+            stats = self.hec_sender.get_stats()
+            print(f"  HEC sent:       {stats['events_sent']}")
+            print(f"  HEC failed:     {stats['events_failed']}")
+        print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay generated log files to Splunk HEC with optional timestamp rebasing"
+    )
+    parser.add_argument("--files", nargs="*", default=None,
+                        help=f"Log files to replay (default: every generator log in {config.LOG_DIR}, "
+                             "without combined.log or older duplicates)")
+    parser.add_argument("--rebase", action="store_true",
+                        help="Shift timestamps so the newest event lands at now")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay N times faster than the original timeline (default: full speed)")
+    parser.add_argument("--output-dir", type=str, default=None,
+                        help="Also write the (rebased) lines to this directory")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Events per HEC POST (default: 1000)")
+
+    # Splunk HEC options
+    parser.add_argument("--hec", action="store_true",
+                        help="Send events to Splunk HEC")
+    parser.add_argument("--hec-url", type=str, default=config.SPLUNK_HEC_URL)
+    parser.add_argument("--hec-token", type=str, default=config.SPLUNK_HEC_TOKEN)
+    parser.add_argument("--hec-routes", type=str, default=None,
+                        help="JSON routing table: sourcetype → url/token/index (see utils/hec_router.py)")
+    args = parser.parse_args()
+
+    if args.files is None:
+        paths = default_files()
+    else:
+        paths = [Path(f) if Path(f).exists() else config.LOG_DIR / f for f in args.files]
+        missing = [str(p) for p in paths if not p.exists()]
+        if missing:
+            parser.error(f"File(s) not found: {', '.join(missing)}")
+    if not args.hec and not args.output_dir:
+        print("  [WARNING] Neither --hec nor --output-dir given — dry run (read + rebase only)")
+
+    hec_sender = None
+    if args.hec and args.hec_routes:
+        hec_sender = HECRouter.from_file(
+            args.hec_routes,
+            default_url=args.hec_url,
+            default_token=args.hec_token,
+            batch_size=args.batch_size,
+        )
+        print(f"\n  HEC routes: {args.hec_routes}")
+    elif args.hec:
+        hec_sender = SplunkHECSender(
+            hec_url=args.hec_url,
+            hec_token=args.hec_token,
+            index=config.SPLUNK_INDEX,
+            batch_size=args.batch_size,
+        )
+        print(f"\n  HEC endpoint: {args.hec_url}")
+
+    replayer = LogReplayer(
+        paths,
+        hec_sender=hec_sender,
+        rebase=args.rebase,
+        speed=args.speed,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+    )
+    replayer.run()
+
+
+if __name__ == "__main__":
+    main()
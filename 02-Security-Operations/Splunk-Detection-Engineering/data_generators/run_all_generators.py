@@ -20,22 +20,64 @@ Usage:
 
     # Custom event counts
     python run_all_generators.py --all --events 1000
+
+    # Declarative workload with per-generator volumes and an EPS profile
+    python run_all_generators.py --scenario scenarios/indexer_mixed_load.json --hec
+
+    # One time-ordered combined log/HEC feed across all generators
+    python run_all_generators.py --all --merged --hec
+
+    # Real-time soak test: events stamped "now", paced at 200 EPS for 10 min
+    python run_all_generators.py --all --hec --realtime --eps 200 --duration 600
+
+    # Stream lines to a syslog collector over TCP (RFC 6587 octet counting)
+    python run_all_generators.py --all --format syslog --syslog --syslog-host 10.0.0.5 --syslog-port 6514
+
+    # Split sourcetypes across indexes/tokens (one sender queue per destination)
+    python run_all_generators.py --all --hec --hec-routes routes/prod_indexes.json
+
+    # Parallel generation: 4 worker processes, 2 writer processes
+    python run_all_generators.py --all --events 1000000 --workers 4 --writers 2
+
+    # Reproducible run served from the dataset cache when already generated
+    python run_all_generators.py --all --events 100000 --format cef --seed 42 --cache
+
+    # Prebuilt benign background (see background.py --build) + fresh attacks only
+    python run_all_generators.py --all --background --events 2000 --hec
+
+    # Quick regression run: keep every attack, 5% of benign traffic (weights in sample_weight)
+    python run_all_generators.py --all --events 100000 --sample benign=0.05
 """
 
 import sys
+import time
+import random
 import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 from utils.splunk_hec_sender import SplunkHECSender
+from utils.hec_router import HECRouter
+from utils.syslog_sender import SyslogSender
+from utils.pacer import Pacer
+from utils.log_formatter import LogFormatter
+from utils.stream_merge import merge_event_streams
+from utils.sampler import StratifiedSampler
+from utils.dataset_cache import DatasetCache
+from utils.entropy_pool import get_pool
+from utils.log_reader import iter_lines, read_events
+from utils.event_stats import EventStats, write_report
 
 # Import all generators
 from data_generators.brute_force_simulator import BruteForceSimulator
 from data_generators.web_attack_simulator import WebAttackSimulator
 from data_generators.malware_callback_sim import MalwareCallbackSimulator
 from data_generators.data_exfil_simulator import DataExfilSimulator
+from data_generators.scenario import Scenario, load_scenario
+from data_generators.parallel_runner import run_parallel
+from data_generators.background import run_with_background
 
 
 # Registry of available generators with their default configs
@@ -74,9 +116,25 @@ def run_generators(
     log_format: str,
     time_span: int,
     hec_sender=None,
-):
-    """Execute selected generators and collect all events."""
-    all_events = []
+    syslog_sender=None,
+    sampler=None,
+    seed=None,
+    end_time=None,
+    cache=None,
+) -> int:
+    """
+    Execute selected generators in sequence.
+
+    With a `seed`, generator k (in `selected` order) is seeded with
+    seed + k and its timeline ends at `end_time`, so the output is
+    reproducible; a `cache` then serves previously generated files
+    instead of regenerating them.
+
+    Returns:
+        Total number of events produced
+    """
+    total = 0
+    stats = {}
     start_time = datetime.utcnow()
 
     print("\n" + "=" * 70)
@@ -86,7 +144,7 @@ def run_generators(
     print(f"  Events per generator: {event_count}")
     print("=" * 70)
 
-    for gen_name in selected:
+    for index, gen_name in enumerate(selected):
         if gen_name not in GENERATORS:
             print(f"\n  [WARNING] Unknown generator: '{gen_name}' — skipping")
             continue
@@ -94,6 +152,11 @@ def run_generators(
         gen_config = GENERATORS[gen_name]
         print(f"\n  → Running: {gen_config['description']}")
 
+        # Seed before instantiating: constructors draw from the RNG too
+        # (e.g. infected hosts, entropy pools), as in parallel_runner
+        if seed is not None:
+            _seed_rng(seed + index)
+
         # Instantiate generator with merged kwargs
         generator = gen_config["class"](
             event_count=event_count,
@@ -101,24 +164,406 @@ def run_generators(
             time_span_hours=time_span,
             **gen_config["kwargs"],
         )
+        # One file per registry entry, as in every other mode, so HTTP and
+        # DNS C2 (both MalwareCallbackSimulator) do not overwrite each other
+        generator.output_file = config.LOG_DIR / f"{gen_name}.log"
+        generator.sampler = sampler
+        if seed is not None:
+            generator.end_time = end_time
+            if sampler:
+                sampler.reseed(seed + index)
+
+        key = None
+        if cache is not None:
+            params = {
+                "seed": seed + index,
+                "kwargs": gen_config["kwargs"],
+                "format": log_format,
+                "events": event_count,
+                "time_span": time_span,
+                "benign_ratio": generator.benign_ratio,
+                "end_time": end_time,
+                "sampling": sampler.rates if sampler else None,
+            }
+            key = DatasetCache.key(gen_config["class"], **params)
+            meta = cache.fetch(key, generator.output_file)
+            if meta:
+                total += _serve_cached(generator, meta, hec_sender, syslog_sender, sampler)
+                if meta.get("stats"):
+                    stats[gen_name] = EventStats.from_dict(meta["stats"])
+                continue
+            before = (sampler.seen.copy(), sampler.kept.copy()) if sampler else None
+
+        events = generator.run(hec_sender=hec_sender, syslog_sender=syslog_sender)
+        total += len(events)
+        stats[gen_name] = generator.stats
 
-        events = generator.run(hec_sender=hec_sender)
-        all_events.extend(events)
+        if key is not None:
+            sampled = None
+            if sampler:
+                seen, kept = sampler.seen - before[0], sampler.kept - before[1]
+                sampled = [[st, label, seen[(st, label)], kept[(st, label)]] for st, label in seen]
+            cache.store(key, generator.output_file, {
+                "name": gen_name, "params": params, "events": len(events),
+                "malicious": generator.malicious_count, "benign": generator.benign_count,
+                "sampled": sampled,
+                "stats": generator.stats.to_dict(),
+            })
 
     # Final summary
     elapsed = (datetime.utcnow() - start_time).total_seconds()
     print("\n" + "=" * 70)
     print("  GENERATION COMPLETE")
-    print(f"  Total events:   {len(all_events)}")
+    print(f"  Total events:   {total}")
+    if sampler:
+        sampler.print_report()
     print(f"  Output dir:     {config.LOG_DIR}")
+    _write_stats_report(stats)
+    print(f"  Elapsed time:   {elapsed:.1f}s")
+    if hec_sender:
+        _print_hec_stats(hec_sender)
+    if syslog_sender:
+        _print_syslog_stats(syslog_sender)
+    if cache is not None:
+        cache.print_stats()
+    print("=" * 70)
+
+    return total
+
+
+def _seed_rng(seed: int) -> None:
+    """Restart the shared RNG so the next generator built is a pure function of `seed`."""
+    random.seed(seed)
+    get_pool.cache_clear()  # entropy pools are drawn from the seeded stream on first use
+
+
+def _serve_cached(generator, meta: dict, hec_sender=None, syslog_sender=None, sampler=None) -> int:
+    """Report a cache hit and feed the cached file to any network sinks."""
+    print(f"  [CACHE HIT] {meta['key'][:12]} → {generator.output_file} "
+          f"({meta['events']} events, {meta['size'] / 1024:.1f} KB)")
+    if hec_sender:
+        print(f"  Sending {meta['events']} cached events to Splunk HEC...")
+        results = hec_sender.send_batch(list(read_events(generator.output_file)),
+                                        sourcetype=generator.sourcetype)
+        print(f"  HEC Results: {results['sent']} sent, {results['failed']} failed")
+    if syslog_sender:
+        results = syslog_sender.send_lines(
+            line.decode("utf-8") for line in iter_lines(generator.output_file))
+        print(f"  Syslog Results: {results['sent']} sent, {results['dropped']} dropped")
+    if sampler and meta.get("sampled"):
+        for st, label, seen, kept in meta["sampled"]:
+            sampler.seen[(st, label)] += seen
+            sampler.kept[(st, label)] += kept
+    return meta["events"]
+
+
+def run_merged(
+    selected: list,
+    event_count: int,
+    log_format: str,
+    time_span: int,
+    hec_sender=None,
+    syslog_sender=None,
+    sampler=None,
+    seed=None,
+    end_time=None,
+) -> int:
+    """
+    Run the selected generators as lazy, individually sorted streams and
+    k-way merge them into one time-ordered feed, written to
+    `combined.log` and (optionally) HEC. Events are tagged with their
+    sourcetype so mixed-source correlation searches see interleaved input.
+
+    Returns:
+        Total number of events emitted
+    """
+    start_time = datetime.utcnow()
+    output_file = config.LOG_DIR / "combined.log"
+    formatter = LogFormatter(format_type=log_format)
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Merged Time-Ordered Stream")
+    print(f"  Started: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"  Generators: {', '.join(selected)}")
+    print(f"  Events per generator: {event_count}")
+    print("=" * 70)
+
+    if seed is not None:
+        _seed_rng(seed)
+        if sampler:
+            sampler.reseed(seed)
+
+    generators, streams = {}, {}
+    for gen_name in selected:
+        if gen_name not in GENERATORS:
+            print(f"\n  [WARNING] Unknown generator: '{gen_name}' — skipping")
+            continue
+        gen_config = GENERATORS[gen_name]
+        generator = gen_config["class"](
+            event_count=event_count,
+            log_format=log_format,
+            time_span_hours=time_span,
+            **gen_config["kwargs"],
+        )
+        generator.sampler = sampler
+        if seed is not None:
+            generator.end_time = end_time
+        generators[gen_name] = generator
+        streams[gen_name] = generator.iter_events()
+
+    total = 0
+    hec_buffer, syslog_buffer = [], []
+    with open(output_file, "w") as f:
+        for gen_name, event in merge_event_streams(streams):
+            sourcetype = generators[gen_name].sourcetype
+            event["sourcetype"] = sourcetype
+            line = formatter.format(event)
+            f.write(line + "\n")
+            total += 1
+            if syslog_sender:
+                syslog_buffer.append(line)
+                if len(syslog_buffer) >= syslog_sender.batch_size:
+                    syslog_sender.send_lines(syslog_buffer)
+                    syslog_buffer.clear()
+            if hec_sender:
+                hec_buffer.append((sourcetype, event))
+                if len(hec_buffer) >= hec_sender.batch_size:
+                    hec_sender.send_tagged_batch(hec_buffer)
+                    hec_buffer.clear()
+    if hec_buffer:
+        hec_sender.send_tagged_batch(hec_buffer)
+    if syslog_buffer:
+        syslog_sender.send_lines(syslog_buffer)
+
+    elapsed = (datetime.utcnow() - start_time).total_seconds()
+    print("\n" + "=" * 70)
+    print("  MERGED STREAM COMPLETE")
+    for gen_name, gen in generators.items():
+        print(f"    {gen_name:20s} {gen.malicious_count + gen.benign_count:>10d} events "
+              f"({gen.malicious_count} malicious, {gen.benign_count} benign)")
+    print(f"  Total events:   {total}")
+    if sampler:
+        sampler.print_report()
+    print(f"  Output:         {output_file}")
+    _write_stats_report({gen_name: gen.stats for gen_name, gen in generators.items()})
+    print(f"  Elapsed time:   {elapsed:.1f}s")
+    if hec_sender:
+        _print_hec_stats(hec_sender)
+    if syslog_sender:
+        _print_syslog_stats(syslog_sender)
+    print("=" * 70)
+
+    return total
+
+
+def run_scenario(
+    scenario: Scenario,
+    hec_sender=None,
+    realtime: bool = False,
+    flush_interval: float = 1.0,
+) -> dict:
+    """
+    Execute a declarative scenario: instantiate every generator it lists,
+    then walk the scenario's rate schedule, stamping each arrival with its
+    timeline position and routing the event to that generator's sink.
+
+    In realtime mode the schedule is replayed against the wall clock
+    instead: each event is held until its offset, stamped "now", and
+    file/HEC sinks are flushed every `flush_interval` seconds so Splunk
+    sees a steady feed.
+
+    Returns:
+        Dictionary mapping scenario generator names to event counts
+    """
+    start_time = datetime.utcnow()
+    timeline_start = start_time - timedelta(seconds=scenario.duration_s)
+
+    print("\n" + "=" * 70)
+    print(f"  SCENARIO: {scenario.name}")
+    print(f"  Started:  {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"  Timeline: {scenario.duration_s / 3600:.2f}h | Format: {scenario.log_format}"
+          f"{' | Mode: realtime' if realtime else ''}")
+    if scenario.profile:
+        for phase in scenario.profile.phases:
+            label = f" ({phase.label})" if phase.label else ""
+            print(f"    {phase.duration_s:>8.0f}s  {phase.eps_start:>8.1f} → "
+                  f"{phase.eps_end:<8.1f} EPS{label}")
+    print("=" * 70)
+
+    generators, files, hec_buffers = {}, {}, {}
+    counts = {spec.name: 0 for spec in scenario.generators}
+
+    for spec in scenario.generators:
+        if spec.generator not in GENERATORS:
+            raise ValueError(f"Scenario references unknown generator '{spec.generator}'")
+        gen_config = GENERATORS[spec.generator]
+        generator = gen_config["class"](
+            log_format=scenario.log_format,
+            time_span_hours=spec.time_span_hours,
+            benign_ratio=spec.benign_ratio,
+            **{**gen_config["kwargs"], **spec.kwargs},
+        )
+        # One file per scenario entry, so two entries backed by the same
+        # simulator class (e.g. HTTP and DNS C2) do not overwrite each other
+        generator.output_file = config.LOG_DIR / f"{spec.name}.log"
+        generators[spec.name] = generator
+
+        if spec.sink in ("file", "both"):
+            files[spec.name] = open(generator.output_file, "w")
+        if spec.sink in ("hec", "both"):
+            if hec_sender:
+                hec_buffers[spec.name] = []
+            else:
+                print(f"  [WARNING] '{spec.name}' routes to HEC but --hec is not set — skipping HEC")
+
+        print(f"  → {spec.name:20s} sink={spec.sink:5s} "
+              f"benign={spec.benign_ratio:.0%} "
+              f"{'eps=' + str(spec.eps) if spec.eps is not None else 'events=' + str(spec.events)}")
+
+    pacer = Pacer() if realtime else None
+    gen_ns = sink_ns = 0  # time spent producing events vs. delivering them
+    next_flush = flush_interval
+
+    def flush_sinks(force: bool = False) -> None:
+        for name, buffer in hec_buffers.items():
+            if buffer and (force or realtime):
+                hec_sender.send_batch(buffer, sourcetype=generators[name].sourcetype)
+                buffer.clear()
+        if realtime:
+            for f in files.values():
+                f.flush()
+
+    try:
+        if pacer:
+            pacer.start()
+        for offset, name in scenario.schedule():
+            generator = generators[name]
+            if pacer:
+                pacer.wait_until(offset)
+            t0 = time.perf_counter_ns()  # stamping counts as generating
+            if pacer:
+                ts = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            else:
+                ts = (timeline_start + timedelta(seconds=offset)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+            event = generator.generate_event(ts)
+            counts[name] += 1
+            t1 = time.perf_counter_ns()
+            generator.stats.add(event)
+
+            if name in files:
+                files[name].write(generator.formatter.format(event) + "\n")
+            if name in hec_buffers:
+                buffer = hec_buffers[name]
+                buffer.append(event)
+                if len(buffer) >= hec_sender.batch_size:
+                    hec_sender.send_batch(buffer, sourcetype=generator.sourcetype)
+                    buffer.clear()
+            if pacer and offset >= next_flush:
+                flush_sinks()
+                next_flush = offset + flush_interval
+
+            gen_ns += t1 - t0
+            sink_ns += time.perf_counter_ns() - t1
+
+        flush_sinks(force=True)
+    except KeyboardInterrupt:
+        if not realtime:
+            raise
+        print("\n  [INTERRUPTED] Stopping real-time feed")
+        flush_sinks(force=True)
+    finally:
+        for f in files.values():
+            f.close()
+
+    elapsed = (datetime.utcnow() - start_time).total_seconds()
+    total = sum(counts.values())
+    print("\n" + "=" * 70)
+    print("  SCENARIO COMPLETE")
+    for name, count in counts.items():
+        gen = generators[name]
+        print(f"    {name:20s} {count:>10d} events "
+              f"({gen.malicious_count} malicious, {gen.benign_count} benign)")
+    print(f"  Total events:   {total}")
+    print(f"  Avg timeline EPS: {total / scenario.duration_s:.1f}")
+    _write_stats_report({name: gen.stats for name, gen in generators.items()})
     print(f"  Elapsed time:   {elapsed:.1f}s")
+    if pacer:
+        _print_pacing_report(pacer.report(), gen_ns, sink_ns)
     if hec_sender:
-        stats = hec_sender.get_stats()
-        print(f"  HEC sent:       {stats['events_sent']}")
-        print(f"  HEC failed:     {stats['events_failed']}")
+        _print_hec_stats(hec_sender)
     print("=" * 70)
 
-    return all_events
+    return counts
+
+
+def _print_pacing_report(report: dict, gen_ns: int, sink_ns: int) -> None:
+    """Show achieved vs. target EPS and which side limited throughput."""
+    span = report["span_s"]
+    idle = min(report["wait_s"], span)  # time the pacer spent waiting for deadlines
+    busy_s = span - idle
+    print(f"  Target EPS:     {report['target_eps']}")
+    print(f"  Achieved EPS:   {report['achieved_eps']} ({report['achieved_pct']}%) "
+          f"over the {span:.2f}s schedule")
+    print(f"  Late events:    {report['late_events']} ({report['late_pct']}%) | "
+          f"max lag {report['max_lag_ms']} ms | rebases {report['rebases']}")
+    print(f"  Release error:  {report['mean_release_error_us']} µs mean (on-time events)")
+    print(f"  Busy time:      generate {gen_ns / 1e9:.2f}s | "
+          f"sink {sink_ns / 1e9:.2f}s | idle {idle:.2f}s")
+    # Only a loop that was busy for most of the schedule was held back by its own work
+    saturated = busy_s >= 0.9 * span
+    if report["achieved_pct"] < 99:
+        if saturated:
+            bottleneck = "generator" if gen_ns >= sink_ns else "sink (HEC/indexer or disk)"
+        else:
+            bottleneck = f"release timing (loop idle {100 * idle / span:.0f}% of the schedule)"
+        print(f"  [WARNING] Target EPS not sustained — bottleneck: {bottleneck}")
+    elif report["late_pct"] > 1 and not saturated:
+        print(f"  [NOTE] Release jitter: {report['late_pct']}% of events released late "
+              f"(max {report['max_lag_ms']} ms) while the loop was idle — sleep overshoot, "
+              f"not generator or sink pressure")
+
+
+def _write_stats_report(stats: dict) -> None:
+    """Write per-generator EventStats and their merged total next to the logs."""
+    if not stats:
+        return
+    report = write_report(config.STATS_REPORT_FILE, stats)["total"]
+    distinct = ", ".join(f"{f}≈{n}" for f, n in report["cardinality"].items())
+    print(f"  Stats report:   {config.STATS_REPORT_FILE} ({distinct})")
+
+
+def _print_hec_stats(hec_sender) -> None:
+    """Wait for queued HEC sends, then show delivery counts (per destination when routed)."""
+    hec_sender.flush()
+    stats = hec_sender.get_stats()
+    print(f"  HEC sent:       {stats['events_sent']}")
+    print(f"  HEC failed:     {stats['events_failed']}")
+    if isinstance(hec_sender, HECRouter):
+        for dest in hec_sender.destination_stats():
+            print(f"    {dest['endpoint']:44s} {dest['events_sent']:>9d} sent "
+                  f"{dest['events_failed']:>6d} failed  {', '.join(dest['routes'])}")
+
+
+def _print_syslog_stats(syslog_sender: SyslogSender) -> None:
+    """Show syslog delivery counts and how often the collector pushed back."""
+    stats = syslog_sender.get_stats()
+    print(f"  Syslog sent:    {stats['messages_sent']} ({stats['bytes_sent'] / 1e6:.1f} MB, "
+          f"{stats['syscalls']} syscalls)")
+    print(f"  Syslog dropped: {stats['dropped']}")
+    print(f"  Backpressure:   {stats['backpressure_waits']} waits, {stats['blocked_s']}s blocked"
+          f" | reconnects {stats['reconnects']}")
+
+
+def _realtime_scenario(selected: list, eps: float, duration: float, log_format: str, hec: bool) -> Scenario:
+    """Build a flat-profile scenario that spreads `eps` evenly over the selected generators."""
+    return Scenario({
+        "name": "realtime",
+        "format": log_format,
+        "sink": "both" if hec else "file",
+        "profile": [{"duration_s": duration, "eps": eps}],
+        "generators": {name: {"eps": 1} for name in selected},
+    })
 
 
 def main():
@@ -136,12 +581,64 @@ def main():
                         help="Log output format")
     parser.add_argument("--time-span", type=int, default=config.DEFAULT_TIME_SPAN_HOURS,
                         help="Hours to spread events over")
+    parser.add_argument("--scenario", type=str, default="",
+                        help="Run a declarative JSON/TOML scenario file instead of --all/--generators")
+
+    parser.add_argument("--merged", action="store_true",
+                        help="Write one time-ordered combined.log (and HEC feed) across generators")
+
+    # Stratified sampling / thinning
+    parser.add_argument("--sample", action="append", default=[], metavar="RULE",
+                        help="Keep a fraction of a stratum, e.g. benign=0.05, "
+                             "sourcetype:attack_sim:web=0.2, host:*=0.1 (repeatable)")
+    parser.add_argument("--sample-seed", type=int, default=None,
+                        help="Seed for sampling decisions (seeded runs derive it from --seed)")
+
+    parser.add_argument("--background", action="store_true",
+                        help="Stream the prebuilt benign corpus and generate --events malicious events per generator")
+
+    # Reproducible runs / dataset cache
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed every generator (generator k gets seed + k) for reproducible output")
+    parser.add_argument("--anchor", type=str, default=None,
+                        help="Timeline end for seeded runs, e.g. 2026-01-01T00:00:00 "
+                             f"(default: now floored to {config.SEED_ANCHOR_SECONDS}s)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve seeded runs from the dataset cache (sequential mode)")
+    parser.add_argument("--cache-mode", choices=["hardlink", "copy"], default=config.DATASET_CACHE_MODE)
+
+    # Multi-process mode
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Run generators in N worker processes over shared-memory rings")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="File/HEC writer processes draining the rings (default: 1)")
+
+    # Real-time paced mode
+    parser.add_argument("--realtime", action="store_true",
+                        help="Stamp events 'now' and emit them paced to the wall clock")
+    parser.add_argument("--eps", type=float, default=10.0,
+                        help="Aggregate events per second in --realtime mode (default: 10)")
+    parser.add_argument("--duration", type=float, default=300.0,
+                        help="Seconds to run in --realtime mode (default: 300)")
 
     # Splunk HEC options
     parser.add_argument("--hec", action="store_true",
                         help="Send events to Splunk HEC")
     parser.add_argument("--hec-url", type=str, default=config.SPLUNK_HEC_URL)
     parser.add_argument("--hec-token", type=str, default=config.SPLUNK_HEC_TOKEN)
+    parser.add_argument("--hec-routes", type=str, default=config.HEC_ROUTES_FILE,
+                        help="JSON routing table: sourcetype → url/token/index, one queue per destination")
+
+    # Syslog network sink options
+    parser.add_argument("--syslog", action="store_true",
+                        help="Stream formatted lines to a syslog collector")
+    parser.add_argument("--syslog-host", type=str, default=config.SYSLOG_HOST)
+    parser.add_argument("--syslog-port", type=int, default=config.SYSLOG_PORT)
+    parser.add_argument("--syslog-protocol", choices=["udp", "tcp"], default=config.SYSLOG_PROTOCOL)
+    parser.add_argument("--syslog-framing", choices=["octet", "lf"], default=config.SYSLOG_FRAMING,
+                        help="TCP framing: RFC 6587 octet counting or newline")
+    parser.add_argument("--syslog-drop", action="store_true",
+                        help="Drop messages instead of blocking when the collector falls behind")
 
     # List available generators
     parser.add_argument("--list", action="store_true",
@@ -157,16 +654,55 @@ def main():
         return
 
     # Determine which generators to run
-    if args.all:
+    if args.scenario:
+        selected = []
+    elif args.all:
         selected = list(GENERATORS.keys())
     elif args.generators:
         selected = [g.strip() for g in args.generators.split(",")]
     else:
         parser.error("Specify --all or --generators=name1,name2")
 
+    end_time = None
+    if args.seed is not None:
+        if args.anchor:
+            try:
+                end_time = datetime.fromisoformat(args.anchor.rstrip("Z"))
+            except ValueError:
+                parser.error(f"--anchor must be an ISO timestamp, got '{args.anchor}'")
+        else:
+            now = int(time.time())
+            end_time = datetime.utcfromtimestamp(now - now % config.SEED_ANCHOR_SECONDS)
+    elif args.cache or args.anchor:
+        parser.error("--cache and --anchor require --seed")
+
+    cache = None
+    if args.cache:
+        cache = DatasetCache(mode=args.cache_mode)
+        if args.scenario or args.realtime or args.workers or args.merged or args.background:
+            print("  [WARNING] --cache applies to sequential runs only — ignoring")
+
+    sampler = None
+    if args.sample:
+        try:
+            sampler = StratifiedSampler.from_specs(args.sample, seed=args.sample_seed)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.scenario or args.realtime or args.background:
+            print("  [WARNING] --sample applies to sequential, --merged and --workers runs only — ignoring")
+
     # Set up HEC sender if requested
     hec_sender = None
-    if args.hec:
+    if args.hec and args.hec_routes:
+        try:
+            hec_sender = HECRouter.from_file(args.hec_routes, default_url=args.hec_url,
+                                             default_token=args.hec_token)
+        except (OSError, ValueError) as e:
+            parser.error(f"--hec-routes: {e}")
+        print(f"\n  HEC routes: {args.hec_routes}")
+        for dest in hec_sender.destination_stats():
+            print(f"    {dest['endpoint']:44s} {', '.join(dest['routes'])}")
+    elif args.hec:
         hec_sender = SplunkHECSender(
             hec_url=args.hec_url,
             hec_token=args.hec_token,
@@ -174,12 +710,95 @@ def main():
         )
         print(f"\n  HEC endpoint: {args.hec_url}")
 
+    # Set up syslog sender if requested
+    syslog_sender = None
+    if args.syslog:
+        # Checked before connecting: the sender opens its socket on construction
+        if args.scenario or args.realtime or args.workers:
+            parser.error("--syslog applies to sequential, --merged and --background runs only")
+        try:
+            syslog_sender = SyslogSender(
+                host=args.syslog_host,
+                port=args.syslog_port,
+                protocol=args.syslog_protocol,
+                framing=args.syslog_framing,
+                sndbuf=config.SYSLOG_SNDBUF,
+                on_full="drop" if args.syslog_drop else "block",
+            )
+        except OSError as e:
+            parser.error(f"--syslog: cannot reach {args.syslog_protocol}://{args.syslog_host}:"
+                         f"{args.syslog_port} ({e})")
+        print(f"\n  Syslog collector: {args.syslog_protocol}://{args.syslog_host}:{args.syslog_port}")
+
+    if args.scenario:
+        run_scenario(load_scenario(args.scenario), hec_sender=hec_sender, realtime=args.realtime)
+        return
+
+    if args.realtime:
+        unknown = [g for g in selected if g not in GENERATORS]
+        if unknown:
+            parser.error(f"Unknown generator(s): {', '.join(unknown)}")
+        scenario = _realtime_scenario(selected, args.eps, args.duration, args.format, args.hec)
+        run_scenario(scenario, hec_sender=hec_sender, realtime=True)
+        return
+
+    if args.background:
+        unknown = [g for g in selected if g not in GENERATORS]
+        if unknown:
+            parser.error(f"Unknown generator(s): {', '.join(unknown)}")
+        run_with_background(
+            jobs=[(g, GENERATORS[g]["class"], GENERATORS[g]["kwargs"]) for g in selected],
+            event_count=args.events,
+            log_format=args.format,
+            time_span=args.time_span,
+            hec_sender=hec_sender,
+            syslog_sender=syslog_sender,
+        )
+        return
+
+    if args.workers:
+        unknown = [g for g in selected if g not in GENERATORS]
+        if unknown:
+            parser.error(f"Unknown generator(s): {', '.join(unknown)}")
+        run_parallel(
+            jobs=[(g, GENERATORS[g]["class"], GENERATORS[g]["kwargs"]) for g in selected],
+            event_count=args.events,
+            log_format=args.format,
+            time_span=args.time_span,
+            workers=args.workers,
+            writers=args.writers,
+            hec_sender=hec_sender,
+            seed=args.seed,
+            sampler=sampler,
+            end_time=end_time,
+        )
+        return
+
+    if args.merged:
+        run_merged(
+            selected=selected,
+            event_count=args.events,
+            log_format=args.format,
+            time_span=args.time_span,
+            hec_sender=hec_sender,
+            syslog_sender=syslog_sender,
+            sampler=sampler,
+            seed=args.seed,
+            end_time=end_time,
+        )
+        return
+
     run_generators(
         selected=selected,
         event_count=args.events,
         log_format=args.format,
         time_span=args.time_span,
         hec_sender=hec_sender,
+        syslog_sender=syslog_sender,
+        sampler=sampler,
+        seed=args.seed,
+        end_time=end_time,
+        cache=cache,
     )
 
 
@@ -0,0 +1,252 @@
+"""
+scenario.py — Declarative Workload Scenarios and Rate Scheduling
+
+Loads scenario files (JSON or TOML) that describe a mixed-traffic
+workload: which generators run, how much each contributes (absolute
+event count or target EPS), their benign ratio, time span and sink,
+plus an optional aggregate EPS profile made of steady, ramp and burst
+phases.
+
+The `RateScheduler` turns a piecewise-linear EPS profile into evenly
+spaced arrival offsets, and `Scenario.schedule()` interleaves the
+generators across those arrivals with smooth weighted round-robin so
+every slice of the timeline carries the configured traffic mix.
+
+Example scenario (JSON):
+    {
+      "name": "indexer_mixed_load",
+      "format": "json",
+      "profile": [
+        {"duration_s": 600, "eps": 200},
+        {"duration_s": 300, "eps_start": 200, "eps_end": 1000},
+        {"duration_s": 30,  "eps": 5000, "label": "burst"}
+      ],
+      "generators": {
+        "brute_force": {"eps": 50, "benign_ratio": 0.5, "sink": "hec"},
+        "web_attack":  {"events": 20000, "kwargs": {"attack_types": ["sqli"]}}
+      }
+    }
+
+Usage:
+    from data_generators.scenario import load_scenario
+
+    scenario = load_scenario("scenarios/indexer_mixed_load.json")
+    for offset_s, gen_name in scenario.schedule():
+        ...
+"""
+
+import json
+import heapq
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    tomllib = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+SINKS = ("file", "hec", "both", "none")
+
+
+class Phase:
+    """One segment of an EPS profile: steady (start == end) or a linear ramp."""
+
+    def __init__(self, duration_s: float, eps_start: float, eps_end: float, label: str = ""):
+        if duration_s <= 0:
+            raise ValueError(f"Phase duration must be positive, got {duration_s}")
+        if eps_start < 0 or eps_end < 0:
+            raise ValueError("Phase EPS values must be non-negative")
+        self.duration_s = float(duration_s)
+        self.eps_start = float(eps_start)
+        self.eps_end = float(eps_end)
+        self.label = label
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Phase":
+        """Build a phase from `{"duration_s", "eps"}` or `{"duration_s", "eps_start", "eps_end"}`."""
+        if "eps" in spec:
+            eps_start = eps_end = spec["eps"]
+        else:
+            eps_start, eps_end = spec["eps_start"], spec["eps_end"]
+        return cls(spec["duration_s"], eps_start, eps_end, spec.get("label", ""))
+
+    @property
+    def event_count(self) -> float:
+        """Expected number of arrivals in this phase (area under the rate curve)."""
+        return (self.eps_start + self.eps_end) / 2 * self.duration_s
+
+    def time_for_count(self, n: float) -> float:
+        """
+        Invert the cumulative arrival curve: seconds into the phase at
+        which the n-th arrival occurs. For a ramp the cumulative count is
+        a*t + (b-a)*t^2 / (2d), so this solves the quadratic.
+        """
+        a, b, d = self.eps_start, self.eps_end, self.duration_s
+        slope = (b - a) / d
+        if abs(slope) < 1e-12:
+            return n / a if a else d
+        # slope/2 * t^2 + a*t - n = 0
+        disc = a * a + 2 * slope * n
+        return (-a + math.sqrt(max(disc, 0.0))) / slope
+
+
+class RateScheduler:
+    """
+    Convert an aggregate EPS profile into arrival offsets (seconds from
+    the start of the profile). Arrivals are evenly spaced under the rate
+    curve, so the emitted stream tracks the profile exactly rather than
+    approximately like a Poisson process would.
+    """
+
+    def __init__(self, phases: List[Phase]):
+        if not phases:
+            raise ValueError("A rate profile needs at least one phase")
+        self.phases = phases
+
+    @property
+    def duration_s(self) -> float:
+        return sum(p.duration_s for p in self.phases)
+
+    @property
+    def total_events(self) -> int:
+        return int(sum(p.event_count for p in self.phases))
+
+    def offsets(self) -> Iterator[float]:
+        """Yield the offset of every arrival, in ascending order."""
+        phase_start = 0.0
+        cumulative = 0.0  # arrivals expected before the current phase
+        k = 1
+        for phase in self.phases:
+            phase_end_count = cumulative + phase.event_count
+            while k <= phase_end_count + 1e-9:
+                yield phase_start + phase.time_for_count(k - cumulative)
+                k += 1
+            cumulative = phase_end_count
+            phase_start += phase.duration_s
+
+
+class GeneratorSpec:
+    """Per-generator section of a scenario file."""
+
+    def __init__(self, name: str, spec: Dict[str, Any], defaults: Dict[str, Any]):
+        if "eps" in spec and "events" in spec:
+            raise ValueError(f"Generator '{name}': give either 'eps' or 'events', not both")
+        self.name = name
+        self.generator = spec.get("generator", name)
+        self.eps: Optional[float] = spec.get("eps")
+        self.events: Optional[int] = spec.get("events")
+        self.time_span_hours = spec.get("time_span_hours", defaults["time_span_hours"])
+        self.benign_ratio = spec.get("benign_ratio", defaults["benign_ratio"])
+        self.sink = spec.get("sink", defaults["sink"])
+        self.kwargs = spec.get("kwargs", {})
+        if self.sink not in SINKS:
+            raise ValueError(f"Generator '{name}': unknown sink '{self.sink}' (choose from {SINKS})")
+        if self.eps is None and self.events is None:
+            self.events = defaults["events"]
+
+    def rate(self, duration_s: float) -> float:
+        """Average EPS this generator contributes over `duration_s`."""
+        if self.eps is not None:
+            return float(self.eps)
+        return self.events / duration_s
+
+
+class Scenario:
+    """
+    A parsed scenario: global settings, per-generator specs and an
+    optional aggregate EPS profile.
+
+    With a profile, the profile sets the aggregate rate over time and
+    each generator's `eps`/`events` only sets its share of the mix.
+    Without one, every generator runs its own constant-rate stream over
+    its own `time_span_hours`, all ending at "now", merged by time.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.name = data.get("name", "scenario")
+        self.log_format = data.get("format", config.DEFAULT_LOG_FORMAT)
+        defaults = {
+            "time_span_hours": data.get("time_span_hours", config.DEFAULT_TIME_SPAN_HOURS),
+            "benign_ratio": data.get("benign_ratio", config.BENIGN_TRAFFIC_RATIO),
+            "sink": data.get("sink", "file"),
+            "events": data.get("events", config.DEFAULT_EVENT_COUNT),
+        }
+        if not data.get("generators"):
+            raise ValueError(f"Scenario '{self.name}' defines no generators")
+        self.generators = [
+            GeneratorSpec(name, spec or {}, defaults)
+            for name, spec in data["generators"].items()
+        ]
+        profile = data.get("profile")
+        self.profile = RateScheduler([Phase.from_dict(p) for p in profile]) if profile else None
+
+    @property
+    def duration_s(self) -> float:
+        """Length of the simulated timeline in seconds."""
+        if self.profile:
+            return self.profile.duration_s
+        return max(g.time_span_hours for g in self.generators) * 3600
+
+    def schedule(self) -> Iterator[Tuple[float, str]]:
+        """
+        Yield `(offset_s, generator_name)` pairs in time order, where
+        offset_s counts from the start of the scenario timeline.
+        """
+        if self.profile:
+            return self._profile_schedule()
+        return self._independent_schedule()
+
+    def _profile_schedule(self) -> Iterator[Tuple[float, str]]:
+        """Assign each profile arrival to a generator by smooth weighted round-robin."""
+        duration = self.profile.duration_s
+        names = [g.name for g in self.generators]
+        weights = [g.rate(duration) for g in self.generators]
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("Generator weights must sum to a positive value")
+        current = [0.0] * len(weights)
+        for offset in self.profile.offsets():
+            best = 0
+            for i, w in enumerate(weights):
+                current[i] += w
+                if current[i] > current[best]:
+                    best = i
+            current[best] -= total
+            yield offset, names[best]
+
+    def _independent_schedule(self) -> Iterator[Tuple[float, str]]:
+        """Merge per-generator constant-rate streams, aligned to end together."""
+        end = self.duration_s
+        streams = []
+        for g in self.generators:
+            span = g.time_span_hours * 3600
+            rate = g.rate(span)
+            if rate <= 0:
+                continue
+            streams.append(self._shifted(RateScheduler([Phase(span, rate, rate)]), end - span, g.name))
+        return heapq.merge(*streams)
+
+    @staticmethod
+    def _shifted(scheduler: RateScheduler, start: float, name: str) -> Iterator[Tuple[float, str]]:
+        for offset in scheduler.offsets():
+            yield start + offset, name
+
+
+def load_scenario(path) -> Scenario:
+    """Parse a `.json` or `.toml` scenario file."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        if tomllib is None:
+            raise ValueError("TOML scenarios require Python 3.11+ (tomllib); use JSON instead")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+    return Scenario(data)
@@ -123,6 +123,13 @@ class WebAttackSimulator(BaseGenerator):
             **kwargs,
         )
         self.attack_types = attack_types or ["sqli", "xss", "path_traversal", "cmd_injection"]
+        self.web_server_ip = self.inventory.ip_for_host("web-server-01")
+
+        # Built-in payload lists unless external corpora are configured
+        self.sqli_payloads = self._load_corpus("sqli", self.SQLI_PAYLOADS)
+        self.xss_payloads = self._load_corpus("xss", self.XSS_PAYLOADS)
+        self.path_traversal_payloads = self._load_corpus("path_traversal", self.PATH_TRAVERSAL_PAYLOADS)
+        self.cmd_injection_payloads = self._load_corpus("cmd_injection", self.CMD_INJECTION_PAYLOADS)
 
     def generate_malicious_event(self, timestamp: str) -> Dict[str, Any]:
         """
@@ -133,7 +140,6 @@ class WebAttackSimulator(BaseGenerator):
         """
         attack_type = random.choice(self.attack_types)
         attacker_ip = random.choice(config.EXTERNAL_ATTACKER_IPS)
-        target_host = config.TARGET_HOSTS["web-server-01"]
 
         payload, mitre_key = self._get_payload(attack_type)
         method = random.choice(self.HTTP_METHODS_ATTACK)
@@ -146,7 +152,7 @@ class WebAttackSimulator(BaseGenerator):
             "event_type": "http_request",
             "hostname": "web-server-01",
             "src_ip": attacker_ip,
-            "dst_ip": target_host["ip"],
+            "dst_ip": self.web_server_ip,
             "dst_port": 443,
             "method": method,
             "url": url_path,
@@ -173,8 +179,7 @@ class WebAttackSimulator(BaseGenerator):
         Represents legitimate user traffic the WAF and SIEM should ignore.
         """
         src_subnet = random.choice(config.INTERNAL_SUBNETS)
-        src_ip = f"{src_subnet.split('/')[0].rsplit('.', 1)[0]}.{random.randint(10, 254)}"
-        target_host = config.TARGET_HOSTS["web-server-01"]
+        src_ip = self.inventory.random_ip(src_subnet)
 
         method = random.choice(self.HTTP_METHODS_NORMAL)
         url_path = random.choice(self.NORMAL_PATHS)
@@ -186,7 +191,7 @@ class WebAttackSimulator(BaseGenerator):
             "event_type": "http_request",
             "hostname": "web-server-01",
             "src_ip": src_ip,
-            "dst_ip": target_host["ip"],
+            "dst_ip": self.web_server_ip,
             "dst_port": 443,
             "method": method,
             "url": url_path,
@@ -202,12 +207,12 @@ class WebAttackSimulator(BaseGenerator):
     def _get_payload(self, attack_type: str):
         """Select a random payload for the given attack type."""
         payload_map = {
-            "sqli":           (self.SQLI_PAYLOADS,           "sql_injection"),
-            "xss":            (self.XSS_PAYLOADS,            "xss"),
-            "path_traversal": (self.PATH_TRAVERSAL_PAYLOADS, "sql_injection"),
-            "cmd_injection":  (self.CMD_INJECTION_PAYLOADS,  "sql_injection"),
+            "sqli":           (self.sqli_payloads,           "sql_injection"),
+            "xss":            (self.xss_payloads,            "xss"),
+            "path_traversal": (self.path_traversal_payloads, "sql_injection"),
+            "cmd_injection":  (self.cmd_injection_payloads,  "sql_injection"),
         }
-        payloads, mitre_key = payload_map.get(attack_type, (self.SQLI_PAYLOADS, "sql_injection"))
+        payloads, mitre_key = payload_map.get(attack_type, (self.sqli_payloads, "sql_injection"))
         return random.choice(payloads), mitre_key
 
     def _build_attack_url(self, attack_type: str, payload: str) -> str:
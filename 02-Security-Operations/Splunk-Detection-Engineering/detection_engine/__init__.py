@@ -0,0 +1,7 @@
+"""
+Detection Engine — Offline Evaluation of the SPL Detections
+
+Streaming Python re-implementations of the searches in `detections/`
+and `alerts/`, run directly over generator output so detection logic
+can be checked without a Splunk instance.
+"""
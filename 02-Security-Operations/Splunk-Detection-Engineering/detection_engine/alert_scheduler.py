@@ -0,0 +1,383 @@
+"""
+alert_scheduler.py — Scheduled-Alert Emulation over Overlapping Windows
+
+Replays a generated timeline through the saved searches of a
+savedsearches.conf such as alerts/critical_alerts.conf. Each stanza runs
+at every minute its `cron_schedule` matches (UTC), over its
+`dispatch.earliest_time` .. `dispatch.latest_time` window, and its alert
+condition and throttling (`alert.suppress*`) decide whether it fires.
+
+Consecutive runs overlap: a */5 search over -10m sees every event twice,
+and the */15 lateral-movement search over -35m sees some three times.
+Instead of re-running the whole search per window, each search is split
+at its first `stats`:
+
+    row stages  search, where, eval, bin: run once per event
+    stats       kept per time slice as partial aggregates
+                (StatsStage.partial), merged for each run's window
+    the rest    where, eval, sort, ...: run on the merged result
+
+Slices are the largest interval that every window boundary falls on (the
+gcd of run times and window offsets: 5 minutes for the lab's alerts), so
+a window is an exact union of slices and gets the result the full search
+would. Searches without `stats` keep their filtered rows per slice
+instead. A slice is dropped once it is older than the next run's window,
+so memory holds one window per search. Searches whose row stages depend
+on "now" (`earliest=`, `now()`) are re-run over every window.
+
+Usage:
+    from detection_engine.alert_scheduler import ScheduledSearch, parse_conf, emulate
+
+    searches = [ScheduledSearch(saved) for saved in parse_conf("alerts/critical_alerts.conf")]
+    firings = emulate(searches, load_table(paths, fields))
+"""
+
+import re
+import math
+import time
+import configparser
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from detection_engine.base import parse_span
+from detection_engine.spl import StatsStage, Table, compile_search
+
+SEVERITIES = {1: "debug", 2: "info", 3: "low", 4: "medium", 5: "high", 6: "critical"}
+ROW_STAGES = {"search", "where", "eval", "bin", "bucket"}
+COMPARATORS = {
+    "greater than": lambda n, prev, threshold: n > threshold,
+    "less than": lambda n, prev, threshold: n < threshold,
+    "equal to": lambda n, prev, threshold: n == threshold,
+    "not equal to": lambda n, prev, threshold: n != threshold,
+    "rises by": lambda n, prev, threshold: n - prev > threshold,
+    "drops by": lambda n, prev, threshold: prev - n > threshold,
+}
+
+_NOW_DEPENDENT = re.compile(r"\b(?:earliest|latest)\s*=|\bnow\s*\(|\brelative_time\s*\(")
+_TOKEN = re.compile(r"\$(result\.)?(\w+)\$")
+
+
+# ── Cron ─────────────────────────────────────────────────────
+class Cron:
+    """Five-field cron expression (minute hour day month weekday), in UTC."""
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, text: str):
+        self.text = text
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"Invalid cron_schedule '{text}' (expected 5 fields)")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._field(part, low, high) for part, (low, high) in zip(parts, self.RANGES))
+        # As in cron: when both day fields are restricted, either one matching is enough
+        self._either_day = parts[2] != "*" and parts[4] != "*"
+
+    def _field(self, text: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for item in text.split(","):
+            spec, _, step = item.partition("/")
+            try:
+                if spec == "*":
+                    start, end = low, high
+                elif "-" in spec:
+                    start, end = (int(x) for x in spec.split("-", 1))
+                else:
+                    start = end = int(spec)
+                    if step:
+                        end = high
+                step = int(step) if step else 1
+            except ValueError:
+                raise ValueError(f"Invalid cron field '{text}' in '{self.text}'")
+            if high == 6 and end == 7:  # Sunday as 7
+                values.add(0)
+                end = 6
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Cron field '{text}' out of range {low}-{high} in '{self.text}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, epoch: float) -> bool:
+        dt = datetime.fromtimestamp(epoch, tz=timezone.utc)
+        if dt.minute not in self.minutes or dt.hour not in self.hours or dt.month not in self.months:
+            return False
+        day, weekday = dt.day in self.days, (dt.weekday() + 1) % 7 in self.weekdays
+        return (day or weekday) if self._either_day else (day and weekday)
+
+    def times(self, start: float, end: float) -> Iterator[int]:
+        """Run times in (start, end], as epoch seconds."""
+        t = (int(start) // 60 + 1) * 60
+        while t <= end:
+            if (t // 60) % 60 in self.minutes and self.matches(t):
+                yield t
+            t += 60
+
+
+# ── savedsearches.conf ───────────────────────────────────────
+class SavedSearch(NamedTuple):
+    name: str
+    search: str
+    cron: Cron
+    earliest: int           # window start, seconds relative to the run time
+    latest: int             # window end (exclusive)
+    alert_type: str
+    comparator: str
+    threshold: float
+    severity: str
+    suppress_period: int    # 0: no throttling
+    suppress_fields: Tuple[str, ...]
+    subject: str
+
+
+def _offset(text: str) -> int:
+    """dispatch.earliest_time / latest_time ("-10m", "now") → seconds."""
+    text = text.strip()
+    if text in ("now", ""):
+        return 0
+    if text[0] in "+-":
+        try:
+            return (-1 if text[0] == "-" else 1) * parse_span(text[1:])
+        except ValueError:
+            pass
+    raise ValueError(f"Unsupported dispatch time '{text}' (use e.g. -15m, -1h, now)")
+
+
+def parse_conf(path: Union[str, Path]) -> List[SavedSearch]:
+    """The scheduled stanzas of a savedsearches.conf, in file order."""
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None, strict=False)
+    parser.optionxform = str  # keys are case-sensitive in .conf files
+    with open(path) as f:
+        parser.read_file(f)
+
+    saved = []
+    for name in parser.sections():
+        stanza = parser[name]
+        if stanza.get("is_scheduled", "0").strip() != "1":
+            continue
+        if "search" not in stanza or "cron_schedule" not in stanza:
+            raise ValueError(f"[{name}] needs search and cron_schedule")
+        # "\" line continuations; configparser has already joined the indented lines
+        search = re.sub(r"\s*\\\n\s*", " ", stanza["search"]).strip()
+        alert_type = stanza.get("alert_type", "always").strip()
+        if alert_type not in ("always", "number of events", "number of results"):
+            raise ValueError(f"[{name}] alert_type '{alert_type}' is not supported")
+        comparator = stanza.get("alert_comparator", "greater than").strip()
+        if comparator not in COMPARATORS:
+            raise ValueError(f"[{name}] alert_comparator '{comparator}' is not supported")
+        severity = int(stanza.get("alert.severity", "3"))
+        suppressed = stanza.get("alert.suppress", "0").strip() == "1"
+        fields = stanza.get("alert.suppress.fields", "")
+        saved.append(SavedSearch(
+            name=name,
+            search=search,
+            cron=Cron(stanza["cron_schedule"]),
+            earliest=_offset(stanza.get("dispatch.earliest_time", "")),
+            latest=_offset(stanza.get("dispatch.latest_time", "now")),
+            alert_type=alert_type,
+            comparator=comparator,
+            threshold=float(stanza.get("alert_threshold", "0")),
+            severity=SEVERITIES.get(severity, str(severity)),
+            suppress_period=parse_span(stanza.get("alert.suppress.period", "0s").strip()) if suppressed else 0,
+            suppress_fields=tuple(f.strip() for f in fields.split(",") if f.strip()) if suppressed else (),
+            subject=stanza.get("action.email.subject", ""),
+        ))
+    return saved
+
+
+# ── Emulation ────────────────────────────────────────────────
+class Firing(NamedTuple):
+    search: str
+    time: float
+    severity: str
+    results: List[Dict[str, Any]]
+    subject: str
+
+
+def _concat(tables: Sequence[Table], now: float) -> Table:
+    """Rows of `tables`, in order, as one table."""
+    names = []
+    for table in tables:
+        names.extend(n for n in table.columns if n not in names)
+    columns = {}
+    for name in names:
+        col = []
+        for table in tables:
+            col.extend(table.column(name))
+        columns[name] = col
+    return Table(columns, sum(len(t) for t in tables), now)
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+
+def _same_rows(a: List[Dict[str, Any]], b: List[Dict[str, Any]]) -> bool:
+    return len(a) == len(b) and all(
+        x.keys() == y.keys() and all(_same(x[k], y[k]) for k in x) for x, y in zip(a, b))
+
+
+class ScheduledSearch:
+    """
+    One saved search on its schedule: windows, alert condition, throttling,
+    and what each run cost.
+    """
+
+    def __init__(self, saved: SavedSearch):
+        self.saved = saved
+        self.pipeline = compile_search(saved.search)  # SPLError for unsupported SPL
+        stages = self.pipeline.stages
+        n = 0
+        while n < len(stages) and stages[n][0] in ROW_STAGES:
+            n += 1
+        self.row_stages = [stage for _, stage in stages[:n]]
+        self.stats: Optional[StatsStage] = None
+        if n < len(stages) and isinstance(stages[n][1], StatsStage):
+            self.stats = stages[n][1]
+            n += 1
+        self.rest = [stage for _, stage in stages[n:]]
+        self.incremental = not _NOW_DEPENDENT.search(saved.search)
+        self.slice = 0
+
+        self.runs = 0
+        self.fired = 0
+        self.throttled = 0
+        self.results = 0
+        self.events_in_windows = 0   # what re-running the search per window scans
+        self.events_sliced = 0       # what the incremental runs scan
+        self.partials_merged = 0
+        self.incremental_time = 0.0
+        self.full_time = 0.0
+        self.mismatches = 0
+
+    @property
+    def fields(self) -> Optional[Set[str]]:
+        """Columns to load: the search's, plus those throttling and the subject read."""
+        if self.pipeline.fields is None:
+            return None
+        tokens = {m.group(2) for m in _TOKEN.finditer(self.saved.subject) if m.group(1)}
+        return self.pipeline.fields | set(self.saved.suppress_fields) | tokens
+
+    def run(self, table: Table, verify: bool = False) -> List[Firing]:
+        """
+        Every scheduled run whose window overlaps `table`. With `verify`,
+        each window is also searched from scratch and compared.
+        """
+        saved = self.saved
+        if not len(table):
+            return []
+        times = table.column("_time")
+        first, last = times[0], times[-1]
+        runs = list(saved.cron.times(first - saved.latest, last - saved.earliest))
+        self.slice = math.gcd(abs(saved.earliest), abs(saved.latest), *runs) if runs else 0
+
+        partials: Dict[int, Any] = {}  # slice start → partial aggregate / filtered rows
+        suppressed: Dict[Tuple, float] = {}  # suppress.fields values → suppressed until
+        previous = 0
+        firings = []
+        for t in runs:
+            self.runs += 1
+            start, end = t + saved.earliest, t + saved.latest
+            lo, hi = bisect_left(times, start), bisect_left(times, end)
+            self.events_in_windows += hi - lo
+
+            if self.incremental:
+                started = time.perf_counter()
+                result = self._incremental(table, partials, start, end, t)
+                self.incremental_time += time.perf_counter() - started
+            if verify or not self.incremental:
+                started = time.perf_counter()
+                window = table.take(range(lo, hi))
+                full = self.pipeline.run(Table(window.columns, len(window), now=t))
+                self.full_time += time.perf_counter() - started
+                if not self.incremental:
+                    result = full
+                elif not _same_rows(list(result.rows()), list(full.rows())):
+                    self.mismatches += 1
+
+            rows = list(result.rows())
+            n = len(rows)
+            triggered = (saved.alert_type == "always"
+                         or COMPARATORS[saved.comparator](n, previous, saved.threshold))
+            previous = n
+            if not triggered:
+                continue
+            rows = self._throttle(rows, t, suppressed)
+            if rows is None:
+                self.throttled += 1
+                continue
+            self.fired += 1
+            self.results += len(rows)
+            firings.append(Firing(saved.name, t, saved.severity, rows, self._subject(rows)))
+        return firings
+
+    def _incremental(self, table: Table, partials: Dict[int, Any], start: float, end: float, now: float) -> Table:
+        times = table.column("_time")
+        step = self.slice
+        for s in [s for s in partials if s < start]:  # behind this and every later window
+            del partials[s]
+
+        merged: Dict[Tuple, list] = {}
+        pieces = []
+        s = start
+        while s < end:
+            partial = partials.get(s)
+            if partial is None:
+                lo, hi = bisect_left(times, s), bisect_left(times, s + step)
+                self.events_sliced += hi - lo
+                rows = table.take(range(lo, hi))
+                for stage in self.row_stages:
+                    rows = stage(rows)
+                partial = partials[s] = self.stats.partial(rows) if self.stats else rows
+            if self.stats:
+                self.stats.merge(merged, partial)
+                self.partials_merged += len(partial)
+            else:
+                pieces.append(partial)
+            s += step
+
+        if self.stats:
+            result = self.stats.finish(merged, Table({}, 0, now))
+        else:
+            result = _concat(pieces, now)
+        for stage in self.rest:
+            result = stage(result)
+        return result
+
+    def _throttle(self, rows: List[Dict[str, Any]], t: float, suppressed: Dict[Tuple, float]):
+        """Rows left after alert.suppress, or None when the whole firing is suppressed."""
+        saved = self.saved
+        if not saved.suppress_period:
+            return rows
+        if saved.suppress_fields and rows:
+            keys = [tuple(row.get(f) for f in saved.suppress_fields) for row in rows]
+            kept = [i for i, key in enumerate(keys) if suppressed.get(key, 0) <= t]
+            for i in kept:
+                suppressed[keys[i]] = t + saved.suppress_period
+            return [rows[i] for i in kept] or None
+        if suppressed.get((), 0) > t:  # the search as a whole
+            return None
+        suppressed[()] = t + saved.suppress_period
+        return rows
+
+    def _subject(self, rows: List[Dict[str, Any]]) -> str:
+        first = rows[0] if rows else {}
+
+        def token(m):
+            if m.group(1):
+                value = first.get(m.group(2), "")
+                return ",".join(map(str, value)) if isinstance(value, list) else str(value)
+            return self.saved.name if m.group(2) == "name" else m.group(0)
+        return _TOKEN.sub(token, self.saved.subject)
+
+
+def emulate(searches: Sequence[ScheduledSearch], table: Table, verify: bool = False) -> List[Firing]:
+    """Run every search on its schedule over `table`; firings in time order."""
+    firings = []
+    for search in searches:
+        firings.extend(search.run(table, verify))
+    firings.sort(key=lambda f: f.time)
+    return firings
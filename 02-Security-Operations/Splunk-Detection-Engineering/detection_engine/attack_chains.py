@@ -0,0 +1,304 @@
+"""
+attack_chains.py — Multi-Stage Attack-Chain Correlation
+
+Offline versions of the chain searches in alerts/correlation_searches.conf,
+run over the merged, time-ordered auth + web + proxy stream:
+
+    Recon → Exploit → Escalate (per src_ip, within 2h)
+        recon      scanner user agent (sqlmap, nikto, burp)
+        exploit    attack_type="sqli" answered with status 200
+        escalate   successful login to an admin/root account
+
+    Brute Force → Lateral Movement (within 2h of each step)
+        an external source fails 10+ logins, then succeeds on a host;
+        that host then logs into 2+ other hosts from inside 10.0.0.0/8
+
+The searches re-bin and re-join the whole dispatch window on every
+scheduled run. Here every entity instead has a small state machine that
+advances as its events arrive, in order: a phase only counts after the
+phases before it (an earlier phase restarts a chain that has not alerted
+yet), and a lateral hop only counts after the compromise.
+
+State expires with its window. Each chain's window starts at its first
+event and has a fixed length, so entries expire in insertion order and
+the live state is at most the entities active in the last `window`
+(capped at `max_keys`, oldest dropped first).
+
+Usage:
+    from detection_engine.attack_chains import recon_exploit_escalate, BruteForceLateralDetector
+
+    detections = [recon_exploit_escalate(), BruteForceLateralDetector(window="2h")]
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, List, NamedTuple, Sequence, Tuple
+
+import config
+from detection_engine.base import Detection, parse_span
+
+INTERNAL_PREFIX = "10."  # cidrmatch("10.0.0.0/8", ...) in the correlation searches
+
+
+class ExpiringState:
+    """
+    Per-entity state that lives until its `expires` time. Entries must be
+    started in expiry order (true for fixed-length windows over a
+    time-ordered stream), so expiring is popping from the front.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= now:
+            del self._entries[key]
+            self.expired += 1
+            return None
+        return entry
+
+    def start(self, key: Hashable, entry) -> None:
+        entries = self._entries
+        entries.pop(key, None)
+        if len(entries) >= self.max_keys:
+            entries.popitem(last=False)
+            self.evicted += 1
+        entries[key] = entry
+
+    def expire(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires > now:
+                break
+            del entries[key]
+            self.expired += 1
+
+
+# ── Recon → Exploit → Escalate ───────────────────────────────
+class Phase(NamedTuple):
+    name: str
+    technique: str
+    test: Callable[[Dict[str, Any]], bool]
+
+
+class _ChainState:
+    __slots__ = ("start", "expires", "phases", "times", "targets", "alerted")
+
+    def __init__(self, t: float, expires: float):
+        self.start = t
+        self.expires = expires
+        self.phases: List[int] = []
+        self.times: List[float] = []
+        self.targets = set()
+        self.alerted = 0  # phase count of the last alert
+
+
+class PhaseChainDetector(Detection):
+    """
+    Ordered phases per entity within `window` of the first one. Alerts
+    when `min_phases` phases are reached in order, and again (critical)
+    when the chain completes. Until the first alert, an event of an
+    earlier phase than the chain's last one starts the chain over.
+
+    A privileged login before the attack does not mask it:
+
+        >>> chain = recon_exploit_escalate()
+        >>> events = [
+        ...     {"src_ip": "203.0.113.9", "action": "success", "username": "root"},
+        ...     {"src_ip": "203.0.113.9", "user_agent": "sqlmap/1.7"},
+        ...     {"src_ip": "203.0.113.9", "attack_type": "sqli", "status_code": 200},
+        ...     {"src_ip": "203.0.113.9", "action": "success", "username": "admin"},
+        ... ]
+        >>> [a["severity"] for t, e in enumerate(events) for a in chain.process(e, 60.0 * t)]
+        ['high', 'critical']
+    """
+
+    def __init__(
+        self,
+        name: str,
+        phases: Sequence[Phase],
+        entity: str = "src_ip",
+        window="2h",
+        min_phases: int = 2,
+        max_keys: int = 100_000,
+    ):
+        if not 1 < min_phases <= len(phases):
+            raise ValueError(f"min_phases must be between 2 and {len(phases)}")
+        super().__init__(name, phases[1].technique, "high", entity=(entity,),
+                         techniques=[p.technique for p in phases])
+        self.phases = list(phases)
+        self.field = entity
+        self.window = parse_span(window)
+        self.min_phases = min_phases
+        self.states = ExpiringState(max_keys)
+
+    def state_size(self) -> int:
+        return len(self.states)
+
+    def evidence(self, alert: Dict[str, Any]) -> Tuple[Tuple, float, float]:
+        return (alert[self.field],), alert["first_seen"], alert["_time"]
+
+    def process(self, event: Dict[str, Any], t: float) -> List[Dict[str, Any]]:
+        self.states.expire(t)
+        phase = next((i for i, p in enumerate(self.phases) if p.test(event)), None)
+        if phase is None:
+            return []
+        key = event.get(self.field)
+        if key is None:
+            return []
+
+        state = self.states.get(key, t)
+        if state is None or (not state.alerted and phase < state.phases[-1]):
+            # An earlier phase restarts a chain that has not alerted yet, so
+            # a lone later phase (e.g. a routine admin login) cannot hold the
+            # window and drop the recon and exploit that follow it
+            state = _ChainState(t, t + self.window)
+            self.states.start(key, state)
+            self.peak_keys = max(self.peak_keys, len(self.states))
+        if event.get("hostname"):
+            state.targets.add(event["hostname"])
+        if state.phases and phase <= state.phases[-1]:
+            return []  # repeats, or a phase arriving out of order
+        state.phases.append(phase)
+        state.times.append(t)
+
+        reached = len(state.phases)
+        if reached < self.min_phases or state.alerted >= reached:
+            return []
+        if reached != self.min_phases and reached != len(self.phases):
+            return []
+        state.alerted = reached
+        names = [self.phases[i].name for i in state.phases]
+        return [self.alert(
+            t,
+            **{self.field: key},
+            phases_seen=reached,
+            attack_phases=names,
+            phase_times=list(state.times),
+            targets=sorted(state.targets),
+            first_seen=state.start,
+            mitre_technique=self.phases[phase].technique,
+            severity="critical" if reached == len(self.phases) else "high",
+            alert_name=f"Attack Chain Detected: {' → '.join(names)} from {key}",
+        )]
+
+
+_SCANNER = re.compile(r"(?i)(sqlmap|nikto|burp)")
+_PRIVILEGED = re.compile(r"(?i)(admin|root)")
+
+
+def recon_exploit_escalate(window="2h", min_phases: int = 2) -> PhaseChainDetector:
+    """The "Correlation - Attack Chain: Recon → Exploit → Escalate" search."""
+    phases = [
+        Phase("recon", "T1595.002",
+              lambda e: _SCANNER.search(e.get("user_agent") or "") is not None),
+        Phase("exploit", config.MITRE_TECHNIQUES["sql_injection"]["id"],
+              lambda e: e.get("attack_type") == "sqli" and e.get("status_code") == 200),
+        Phase("escalate", config.MITRE_TECHNIQUES["privilege_escalation"]["id"],
+              lambda e: e.get("action") == "success" and _PRIVILEGED.search(e.get("username") or "") is not None),
+    ]
+    return PhaseChainDetector("Attack Chain: Recon → Exploit → Escalate", phases,
+                              window=window, min_phases=min_phases)
+
+
+# ── Brute Force → Lateral Movement ───────────────────────────
+class _Attempts:
+    __slots__ = ("start", "expires", "failures")
+
+    def __init__(self, t: float, expires: float):
+        self.start = t
+        self.expires = expires
+        self.failures = 0
+
+
+class _Foothold:
+    __slots__ = ("attacker", "first_seen", "failures", "compromised_at", "expires", "hops", "alerted")
+
+    def __init__(self, attacker: str, attempts: _Attempts, t: float, expires: float):
+        self.attacker = attacker
+        self.first_seen = attempts.start
+        self.failures = attempts.failures
+        self.compromised_at = t
+        self.expires = expires
+        self.hops = set()
+        self.alerted = False
+
+
+class BruteForceLateralDetector(Detection):
+    """
+    External failure burst → success on a host → that host moving to
+    `min_hops` other internal hosts. The entity hands over from the
+    attacker (src_ip) to the compromised host (dst_ip) at the success.
+    """
+
+    def __init__(
+        self,
+        window="2h",
+        min_failures: int = 10,
+        min_hops: int = 2,
+        max_keys: int = 100_000,
+    ):
+        lateral = config.MITRE_TECHNIQUES["lateral_movement"]["id"]
+        super().__init__("Brute Force to Lateral Movement", lateral, "critical",
+                         match={"event_type": "authentication"}, entity=("src_ip",),
+                         techniques=[config.MITRE_TECHNIQUES["brute_force"]["id"], lateral])
+        self.window = parse_span(window)
+        self.min_failures = min_failures
+        self.min_hops = min_hops
+        self.attackers = ExpiringState(max_keys)   # external src_ip → _Attempts
+        self.footholds = ExpiringState(max_keys)   # compromised dst_ip → _Foothold
+
+    def state_size(self) -> int:
+        return len(self.attackers) + len(self.footholds)
+
+    def evidence(self, alert: Dict[str, Any]) -> Tuple[Tuple, float, float]:
+        return (alert["src_ip"],), alert["first_seen"], alert["compromised_at"]
+
+    def process(self, event: Dict[str, Any], t: float) -> List[Dict[str, Any]]:
+        self.attackers.expire(t)
+        self.footholds.expire(t)
+        src_ip, dst_ip, action = event.get("src_ip"), event.get("dst_ip"), event.get("action")
+        if src_ip is None or dst_ip is None:
+            return []
+
+        if src_ip.startswith(INTERNAL_PREFIX):
+            if action != "success":
+                return []
+            foothold = self.footholds.get(src_ip, t)
+            if foothold is None or foothold.alerted or dst_ip == src_ip:
+                return []
+            foothold.hops.add(dst_ip)
+            if len(foothold.hops) < self.min_hops:
+                return []
+            foothold.alerted = True
+            return [self.alert(
+                t,
+                src_ip=foothold.attacker,
+                compromised_ip=src_ip,
+                failures=foothold.failures,
+                internal_hops=len(foothold.hops),
+                hop_targets=sorted(foothold.hops),
+                first_seen=foothold.first_seen,
+                compromised_at=foothold.compromised_at,
+                alert_name=f"Brute Force → Lateral Movement chain via {src_ip}",
+            )]
+
+        attempts = self.attackers.get(src_ip, t)
+        if action == "failure":
+            if attempts is None:
+                attempts = _Attempts(t, t + self.window)
+                self.attackers.start(src_ip, attempts)
+            attempts.failures += 1
+        elif (action == "success" and attempts is not None and attempts.failures >= self.min_failures
+              and self.footholds.get(dst_ip, t) is None):
+            self.footholds.start(dst_ip, _Foothold(src_ip, attempts, t, t + self.window))
+        self.peak_keys = max(self.peak_keys, self.state_size())
+        return []
@@ -0,0 +1,153 @@
+"""
+beaconing.py — Streaming C2 Beacon Periodicity Detection
+
+Offline version of "Correlation - C2 Beaconing Detection"
+(alerts/correlation_searches.conf):
+
+    | streamstats current=f last(_time) AS prev_time BY src_ip, domain
+    | eval interval = _time - prev_time
+    | stats count AS callbacks, avg(interval), stdev(interval) ...
+    | where callbacks >= 10 AND jitter_ratio < 0.3 AND avg_interval < 300
+
+Instead of sorting and re-scanning the search window, every
+(src_ip, domain) pair keeps running inter-arrival statistics — last
+arrival, interval count, mean and M2 (Welford's algorithm, stable for
+long streams) — and is flagged the moment it crosses the thresholds,
+in a single pass over arbitrarily large proxy/DNS logs.
+
+Pair state lives in an LRU map: a pair idle for longer than
+`idle_timeout` is dropped, and the least recently active pair is
+evicted whenever `max_pairs` is exceeded, so memory stays bounded no
+matter how many distinct destinations the stream contains. An evicted
+pair starts over if it shows up again.
+
+Usage:
+    from detection_engine.beaconing import BeaconDetector
+
+    detector = BeaconDetector(max_interval=300, max_jitter_ratio=0.3)
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Any, List, Sequence, Tuple
+
+import config
+from detection_engine.base import Detection, parse_span
+
+TECHNIQUE_BY_EVENT_TYPE = {
+    "http_request": config.MITRE_TECHNIQUES["c2_http"]["id"],
+    "dns_query": config.MITRE_TECHNIQUES["c2_dns"]["id"],
+}
+
+
+class _PairStats:
+    """Inter-arrival statistics of one (src_ip, domain) pair."""
+
+    __slots__ = ("first", "last", "n", "mean", "m2", "alerted")
+
+    def __init__(self, t: float):
+        self.first = t
+        self.last = t
+        self.n = 0          # intervals seen (callbacks in the SPL)
+        self.mean = 0.0
+        self.m2 = 0.0       # sum of squared deviations from the mean
+        self.alerted = False
+
+    def add(self, t: float) -> None:
+        interval = t - self.last
+        self.last = t
+        if interval <= 0:  # same-second duplicates carry no timing information
+            return
+        self.n += 1
+        delta = interval - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (interval - self.mean)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, as SPL's stdev()."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+
+class BeaconDetector(Detection):
+    """
+    Flags (src_ip, domain) pairs whose callbacks arrive at a regular interval.
+    """
+
+    def __init__(
+        self,
+        event_types: Sequence[str] = ("http_request", "dns_query"),
+        min_callbacks: int = 10,
+        max_jitter_ratio: float = 0.3,
+        max_interval: float = 300,
+        idle_timeout="4h",
+        max_pairs: int = 100_000,
+    ):
+        super().__init__("C2 Beaconing Detection", TECHNIQUE_BY_EVENT_TYPE["http_request"], "critical",
+                         entity=("src_ip", "domain"),
+                         techniques=[TECHNIQUE_BY_EVENT_TYPE[e] for e in event_types if e in TECHNIQUE_BY_EVENT_TYPE])
+        self.event_types = set(event_types)
+        self.min_callbacks = min_callbacks
+        self.max_jitter_ratio = max_jitter_ratio
+        self.max_interval = max_interval
+        self.idle_timeout = parse_span(idle_timeout)
+        self.max_pairs = max_pairs
+
+        self._pairs: "OrderedDict[Tuple[str, str], _PairStats]" = OrderedDict()
+        self.pairs_evicted = 0
+
+    def state_size(self) -> int:
+        return len(self._pairs)
+
+    def evidence(self, alert: Dict[str, Any]) -> Tuple[Tuple, float, float]:
+        # A pair alerts once and stays flagged, so its later callbacks are covered too
+        return (alert["src_ip"], alert["domain"]), alert["first_seen"], float("inf")
+
+    def process(self, event: Dict[str, Any], t: float) -> List[Dict[str, Any]]:
+        if event.get("event_type") not in self.event_types:
+            return []
+        src_ip, domain = event.get("src_ip"), event.get("domain")
+        if src_ip is None or domain is None:
+            return []
+
+        pairs = self._pairs
+        key = (src_ip, domain)
+        stats = pairs.get(key)
+        if stats is None:
+            self._evict(t)
+            stats = pairs[key] = _PairStats(t)
+            if len(pairs) > self.peak_keys:
+                self.peak_keys = len(pairs)
+            return []
+        pairs.move_to_end(key)
+        stats.add(t)
+
+        if stats.alerted or stats.n < self.min_callbacks or stats.mean >= self.max_interval:
+            return []
+        jitter_ratio = stats.stdev / stats.mean
+        if jitter_ratio >= self.max_jitter_ratio:
+            return []
+        stats.alerted = True
+        return [self.alert(
+            t,
+            src_ip=src_ip,
+            domain=domain,
+            callbacks=stats.n,
+            avg_interval=round(stats.mean, 1),
+            stdev_interval=round(stats.stdev, 1),
+            jitter_ratio=round(jitter_ratio, 3),
+            first_seen=stats.first,
+            mitre_technique=TECHNIQUE_BY_EVENT_TYPE.get(event.get("event_type"), self.mitre_technique),
+            alert_name=f"C2 Beaconing: {src_ip} every {stats.mean:.0f}s to {domain}",
+        )]
+
+    def _evict(self, now: float) -> None:
+        """Drop idle pairs from the LRU end, then the oldest pairs beyond `max_pairs`."""
+        pairs = self._pairs
+        horizon = now - self.idle_timeout
+        while pairs:
+            key, stats = next(iter(pairs.items()))
+            if stats.last >= horizon and len(pairs) < self.max_pairs:
+                break
+            del pairs[key]
+            self.pairs_evicted += 1
@@ -0,0 +1,115 @@
+"""
+brute_force.py — Offline Brute Force Detection (detections/brute_force_detection.spl)
+
+The three searches of `brute_force_detection.spl` as streaming
+`TumblingWindowSearch`es over `attack_sim:auth` events (matched here by
+`event_type="authentication"`, which also works on per-generator files
+that carry no sourcetype field):
+
+    1. Brute Force Threshold      5m bins  BY src_ip, dst_ip, hostname
+    2. Success After Failures     10m bins BY src_ip, dst_ip
+    3. Password Spraying          15m bins BY src_ip
+
+Thresholds and spans default to the values in the .spl file and can be
+overridden for tuning experiments.
+
+Usage:
+    from detection_engine.brute_force import build_searches
+
+    searches = build_searches()
+"""
+
+from typing import List
+
+from detection_engine.windowed_stats import (
+    TumblingWindowSearch, count, dc, values, earliest, latest,
+)
+from detection_engine.base import parse_span
+
+AUTH = {"event_type": "authentication"}
+AUTH_FAILURE = {"event_type": "authentication", "action": "failure"}
+
+
+def brute_force_threshold(span: str = "5m", min_failures: int = 10) -> TumblingWindowSearch:
+    """SEARCH 1: `min_failures`+ failures per source/destination in one window."""
+    minutes = parse_span(span) / 60
+
+    def evals(row):
+        spraying = row["targeted_accounts"] > 5
+        return {
+            "attack_type": "password_spraying" if spraying else "brute_force",
+            "mitre_technique": "T1110.003" if spraying else "T1110.001",
+            "severity": "critical" if row["failure_count"] > 50 else "high",
+            "alert_name": f"Brute Force Detected: {row['src_ip']} → {row['hostname']}",
+            "attempts_per_min": round(row["failure_count"] / minutes, 1),
+        }
+
+    return TumblingWindowSearch(
+        "Brute Force Threshold Detection",
+        span=span,
+        by=("src_ip", "dst_ip", "hostname"),
+        aggs=[
+            count("failure_count"),
+            dc("username", "targeted_accounts"),
+            values("username", "attempted_usernames"),
+            earliest("first_attempt"),
+            latest("last_attempt"),
+        ],
+        where=lambda row: row["failure_count"] >= min_failures,
+        evals=evals,
+        match=AUTH_FAILURE,
+        mitre_technique="T1110",
+    )
+
+
+def success_after_failures(span: str = "10m", min_failures: int = 5) -> TumblingWindowSearch:
+    """SEARCH 2: a successful login closing a burst of `min_failures`+ failures."""
+    return TumblingWindowSearch(
+        "Successful Login After Failure Burst",
+        span=span,
+        by=("src_ip", "dst_ip"),
+        aggs=[
+            count("failures", where=("action", "failure")),
+            count("successes", where=("action", "success")),
+            values("username", "users"),
+            latest("last_action", field="action"),
+            latest("last_event_time"),
+        ],
+        where=lambda row: (row["failures"] >= min_failures and row["successes"] >= 1
+                           and row["last_action"] == "success"),
+        evals=lambda row: {
+            "alert_name": f"POTENTIAL COMPROMISE: Success after {row['failures']} "
+                          f"failures from {row['src_ip']}",
+        },
+        match=AUTH,
+        mitre_technique="T1110",
+        severity="critical",
+    )
+
+
+def password_spraying(span: str = "15m", min_users: int = 10, min_attempts: int = 15) -> TumblingWindowSearch:
+    """SEARCH 3: one source failing against `min_users`+ distinct accounts."""
+    return TumblingWindowSearch(
+        "Password Spraying Detection",
+        span=span,
+        by=("src_ip",),
+        aggs=[
+            dc("username", "unique_users_targeted"),
+            count("total_attempts"),
+            dc("dst_ip", "targeted_hosts"),
+            values("hostname", "target_hosts"),
+        ],
+        where=lambda row: row["unique_users_targeted"] >= min_users and row["total_attempts"] >= min_attempts,
+        evals=lambda row: {
+            "spray_ratio": round(row["unique_users_targeted"] / row["total_attempts"], 2),
+            "alert_name": f"Password Spraying: {row['src_ip']} targeted "
+                          f"{row['unique_users_targeted']} accounts",
+        },
+        match=AUTH_FAILURE,
+        mitre_technique="T1110.003",
+    )
+
+
+def build_searches() -> List[TumblingWindowSearch]:
+    """All searches of brute_force_detection.spl with their shipped thresholds."""
+    return [brute_force_threshold(), success_after_failures(), password_spraying()]
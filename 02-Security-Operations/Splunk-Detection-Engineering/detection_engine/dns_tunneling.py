@@ -0,0 +1,138 @@
+"""
+dns_tunneling.py — Fixed-Memory DNS Tunneling Detection
+
+Offline version of SEARCH 4 in detections/data_exfiltration.spl
+(`subdomain_length > 20`, `query_count >= 10`, `avg_subdomain_len > 25`),
+built for resolver-scale query streams where exact per-domain state
+would grow with every domain ever queried.
+
+Per `dns_query` event:
+    1. The query's subdomain label (query_name minus its registered
+       domain) gets a Shannon entropy score in bits per character;
+       encoded payloads (hex, base32/64) score close to log2 of their
+       alphabet, real hostnames far lower.
+    2. Queries with a long, high-entropy label are counted per domain
+       in a count-min sketch, next to a second sketch summing their
+       label lengths.
+    3. A domain whose estimated count reaches `min_queries` with an
+       average label length above `min_avg_length` raises one alert.
+
+Memory is the two sketches plus the set of domains already alerted in
+the current window, whatever the number of distinct domains. Once that
+set holds `max_alerted` domains, qualifying queries for other domains
+are counted as suppressed until the window resets, rather than raising
+an alert on every query. Sketches reset every `window` (the equivalent
+of the search's time range); count-min estimates only ever overcount,
+so no tunnel that meets the thresholds is missed.
+
+Usage:
+    from detection_engine.dns_tunneling import DNSTunnelDetector
+
+    detector = DNSTunnelDetector(window="1h", min_queries=10)
+"""
+
+import math
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+
+import config
+from detection_engine.base import Detection, parse_span
+from utils.sketches import CountMinSketch
+
+
+def label_entropy(label: str) -> float:
+    """Shannon entropy of `label` in bits per character (0 for an empty label)."""
+    n = len(label)
+    if not n:
+        return 0.0
+    log2 = math.log2
+    return -sum(c / n * log2(c / n) for c in Counter(label).values())
+
+
+class DNSTunnelDetector(Detection):
+    """
+    Flags domains receiving many long, high-entropy subdomain queries.
+    """
+
+    def __init__(
+        self,
+        window="1h",
+        min_length: int = 20,
+        min_entropy: float = 3.0,
+        min_queries: int = 10,
+        min_avg_length: float = 25,
+        width: int = 4096,
+        depth: int = 4,
+        max_alerted: int = 10_000,
+    ):
+        super().__init__("DNS Tunneling Exfiltration", config.MITRE_TECHNIQUES["c2_dns"]["id"],
+                         "high", match={"event_type": "dns_query"}, entity=("domain",))
+        self.window = parse_span(window)
+        self.min_length = min_length
+        self.min_entropy = min_entropy
+        self.min_queries = min_queries
+        self.min_avg_length = min_avg_length
+        self.max_alerted = max_alerted
+
+        self.queries = CountMinSketch(width, depth)
+        self.lengths = CountMinSketch(width, depth)
+        self._alerted = set()
+        self._window_end = None
+        self.suspicious_queries = 0
+        self.alerts_suppressed = 0  # qualifying queries not alerted: max_alerted reached
+
+    def state_size(self) -> int:
+        return len(self._alerted)
+
+    def evidence(self, alert: Dict[str, Any]) -> Tuple[Tuple, float, float]:
+        # One alert per domain per window stands for the whole window
+        start = alert["_time"] - alert["_time"] % self.window
+        return (alert["domain"],), start, start + self.window
+
+    def process(self, event: Dict[str, Any], t: float) -> List[Dict[str, Any]]:
+        if self._window_end is None or t >= self._window_end:
+            self._reset(t)
+
+        domain = event.get("domain")
+        query_name = event.get("query_name") or ""
+        if not domain or len(query_name) - len(domain) - 1 <= self.min_length:
+            return []  # cheap length check first: most queries stop here
+        label = query_name[: -len(domain) - 1] if query_name.endswith("." + domain) else query_name
+        if len(label) <= self.min_length:
+            return []
+        entropy = label_entropy(label)
+        if entropy < self.min_entropy:
+            return []
+
+        self.suspicious_queries += 1
+        count = self.queries.add(domain)
+        total_length = self.lengths.add(domain, len(label))
+        if count < self.min_queries or domain in self._alerted:
+            return []
+        avg_length = total_length / count
+        if avg_length <= self.min_avg_length:
+            return []
+        if len(self._alerted) >= self.max_alerted:
+            # Without room to remember the domain, alerting would repeat on every query
+            self.alerts_suppressed += 1
+            return []
+        self._alerted.add(domain)
+        self.peak_keys = max(self.peak_keys, len(self._alerted))
+        return [self.alert(
+            t,
+            src_ip=event.get("src_ip"),
+            hostname=event.get("hostname"),
+            domain=domain,
+            query_count=int(count),
+            avg_subdomain_len=round(avg_length),
+            entropy=round(entropy, 2),
+            severity="critical" if avg_length > 40 else "high",
+            alert_name=f"DNS tunneling detected: {event.get('src_ip')} querying {domain}",
+        )]
+
+    def _reset(self, t: float) -> None:
+        """Start a new window aligned to `window`-second boundaries."""
+        self.queries.clear()
+        self.lengths.clear()
+        self._alerted.clear()
+        self._window_end = (int(t // self.window) + 1) * self.window
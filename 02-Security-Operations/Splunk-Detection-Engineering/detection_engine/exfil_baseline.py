@@ -0,0 +1,238 @@
+"""
+exfil_baseline.py — Per-Host Volume Baselines for Exfiltration
+
+The volume search in detections/data_exfiltration.spl flags fixed sizes
+(`bytes_out_mb >= 5`, `total_mb >= 10`), while DataExfilSimulator — and
+real exfiltration — is "10–100x normal *for this host*": 20 MB is noise
+for a backup server and an outlier for a kiosk. This detector learns
+what normal is per source host from `attack_sim:netflow` events
+(`event_type="network_flow"`) and scores each transfer against it.
+
+Per host, updated incrementally with every transfer:
+    - EWMA mean and variance of log(bytes_out) — transfer sizes are
+      heavy-tailed, so the z-score is taken in log space
+    - a t-digest of bytes_out for the baseline percentile
+
+A transfer alerts when the host has `min_history` transfers behind it,
+it is at least `multiplier` × the host's baseline percentile, and its
+log-space z-score is at least `min_zscore`. Flagged transfers are not
+learned, so an ongoing exfiltration does not become the new normal.
+
+The percentile defaults to the median: exfiltration small enough to go
+unflagged is still learned, and a high percentile (p95) follows that
+tail upward until nothing is flagged, while the median barely moves.
+The 20x default sits just above routine backups (10–50 MB against a
+~2.5 MB median in the simulator).
+
+State is checkpointed to a JSON file at the end of every run (atomic
+replace) together with the newest event time seen. The next run loads
+it and skips events at or before that time, so a nightly run over the
+day's logs scores them in one pass against the accumulated history
+instead of recomputing it.
+
+Usage:
+    from detection_engine.exfil_baseline import VolumeBaselineDetector
+
+    detector = VolumeBaselineDetector(checkpoint=config.BASELINE_CHECKPOINT_FILE)
+"""
+
+import os
+import json
+import math
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+from detection_engine.base import Detection
+from utils.sketches import TDigest
+
+CHECKPOINT_VERSION = 1
+
+
+class HostBaseline:
+    """Transfer-size baseline of one host."""
+
+    __slots__ = ("hostname", "n", "mean", "var", "digest", "last_seen")
+
+    def __init__(self, hostname: Optional[str] = None, compression: float = 100):
+        self.hostname = hostname
+        self.n = 0
+        self.mean = 0.0     # EWMA of log(bytes_out)
+        self.var = 0.0      # EWMA variance of log(bytes_out)
+        self.digest = TDigest(compression)
+        self.last_seen = 0.0
+
+    def update(self, bytes_out: float, alpha: float) -> None:
+        x = math.log1p(bytes_out)
+        if self.n == 0:
+            self.mean = x
+        else:
+            # Exponentially weighted mean/variance (West's incremental form)
+            diff = x - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.n += 1
+        self.digest.add(bytes_out)
+
+    def zscore(self, bytes_out: float) -> float:
+        std = math.sqrt(self.var)
+        return (math.log1p(bytes_out) - self.mean) / std if std > 0 else math.inf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hostname": self.hostname,
+            "n": self.n,
+            "mean": self.mean,
+            "var": self.var,
+            "last_seen": self.last_seen,
+            "digest": self.digest.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HostBaseline":
+        baseline = cls(data["hostname"])
+        baseline.n = data["n"]
+        baseline.mean = data["mean"]
+        baseline.var = data["var"]
+        baseline.last_seen = data["last_seen"]
+        baseline.digest = TDigest.from_dict(data["digest"])
+        return baseline
+
+
+class VolumeBaselineDetector(Detection):
+    """
+    Flags transfers far above the sending host's own baseline.
+    """
+
+    def __init__(
+        self,
+        checkpoint: Optional[Union[str, Path]] = None,
+        alpha: float = 0.01,
+        quantile: float = 0.5,
+        multiplier: float = 20.0,
+        min_zscore: float = 2.0,
+        min_history: int = 50,
+        refresh: int = 32,
+        max_hosts: int = 100_000,
+    ):
+        super().__init__("Host Volume Baseline Anomaly", "T1048", "high",
+                         match={"event_type": "network_flow"}, entity=("src_ip",))
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.alpha = alpha
+        self.quantile = quantile
+        self.multiplier = multiplier
+        self.min_zscore = min_zscore
+        self.min_history = min_history
+        self.refresh = refresh
+        self.max_hosts = max_hosts
+
+        self._hosts: "OrderedDict[str, HostBaseline]" = OrderedDict()
+        self._thresholds: Dict[str, tuple] = {}  # host → (quantile, host.n it was read at)
+        self.watermark = -math.inf  # newest event time already in the baselines
+        self.events_replayed = 0
+        self.hosts_evicted = 0
+        if self.checkpoint and self.checkpoint.exists():
+            self.load(self.checkpoint)
+
+    def state_size(self) -> int:
+        return len(self._hosts)
+
+    def baseline(self, src_ip: str) -> Optional[HostBaseline]:
+        return self._hosts.get(src_ip)
+
+    def process(self, event: Dict[str, Any], t: float) -> List[Dict[str, Any]]:
+        if t <= self.watermark:  # already learned by a previous run
+            self.events_replayed += 1
+            return []
+        src_ip = event.get("src_ip")
+        bytes_out = event.get("bytes_out")
+        if src_ip is None or not isinstance(bytes_out, (int, float)):
+            return []
+
+        hosts = self._hosts
+        host = hosts.get(src_ip)
+        if host is None:
+            if len(hosts) >= self.max_hosts:  # drop the host idle the longest
+                evicted, _ = hosts.popitem(last=False)
+                self._thresholds.pop(evicted, None)
+                self.hosts_evicted += 1
+            host = hosts[src_ip] = HostBaseline(event.get("hostname"))
+            self.peak_keys = max(self.peak_keys, len(hosts))
+        else:
+            hosts.move_to_end(src_ip)
+        host.last_seen = t
+
+        alerts = []
+        if host.n >= self.min_history:
+            cached = self._thresholds.get(src_ip)
+            if cached is None or host.n - cached[1] >= self.refresh:
+                cached = self._thresholds[src_ip] = (host.digest.quantile(self.quantile), host.n)
+            threshold = cached[0]
+            if bytes_out >= self.multiplier * threshold:
+                zscore = host.zscore(bytes_out)
+                if zscore >= self.min_zscore:
+                    alerts.append(self._alert(event, t, host, threshold, zscore))
+        if not alerts:
+            host.update(bytes_out, self.alpha)
+        return alerts
+
+    def _alert(self, event, t, host, threshold, zscore) -> Dict[str, Any]:
+        bytes_out = event["bytes_out"]
+        ratio = bytes_out / threshold if threshold > 0 else math.inf
+        return self.alert(
+            t,
+            src_ip=event.get("src_ip"),
+            hostname=event.get("hostname") or host.hostname,
+            dst_ip=event.get("dst_ip"),
+            domain=event.get("domain"),
+            bytes_out=bytes_out,
+            bytes_out_mb=round(bytes_out / 1_048_576, 2),
+            baseline_mb=round(threshold / 1_048_576, 2),
+            baseline_ratio=round(ratio, 1),
+            zscore=round(zscore, 1),
+            history=host.n,
+            severity="critical" if ratio >= 50 else "high",
+            alert_name=(f"Volume anomaly: {event.get('hostname') or event.get('src_ip')} sent "
+                        f"{bytes_out / 1_048_576:.1f} MB ({ratio:.0f}x its baseline) to {event.get('domain')}"),
+        )
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """End of input: the run's history becomes part of the checkpoint."""
+        if self.last_time > self.watermark:
+            self.watermark = self.last_time
+        if self.checkpoint:
+            self.save(self.checkpoint)
+        return []
+
+    # ── Checkpoint ───────────────────────────────────────────
+    def save(self, path: Union[str, Path]) -> None:
+        """Atomically replace the checkpoint (write temp file, fsync, rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "watermark": self.watermark if self.watermark > -math.inf else None,
+            "alpha": self.alpha,
+            "hosts": {src_ip: host.to_dict() for src_ip, host in self._hosts.items()},
+            "updated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load(self, path: Union[str, Path]) -> None:
+        with open(path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported baseline checkpoint version in {path}")
+        if checkpoint["watermark"] is not None:
+            self.watermark = checkpoint["watermark"]
+        # Oldest-active first, so LRU eviction order survives the round trip
+        hosts = sorted(checkpoint["hosts"].items(), key=lambda item: item[1]["last_seen"])
+        self._hosts = OrderedDict((src_ip, HostBaseline.from_dict(data)) for src_ip, data in hosts)
+        self._thresholds.clear()
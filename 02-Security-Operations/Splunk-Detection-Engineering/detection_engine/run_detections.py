@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+run_detections.py — Run the Offline Detections over Generated Logs
+
+Streams the log files in `output/logs/` (any format, merged into one
+time-ordered feed) through the selected detections and writes every
+alert as a JSON line to `output/detections/alerts.jsonl`. Use it to
+check that generated data actually trips the SPL logic without a
+Splunk instance.
+
+Usage:
+    # Every detection over every generator log
+    python detection_engine/run_detections.py --all
+
+    # Selected detections and files
+    python detection_engine/run_detections.py --detections brute_force --files brute_force.log
+
+    # Alerts only, no per-alert listing
+    python detection_engine/run_detections.py --all --quiet
+
+    # Precision / recall / time-to-detect against the is_malicious labels
+    python detection_engine/run_detections.py --all --quiet --score
+
+    # Nightly: score today's flows against the checkpointed host baselines
+    python detection_engine/run_detections.py --detections exfil_baseline --files data_exfil.log
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_reader import default_files, read_events
+from utils.stream_merge import merge_event_streams
+from detection_engine.base import run_detections
+from detection_engine.scoring import GroundTruth, score, print_report
+from detection_engine import brute_force
+from detection_engine.beaconing import BeaconDetector
+from detection_engine.dns_tunneling import DNSTunnelDetector
+from detection_engine.exfil_baseline import VolumeBaselineDetector
+from detection_engine.attack_chains import recon_exploit_escalate, BruteForceLateralDetector
+
+
+# Registry of available detections (each builder returns a list of searches)
+DETECTIONS = {
+    "brute_force": {
+        "build": brute_force.build_searches,
+        "description": "Brute force threshold, success after failures, password spraying (T1110)",
+    },
+    "beaconing": {
+        "build": lambda: [BeaconDetector()],
+        "description": "Regular-interval callbacks per src_ip/domain pair (T1071.001, T1071.004)",
+    },
+    "dns_tunneling": {
+        "build": lambda: [DNSTunnelDetector()],
+        "description": "Long, high-entropy subdomain queries per domain, count-min sketched (T1071.004)",
+    },
+    "exfil_baseline": {
+        "build": lambda checkpoint=config.BASELINE_CHECKPOINT_FILE: [VolumeBaselineDetector(checkpoint=checkpoint)],
+        "description": "Transfers far above the host's own EWMA/median baseline, checkpointed between runs (T1048)",
+        "checkpointed": True,
+    },
+    "attack_chains": {
+        "build": lambda: [recon_exploit_escalate(), BruteForceLateralDetector()],
+        "description": "Recon → Exploit → Escalate and Brute Force → Lateral Movement chains per entity (T1190, T1021)",
+    },
+}
+
+
+def event_stream(paths: list):
+    """One time-ordered event stream across `paths`."""
+    streams = {str(path): read_events(path) for path in paths}
+    return (event for _, event in merge_event_streams(streams))
+
+
+def _format_time(epoch: float) -> str:
+    return datetime.utcfromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline detections over generated logs")
+    parser.add_argument("--all", action="store_true", help="Run every detection")
+    parser.add_argument("--detections", type=str, default="",
+                        help=f"Comma-separated list: {','.join(DETECTIONS.keys())}")
+    parser.add_argument("--files", type=str, default="",
+                        help="Comma-separated log files (relative to output/logs/ or absolute); "
+                             "default: every generator log")
+    parser.add_argument("--output", type=str, default=str(config.DETECTION_OUTPUT_DIR / "alerts.jsonl"),
+                        help="JSONL file for the alerts")
+    parser.add_argument("--quiet", action="store_true", help="Print the summary only")
+    parser.add_argument("--score", action="store_true",
+                        help="Score alerts against is_malicious (writes scores.json next to the alerts); "
+                             "checkpointed detections start fresh and leave their checkpoint untouched")
+    parser.add_argument("--fresh-baselines", action="store_true",
+                        help="Discard the exfil_baseline checkpoint and learn from scratch")
+    parser.add_argument("--list", action="store_true", help="List all available detections and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\nAvailable detections:")
+        for name, det in DETECTIONS.items():
+            print(f"  {name:20s} — {det['description']}")
+        return
+
+    if args.all:
+        selected = list(DETECTIONS)
+    elif args.detections:
+        selected = [d.strip() for d in args.detections.split(",")]
+    else:
+        parser.error("Specify --all or --detections=name1,name2")
+    unknown = [d for d in selected if d not in DETECTIONS]
+    if unknown:
+        parser.error(f"Unknown detection(s): {', '.join(unknown)}")
+
+    if args.files:
+        paths = [Path(f) if Path(f).is_absolute() else config.LOG_DIR / f for f in args.files.split(",")]
+    else:
+        paths = default_files()
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+    if not paths:
+        parser.error(f"No log files in {config.LOG_DIR} — run the generators first")
+
+    if args.fresh_baselines and config.BASELINE_CHECKPOINT_FILE.exists():
+        config.BASELINE_CHECKPOINT_FILE.unlink()
+    # Scores must not depend on state left by earlier runs: score checkpointed
+    # detections from scratch, without reading or updating their checkpoint
+    unchecked = [name for name in selected if args.score and DETECTIONS[name].get("checkpointed")]
+    detections = [search for name in selected
+                  for search in (DETECTIONS[name]["build"](checkpoint=None) if name in unchecked
+                                 else DETECTIONS[name]["build"]())]
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Offline Detection Run")
+    print(f"  Detections: {', '.join(selected)} ({len(detections)} searches)")
+    print(f"  Files: {', '.join(p.name for p in paths)}")
+    if unchecked:
+        print(f"  Scoring from fresh state, checkpoint not used: {', '.join(unchecked)}")
+    print("=" * 70)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    per_detection = Counter()
+    truth = GroundTruth(detections) if args.score else None
+    alerts = []
+    started = time.perf_counter()
+    with open(output, "w") as f:
+        for alert in run_detections(detections, event_stream(paths), truth=truth):
+            per_detection[alert["detection"]] += 1
+            if truth is not None:
+                alerts.append(alert)
+            f.write(json.dumps(alert, default=str) + "\n")
+            if not args.quiet:
+                print(f"  [{alert['severity'].upper():8s}] {_format_time(alert['_time'])}  "
+                      f"{alert.get('alert_name', alert['detection'])}")
+    elapsed = time.perf_counter() - started
+
+    events = detections[0].events_seen if detections else 0
+    print("\n" + "=" * 70)
+    print("  DETECTION RUN COMPLETE")
+    for det in detections:
+        late = getattr(det, "events_late", 0)
+        replayed = getattr(det, "events_replayed", 0)
+        suppressed = getattr(det, "alerts_suppressed", 0)
+        print(f"    {det.name:40s} {per_detection[det.name]:>6d} alerts | "
+              f"{det.events_matched:>9d} matched | peak state {det.peak_keys} keys"
+              f"{f' | {late} late' if late else ''}"
+              f"{f' | {replayed} already in checkpoint' if replayed else ''}"
+              f"{f' | {suppressed} suppressed (alert cap)' if suppressed else ''}")
+    print(f"  Events:         {events}")
+    print(f"  Alerts:         {sum(per_detection.values())} → {output}")
+    print(f"  Elapsed time:   {elapsed:.1f}s ({events / max(elapsed, 1e-9):,.0f} EPS incl. parsing)")
+    if truth is not None:
+        started = time.perf_counter()
+        report = score(detections, alerts, truth)
+        print_report(report)
+        scores_file = output.with_name("scores.json")
+        scores_file.write_text(json.dumps(report, indent=2))
+        print(f"\n  Scores:         {scores_file} (joined in {time.perf_counter() - started:.2f}s)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+run_schedule.py — Emulate the Scheduled Alerts over Generated Logs
+
+Replays the logs in `output/logs/` as a stretch of real time through the
+saved searches of `alerts/critical_alerts.conf`: every cron run, its
+dispatch window, alert condition and throttling (see alert_scheduler.py).
+Prints when each alert would have fired and what the schedule cost, and
+writes every firing as a JSON line to `output/detections/scheduled_alerts.jsonl`.
+
+Usage:
+    # Every scheduled search in critical_alerts.conf over every generator log
+    python detection_engine/run_schedule.py
+
+    # Also re-run each window from scratch: check the results match and time it
+    python detection_engine/run_schedule.py --verify
+
+    # Selected logs, no per-firing listing
+    python detection_engine/run_schedule.py --files brute_force.log --quiet
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_reader import default_files
+from detection_engine.spl import SPLError, load_table
+from detection_engine.alert_scheduler import ScheduledSearch, parse_conf, emulate
+
+DEFAULT_CONF = config.PROJECT_ROOT / "alerts" / "critical_alerts.conf"
+
+
+def _format_time(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate scheduled alerts over generated logs")
+    parser.add_argument("conf_files", nargs="*", help=f"savedsearches .conf files (default: {DEFAULT_CONF.name})")
+    parser.add_argument("--files", type=str, default="",
+                        help="Comma-separated log files (relative to output/logs/ or absolute); "
+                             "default: every generator log")
+    parser.add_argument("--verify", action="store_true",
+                        help="Also re-run every window from scratch, compare results and time it")
+    parser.add_argument("--quiet", action="store_true", help="Summary only, no per-firing listing")
+    parser.add_argument("--output", type=str, default=str(config.DETECTION_OUTPUT_DIR / "scheduled_alerts.jsonl"),
+                        help="Firings JSONL file")
+    args = parser.parse_args()
+
+    conf_files = [Path(f) for f in args.conf_files] or [DEFAULT_CONF]
+    missing = [str(p) for p in conf_files if not p.exists()]
+    if missing:
+        parser.error(f"Conf file(s) not found: {', '.join(missing)}")
+    if args.files:
+        paths = [Path(f) if Path(f).is_absolute() else config.LOG_DIR / f for f in args.files.split(",")]
+    else:
+        paths = default_files()
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+    if not paths:
+        parser.error(f"No log files in {config.LOG_DIR} — run the generators first")
+
+    searches = []
+    skipped = []
+    for path in conf_files:
+        for saved in parse_conf(path):
+            try:
+                searches.append(ScheduledSearch(saved))
+            except SPLError as e:
+                skipped.append((saved.name, e))
+    if not searches:
+        parser.error("No supported scheduled searches" + "".join(f"\n  [{n}] {e}" for n, e in skipped))
+    fields = set()
+    for search in searches:
+        fields = None if fields is None or search.fields is None else fields | search.fields
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Scheduled Alert Emulation")
+    print(f"  Searches: {len(searches)} scheduled ({len(skipped)} skipped)")
+    print(f"  Files: {', '.join(p.name for p in paths)}")
+    print("=" * 70)
+    for name, error in skipped:
+        print(f"  [WARNING] Skipped [{name}]: {error}")
+
+    started = time.perf_counter()
+    table = load_table(paths, fields)
+    load_time = time.perf_counter() - started
+    if not len(table):
+        parser.error("The selected logs hold no events")
+    times = table.column("_time")
+    print(f"\n  Loaded {len(table)} events, {_format_time(times[0])} → {_format_time(times[-1])} UTC, "
+          f"in {load_time:.2f}s")
+
+    firings = emulate(searches, table, verify=args.verify)
+
+    for search in searches:
+        saved = search.saved
+        mode = f"{search.slice // 60}m slices" if search.incremental else "full re-run per window"
+        print(f"\n  [{saved.name}]  {saved.cron.text}  {saved.earliest // 60:+d}m → "
+              f"{'now' if not saved.latest else f'{saved.latest // 60:+d}m'}  ({mode})")
+        print(f"    runs {search.runs} | fired {search.fired} | throttled {search.throttled} | "
+              f"results {search.results}")
+        if search.incremental:
+            factor = search.events_in_windows / search.events_sliced if search.events_sliced else 0
+            line = f"    scanned {search.events_sliced:,} events once instead of {search.events_in_windows:,} ({factor:.1f}x)"
+            if search.stats:
+                line += f" | partial groups merged {search.partials_merged:,}"
+            print(line)
+            line = f"    time {search.incremental_time:.2f}s incremental"
+            if args.verify:
+                line += (f" | {search.full_time:.2f}s full re-run | "
+                         + ("results identical" if not search.mismatches else f"{search.mismatches} runs DIFFER"))
+            print(line)
+        else:
+            print(f"    scanned {search.events_in_windows:,} events | time {search.full_time:.2f}s")
+
+    if not args.quiet and firings:
+        print("\n  Firings (UTC):")
+        for firing in firings:
+            print(f"    {_format_time(firing.time)}  [{firing.severity:<8}] {firing.search}: "
+                  f"{len(firing.results)} results — {firing.subject}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        for firing in firings:
+            f.write(json.dumps(firing._asdict(), default=str) + "\n")
+
+    mismatches = sum(s.mismatches for s in searches)
+    print("\n" + "=" * 70)
+    print("  SCHEDULE EMULATION COMPLETE")
+    print(f"  Scheduled runs: {sum(s.runs for s in searches)}")
+    print(f"  Firings:        {len(firings)} → {output}")
+    print(f"  Search time:    {sum(s.incremental_time + s.full_time for s in searches):.2f}s")
+    if args.verify:
+        print(f"  Verification:   {'all windows match a full re-run' if not mismatches else f'{mismatches} runs differ'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
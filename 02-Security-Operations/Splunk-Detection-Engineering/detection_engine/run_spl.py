@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+run_spl.py — Run .spl Searches Locally against Generated Logs
+
+Executes the searches in `detections/*.spl` (or an ad-hoc search) with
+the columnar SPL interpreter in spl.py, over the logs in `output/logs/`.
+The logs are read once, keeping only the fields the selected searches
+mention, and every search then runs on the in-memory columns, so an
+edited .spl file can be re-checked in seconds without Splunk.
+
+Usage:
+    # Every search of every .spl file
+    python detection_engine/run_spl.py
+
+    # One file, searches 1 and 3, ten result rows each
+    python detection_engine/run_spl.py detections/brute_force_detection.spl --only 1,3 --limit 10
+
+    # Ad-hoc search over selected logs
+    python detection_engine/run_spl.py --search 'index=attack_sim sourcetype="attack_sim:auth" | stats count BY action' \\
+        --files brute_force.log
+
+    # Keep the full results (one JSONL file per search)
+    python detection_engine/run_spl.py --output-dir output/detections/spl
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.log_reader import default_files
+from detection_engine.spl import Search, SPLError, compile_search, load_table, parse_file
+
+SPL_DIR = config.PROJECT_ROOT / "detections"
+
+
+def _format_row(row: dict, width: int = 160) -> str:
+    text = "  ".join(f"{k}={v}" for k, v in row.items())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run SPL searches locally over generated logs")
+    parser.add_argument("spl_files", nargs="*", help="Files to run (default: detections/*.spl)")
+    parser.add_argument("--search", type=str, default="", help="Run this search text instead of .spl files")
+    parser.add_argument("--only", type=str, default="",
+                        help="Comma-separated search numbers to run from each file (e.g. 1,3)")
+    parser.add_argument("--files", type=str, default="",
+                        help="Comma-separated log files (relative to output/logs/ or absolute); "
+                             "default: every generator log")
+    parser.add_argument("--limit", type=int, default=5, help="Result rows to print per search (default: 5)")
+    parser.add_argument("--output-dir", type=str, default="", help="Write each search's results as JSONL here")
+    args = parser.parse_args()
+
+    if args.search:
+        searches = [Search(1, "ad-hoc search", args.search, "command line")]
+    else:
+        spl_files = [Path(f) for f in args.spl_files] or sorted(SPL_DIR.glob("*.spl"))
+        missing = [str(p) for p in spl_files if not p.exists()]
+        if missing:
+            parser.error(f"SPL file(s) not found: {', '.join(missing)}")
+        searches = [search for path in spl_files for search in parse_file(path)]
+        if args.only:
+            wanted = {int(n) for n in args.only.split(",")}
+            searches = [s for s in searches if s.number in wanted]
+    if not searches:
+        parser.error("No searches selected")
+
+    if args.files:
+        paths = [Path(f) if Path(f).is_absolute() else config.LOG_DIR / f for f in args.files.split(",")]
+    else:
+        paths = default_files()
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+    if not paths:
+        parser.error(f"No log files in {config.LOG_DIR} — run the generators first")
+
+    compiled = []
+    for search in searches:
+        try:
+            compiled.append((search, compile_search(search.text)))
+        except SPLError as e:
+            compiled.append((search, e))
+    pipelines = [p for _, p in compiled if not isinstance(p, SPLError)]
+    fields = set()
+    for pipeline in pipelines:
+        fields = None if fields is None or pipeline.fields is None else fields | pipeline.fields
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Local SPL Run")
+    print(f"  Searches: {len(searches)} ({len(pipelines)} supported)")
+    print(f"  Files: {', '.join(p.name for p in paths)}")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    table = load_table(paths, fields) if pipelines else None
+    load_time = time.perf_counter() - started
+    if table is not None:
+        print(f"\n  Loaded {len(table)} events, {len(table.columns)} fields in {load_time:.2f}s")
+
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    search_time = 0.0
+    for search, pipeline in compiled:
+        print(f"\n  [{search.source} #{search.number}] {search.title}")
+        if isinstance(pipeline, SPLError):
+            print(f"    [WARNING] Skipped: {pipeline}")
+            failed += 1
+            continue
+        started = time.perf_counter()
+        try:
+            result = pipeline.run(table)
+        except SPLError as e:
+            print(f"    [WARNING] Failed: {e}")
+            failed += 1
+            continue
+        elapsed = time.perf_counter() - started
+        search_time += elapsed
+        print(f"    {len(result)} results in {elapsed:.2f}s")
+        rows = result.rows()
+        for _, row in zip(range(args.limit), rows):
+            print(f"    {_format_row(row)}")
+        if len(result) > args.limit:
+            print(f"    ... {len(result) - args.limit} more")
+        if output_dir:
+            stem = Path(search.source).stem if search.source.endswith(".spl") else "adhoc"
+            out = output_dir / f"{stem}.search{search.number}.jsonl"
+            with open(out, "w") as f:
+                for row in result.rows():
+                    f.write(json.dumps(row, default=str) + "\n")
+
+    print("\n" + "=" * 70)
+    print("  SPL RUN COMPLETE")
+    print(f"  Searches run:   {len(searches) - failed}/{len(searches)}")
+    print(f"  Load time:      {load_time:.2f}s")
+    print(f"  Search time:    {search_time:.2f}s")
+    if output_dir:
+        print(f"  Results:        {output_dir}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+run_sweep.py — ROC Tables for Detection Thresholds and Windows
+
+Reads the logs in `output/logs/` once and scores every (span, threshold)
+pair of the selected sweeps against the `is_malicious` labels (see
+threshold_sweep.py). Prints one table per sweep and span; the shipped
+setting of each search is marked with `*`, and the best F1 per sweep is
+listed at the end. The full grid is written to
+`output/detections/sweep.json`.
+
+Usage:
+    # Every sweep over every generator log
+    python detection_engine/run_sweep.py
+
+    # One sweep, a custom grid
+    python detection_engine/run_sweep.py --sweeps brute_force --spans 5m,10m --thresholds 10,20,30,40,50
+
+    # List the sweeps
+    python detection_engine/run_sweep.py --list
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from detection_engine.threshold_sweep import SWEEPS, run_sweeps
+from utils.log_reader import default_files
+from detection_engine.run_detections import event_stream
+
+
+def _span_label(seconds: int) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+def _pct(value) -> str:
+    return "   —  " if value is None else f"{value:6.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep detection thresholds and windows against is_malicious")
+    parser.add_argument("--sweeps", type=str, default="",
+                        help=f"Comma-separated list (default: all): {','.join(SWEEPS)}")
+    parser.add_argument("--files", type=str, default="",
+                        help="Comma-separated log files (relative to output/logs/ or absolute); "
+                             "default: every generator log")
+    parser.add_argument("--spans", type=str, default="", help="Override the spans swept, e.g. 5m,10m,1h")
+    parser.add_argument("--thresholds", type=str, default="", help="Override the thresholds swept, e.g. 10,20,50")
+    parser.add_argument("--output", type=str, default=str(config.DETECTION_OUTPUT_DIR / "sweep.json"),
+                        help="JSON file for the full grid")
+    parser.add_argument("--list", action="store_true", help="List the available sweeps and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\nAvailable sweeps:")
+        for name, build in SWEEPS.items():
+            sweep = build()
+            print(f"  {name:20s} — {sweep.description} | spans "
+                  f"{','.join(_span_label(s) for s in sweep.spans)} | thresholds "
+                  f"{','.join(f'{t:g}' for t in sweep.thresholds)}")
+        return
+
+    selected = [s.strip() for s in args.sweeps.split(",")] if args.sweeps else list(SWEEPS)
+    unknown = [s for s in selected if s not in SWEEPS]
+    if unknown:
+        parser.error(f"Unknown sweep(s): {', '.join(unknown)}")
+    sweeps = [SWEEPS[name]() for name in selected]
+    try:
+        spans = args.spans.split(",") if args.spans else None
+        thresholds = [float(t) for t in args.thresholds.split(",")] if args.thresholds else None
+        for sweep in sweeps:
+            sweep.set_grid(spans, thresholds)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.files:
+        paths = [Path(f) if Path(f).is_absolute() else config.LOG_DIR / f for f in args.files.split(",")]
+    else:
+        paths = default_files()
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        parser.error(f"Log file(s) not found: {', '.join(missing)}")
+    if not paths:
+        parser.error(f"No log files in {config.LOG_DIR} — run the generators first")
+
+    print("\n" + "=" * 70)
+    print("  SPLUNK DETECTION ENGINEERING LAB — Threshold Sweep")
+    print(f"  Sweeps: {', '.join(selected)}")
+    print(f"  Files: {', '.join(p.name for p in paths)}")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    events = run_sweeps(sweeps, event_stream(paths))
+    pass_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = {}
+    best = []
+    for name, sweep in zip(selected, sweeps):
+        grid = sweep.evaluate()
+        results[name] = {
+            "search": sweep.name,
+            "metric": sweep.description,
+            "unit": sweep.unit,
+            "events": sweep.events,
+            "malicious_events": sweep.malicious,
+            "spans": {_span_label(span): table for span, table in grid.items()},
+        }
+        print(f"\n  {sweep.name} — {sweep.description} >= N {sweep.unit}")
+        print(f"    {sweep.events} events, {sweep.malicious} malicious")
+        top = None
+        for span, table in grid.items():
+            print(f"\n    span {_span_label(span)}: {table['groups']} groups, {table['malicious_groups']} malicious")
+            print(f"      {'N':>8s} {'alerts':>7s} {'TP':>6s} {'FP':>6s}  {'Prec':>6s}  {'TPR':>6s}  "
+                  f"{'FPR':>6s}  {'EvRec':>6s}")
+            for row in table["rows"]:
+                print(f"    {'*' if row['default'] else ' '} {row['threshold']:>8g} {row['alerts']:>7d} "
+                      f"{row['tp']:>6d} {row['fp']:>6d}  {_pct(row['precision'])}  {_pct(row['tpr'])}  "
+                      f"{_pct(row['fpr'])}  {_pct(row['event_recall'])}")
+                if top is None or row["f1"] > top[2]["f1"]:
+                    top = (name, span, row)
+        if top is not None:
+            best.append((sweep, top))
+    eval_time = time.perf_counter() - started
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    cells = sum(len(s.spans) * len(s.thresholds) for s in sweeps)
+    print("\n" + "=" * 70)
+    print("  SWEEP COMPLETE")
+    for sweep, (_, span, row) in best:
+        print(f"    {sweep.name:24s} best F1 {row['f1']:.2f} at >= {row['threshold']:g} {sweep.unit} "
+              f"per {_span_label(span)} (precision {_pct(row['precision']).strip()}, "
+              f"TPR {_pct(row['tpr']).strip()}, FPR {_pct(row['fpr']).strip()})")
+    print(f"  Events:         {events} in one pass ({pass_time:.1f}s)")
+    print(f"  Grid:           {cells} (span, threshold) cells scored in {eval_time:.2f}s")
+    print(f"  Results:        {output}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
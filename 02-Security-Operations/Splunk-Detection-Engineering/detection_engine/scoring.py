@@ -0,0 +1,244 @@
+"""
+scoring.py — Precision / Recall of Detections against `is_malicious`
+
+Scores detections on generated data, where every event carries its
+ground-truth label:
+
+    TP   alerts whose evidence contains malicious events of a technique
+         the detection targets
+    FP   alerts whose evidence contains none
+    FN   malicious events of a targeted technique no alert covered
+    TTD  time to detect: first alert on an entity minus that entity's
+         first malicious event
+
+reported per detection and per `mitre_technique` (techniques match by
+prefix, so a T1110 detection covers T1110.001 events and vice versa).
+
+The labels are collected in the same pass that feeds the detections,
+and only for malicious events: each one is appended to a sorted time
+array (`array('d')`) for its (entity key, technique), one set of arrays
+per distinct (entity fields, techniques) a detection declares. Joining
+alerts to labels is then a pair of binary searches per alert, never a
+scan over events, and coverage is the union of the index ranges those
+searches return.
+
+Usage:
+    truth = GroundTruth(detections)
+    alerts = list(run_detections(detections, events, truth=truth))
+    report = score(detections, alerts, truth)
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from statistics import median
+from typing import Dict, Any, List, Sequence, Tuple
+
+from detection_engine.base import Detection
+
+
+def technique_matches(a: str, b: str) -> bool:
+    """True if `a` and `b` are the same technique or one is a sub-technique of the other."""
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+class _Series:
+    """Malicious events of one (entity key, technique): times and global ids, in time order."""
+
+    __slots__ = ("times", "ids")
+
+    def __init__(self):
+        self.times = array("d")
+        self.ids = array("q")
+
+
+class GroundTruth:
+    """
+    Label index built while the detections run.
+    """
+
+    def __init__(self, detections: Sequence[Detection]):
+        self.events = 0
+        self.malicious = 0
+        self.by_technique: Counter = Counter()
+        # (entity fields, targeted techniques) → {(key, technique) → _Series}
+        self.groups: Dict[Tuple, Dict[Tuple, _Series]] = {}
+        for detection in detections:
+            self.groups.setdefault(self.group_of(detection), {})
+        self._routes: Dict[str, List[Tuple[Tuple[str, ...], Dict]]] = {}
+
+    @staticmethod
+    def group_of(detection: Detection) -> Tuple:
+        return detection.entity, detection.techniques
+
+    def _routes_for(self, technique: str) -> List[Tuple[Tuple[str, ...], Dict]]:
+        routes = self._routes.get(technique)
+        if routes is None:
+            routes = self._routes[technique] = [
+                (entity, series) for (entity, targets), series in self.groups.items()
+                if entity and any(technique_matches(technique, t) for t in targets)
+            ]
+        return routes
+
+    def record(self, event: Dict[str, Any], t: float) -> None:
+        """Index one malicious event at epoch `t`."""
+        technique = event.get("mitre_technique") or "unlabelled"
+        event_id = self.malicious
+        self.malicious += 1
+        self.by_technique[technique] += 1
+        for entity, groups in self._routes_for(technique):
+            key = tuple(event.get(f) for f in entity)
+            if None in key:
+                continue
+            series = groups.get((key, technique))
+            if series is None:
+                series = groups[(key, technique)] = _Series()
+            series.times.append(t)
+            series.ids.append(event_id)
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1]:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _ttd_summary(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"ttd_median_s": None, "ttd_p90_s": None}
+    ordered = sorted(samples)
+    return {
+        "ttd_median_s": round(median(ordered), 1),
+        "ttd_p90_s": round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))], 1),
+    }
+
+
+def _ratio(num: int, den: int):
+    return round(num / den, 4) if den else None
+
+
+def score(
+    detections: Sequence[Detection],
+    alerts: List[Dict[str, Any]],
+    truth: GroundTruth,
+) -> Dict[str, Any]:
+    """
+    Join `alerts` to the ground truth.
+
+    Returns:
+        {"detections": {name: row}, "techniques": {technique: row}} where
+        rows carry tp/fp/fn, precision, recall and TTD statistics
+    """
+    by_detection = defaultdict(list)
+    for alert in alerts:
+        by_detection[alert["detection"]].append(alert)
+
+    covered = bytearray(truth.malicious)          # union over all detections
+    covered_by_technique: Counter = Counter()
+    alerts_by_technique = defaultdict(lambda: [0, 0])  # technique → [tp, fp]
+    ttd_by_technique = defaultdict(list)
+    detection_rows = {}
+
+    for detection in detections:
+        groups = truth.groups[GroundTruth.group_of(detection)]
+        # entity key → {technique → _Series}, restricted to what this detection targets
+        by_key = defaultdict(dict)
+        for (key, technique), series in groups.items():
+            by_key[key][technique] = series
+
+        tp = fp = 0
+        ranges = defaultdict(list)       # (key, technique) → [(lo, hi)]
+        first_alert: Dict[Tuple, float] = {}
+        for alert in by_detection.get(detection.name, []):
+            key, start, end = detection.evidence(alert)
+            hit = False
+            for technique, series in by_key.get(key, {}).items():
+                lo = bisect_left(series.times, start)
+                hi = bisect_right(series.times, end)
+                if hi > lo:
+                    hit = True
+                    ranges[(key, technique)].append((lo, hi))
+            if hit:
+                tp += 1
+                if alert["detected_at"] < first_alert.get(key, float("inf")):
+                    first_alert[key] = alert["detected_at"]
+            else:
+                fp += 1
+            for technique in truth.by_technique:
+                if technique_matches(technique, alert.get("mitre_technique", detection.mitre_technique)):
+                    alerts_by_technique[technique][0 if hit else 1] += 1
+
+        detected = 0
+        ttd = []
+        for (key, technique), spans in ranges.items():
+            series = groups[(key, technique)]
+            ids = series.ids
+            for lo, hi in _merge_ranges(spans):
+                detected += hi - lo
+                for event_id in ids[lo:hi]:
+                    if not covered[event_id]:
+                        covered[event_id] = 1
+                        covered_by_technique[technique] += 1
+            delay = first_alert[key] - series.times[0]
+            ttd.append(delay)
+            ttd_by_technique[technique].append(delay)
+
+        targeted = sum(n for technique, n in truth.by_technique.items()
+                       if any(technique_matches(technique, t) for t in detection.techniques))
+        detection_rows[detection.name] = {
+            "techniques": list(detection.techniques),
+            "alerts": tp + fp,
+            "tp": tp,
+            "fp": fp,
+            "fn": targeted - detected,
+            "precision": _ratio(tp, tp + fp),
+            "recall": _ratio(detected, targeted),
+            "detected_entities": len(first_alert),
+            **_ttd_summary(ttd),
+        }
+
+    technique_rows = {}
+    for technique, total in sorted(truth.by_technique.items()):
+        tp, fp = alerts_by_technique.get(technique, (0, 0))
+        found = covered_by_technique[technique]
+        technique_rows[technique] = {
+            "events": total,
+            "detected": found,
+            "fn": total - found,
+            "recall": _ratio(found, total),
+            "alerts_tp": tp,
+            "alerts_fp": fp,
+            "precision": _ratio(tp, tp + fp),
+            **_ttd_summary(ttd_by_technique.get(technique, [])),
+        }
+
+    return {
+        "events": truth.events,
+        "malicious": truth.malicious,
+        "detections": detection_rows,
+        "techniques": technique_rows,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Per-detection and per-technique tables."""
+    def pct(value):
+        return "   —  " if value is None else f"{value:6.1%}"
+
+    def secs(value):
+        return "      —" if value is None else f"{value:6.0f}s"
+
+    print(f"\n  SCORING ({report['malicious']} malicious of {report['events']} events)")
+    print(f"    {'Detection':40s} {'TP':>6s} {'FP':>6s} {'FN':>8s}  {'Prec':>6s}  {'Recall':>6s}  {'TTD p50':>7s}")
+    for name, row in report["detections"].items():
+        print(f"    {name:40s} {row['tp']:>6d} {row['fp']:>6d} {row['fn']:>8d}  "
+              f"{pct(row['precision'])}  {pct(row['recall'])}  {secs(row['ttd_median_s'])}")
+    print(f"\n    {'Technique':40s} {'TP':>6s} {'FP':>6s} {'FN':>8s}  {'Prec':>6s}  {'Recall':>6s}  {'TTD p50':>7s}")
+    for technique, row in report["techniques"].items():
+        print(f"    {technique:40s} {row['alerts_tp']:>6d} {row['alerts_fp']:>6d} {row['fn']:>8d}  "
+              f"{pct(row['precision'])}  {pct(row['recall'])}  {secs(row['ttd_median_s'])}")
@@ -0,0 +1,1454 @@
+"""
+spl.py — Columnar Interpreter for the SPL Subset of detections/*.spl
+
+Runs the .spl files of this lab against generated logs, with no Splunk
+instance and no network, so a change to a search can be tried in
+seconds. The supported vocabulary is the one those files are written in:
+
+    index=... sourcetype="..." field=value field>=N (a OR b) NOT x=y
+    | search <same filter syntax>
+    | bin/bucket _time span=5m
+    | stats count, count(field), count(eval(expr)), dc(), values(), list(),
+            earliest(), latest(), sum(), avg(), min(), max(), stdev()
+            [AS name] ... [BY f1, f2]
+    | eval name = expr, ...
+    | where expr
+    | table f1, f2, prefix*
+    | sort [N] [-|+]f1, ...
+    | head [N]
+
+Eval functions: if, case, coalesce, round, abs, floor, ceil, min, max,
+len, lower, upper, substr, replace, match, like, cidrmatch, isnull,
+isnotnull, null, true, false, tostring, tonumber, urldecode, strftime,
+strptime, now. Anything else (subsearches, `join`, `streamstats`,
+free-text terms, ...) raises SPLError naming it instead of being
+approximated.
+
+Execution is column-at-a-time. The loader reads only the fields a
+search mentions, into one list per field (`_time` as an `array('d')` of
+epoch seconds). Every expression node maps its operand columns to a
+result column, `where` and the base search compress all columns with
+one boolean mask, and `stats` assigns group ids once before reducing
+each aggregated column group by group. No per-event dicts exist after
+loading. (NumPy is not a dependency of this lab; the column operators
+are list comprehensions and builtins over `list`/`array` columns.)
+
+Semantics follow Splunk where it matters to the detections: field
+values compare numerically when both sides are numbers, base-search
+values match case-insensitively with `*` wildcards, comparisons with
+null are false, `count(eval(...))` counts true results, `values()` is
+sorted, and `stats` rows come out ordered by their BY values. "Now"
+for `earliest=-1h` / `now()` is the newest event in the data.
+
+Usage:
+    from detection_engine.spl import parse_file, compile_search, load_table
+
+    searches = parse_file("detections/brute_force_detection.spl")
+    pipeline = compile_search(searches[0].text)
+    result = pipeline.run(load_table(paths, pipeline.fields))
+"""
+
+import re
+import math
+import time
+import calendar
+import fnmatch
+from array import array
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import compress
+from pathlib import Path
+from statistics import stdev
+from typing import Dict, Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Union
+from urllib.parse import unquote_plus
+
+import config
+from detection_engine.base import to_epoch, parse_span
+from data_generators.replay_logs import SOURCETYPES, DEFAULT_SOURCETYPE
+from utils.log_reader import read_events
+from utils.stream_merge import merge_event_streams
+
+
+class SPLError(ValueError):
+    """A search uses syntax or commands outside the supported subset."""
+
+
+# ── Table ────────────────────────────────────────────────────
+class Table:
+    """
+    Equal-length columns, {field: list}; a missing field reads as nulls.
+    """
+
+    def __init__(self, columns: Dict[str, Sequence], length: int, now: Optional[float] = None):
+        self.columns = columns
+        self.length = length
+        self.now = now if now is not None else time.time()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def column(self, name: str) -> Sequence:
+        col = self.columns.get(name)
+        return col if col is not None else [None] * self.length
+
+    def derive(self, columns: Dict[str, Sequence], length: Optional[int] = None) -> "Table":
+        return Table(columns, self.length if length is None else length, self.now)
+
+    def filter(self, mask: Sequence) -> "Table":
+        """Rows where `mask` is true."""
+        selected = sum(map(bool, mask))
+        if selected == self.length:
+            return self
+        return self.derive({name: _take(col, mask) for name, col in self.columns.items()}, selected)
+
+    def take(self, indexes: Sequence[int]) -> "Table":
+        """Rows at `indexes`, in that order."""
+        columns = {}
+        for name, col in self.columns.items():
+            picked = [col[i] for i in indexes]
+            columns[name] = array(col.typecode, picked) if isinstance(col, array) else picked
+        return self.derive(columns, len(indexes))
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values_ in zip(*(self.columns[n] for n in names)):
+            yield {n: v for n, v in zip(names, values_) if v is not None}
+
+
+def _take(col: Sequence, mask: Sequence) -> Sequence:
+    if isinstance(col, array):
+        return array(col.typecode, compress(col, mask))
+    return list(compress(col, mask))
+
+
+def load_table(paths: Iterable[Union[str, Path]], fields: Optional[Set[str]] = None) -> Table:
+    """
+    Read log files (any format) into one time-ordered Table.
+
+    Every event gets `_time` (epoch seconds), `index`, `sourcetype` (by
+    file name, as replay_logs.py sends it), `source` and `host`.
+    Booleans become "true"/"false", as Splunk extracts them.
+
+    Args:
+        fields: Columns to keep (see `Pipeline.fields`); None keeps every field
+    """
+    streams = {str(path): read_events(path) for path in paths}
+    sourcetypes = {tag: SOURCETYPES.get(Path(tag).stem) for tag in streams}
+    sources = {tag: Path(tag).name for tag in streams}
+    wanted = None if fields is None else set(fields) - {"_time", "index", "sourcetype", "source", "host"}
+    columns: Dict[str, list] = {}
+    times = array("d")
+    index_col, sourcetype_col, source_col, host_col = [], [], [], []
+    n = 0
+    for tag, event in merge_event_streams(streams):
+        times.append(to_epoch(event["timestamp"]))
+        index_col.append(config.SPLUNK_INDEX)
+        sourcetype_col.append(sourcetypes[tag] or event.get("sourcetype") or DEFAULT_SOURCETYPE)
+        source_col.append(sources[tag])
+        host_col.append(event.get("hostname"))
+        for key, value in event.items():
+            if key == "_time" or (wanted is not None and key not in wanted):
+                continue  # _time: the generators' ISO copy of the timestamp
+            if value is True or value is False:
+                value = "true" if value else "false"
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = [None] * n
+            col.append(value)
+        n += 1
+        for col in columns.values():  # fields absent from this event
+            if len(col) < n:
+                col.append(None)
+    columns.update({"_time": times, "index": index_col, "sourcetype": sourcetype_col,
+                    "source": source_col, "host": host_col})
+    return Table(columns, n, now=times[-1] if n else None)
+
+
+# ── Lexer ────────────────────────────────────────────────────
+class Token(NamedTuple):
+    kind: str     # str, field, num, word, op, end
+    value: Any
+    start: int
+    end: int
+
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<str>"(?:\\.|[^"\\])*")
+  | (?P<field>'[^']*')
+  | (?P<num>\d+(?:\.\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>==|!=|<=|>=|[|()\[\],=<>+\-*/%.:@])
+""", re.X)
+_COMMENT = re.compile(r'`comment\("(.*?)"\)`', re.S)
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise SPLError(f"Unexpected character {text[pos]!r} at offset {pos}")
+        kind = m.lastgroup
+        raw = m.group()
+        if kind == "str":
+            tokens.append(Token("str", re.sub(r'\\(["\\])', r"\1", raw[1:-1]), m.start(), m.end()))
+        elif kind == "field":
+            tokens.append(Token("field", raw[1:-1], m.start(), m.end()))
+        elif kind == "num":
+            tokens.append(Token("num", float(raw) if "." in raw else int(raw), m.start(), m.end()))
+        elif kind != "ws":
+            tokens.append(Token(kind, raw, m.start(), m.end()))
+        pos = m.end()
+    return tokens
+
+
+class _Cursor:
+    """Token stream of one pipeline stage."""
+
+    def __init__(self, tokens: List[Token], command: str, source: str = ""):
+        end = tokens[-1].end if tokens else 0
+        self.tokens = tokens + [Token("end", None, end, end)]
+        self.i = 0
+        self.command = command
+        self.source = source
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.i + offset, len(self.tokens) - 1)]
+
+    def next(self) -> Token:
+        token = self.peek()
+        self.i += 1
+        return token
+
+    def at_op(self, *ops: str) -> bool:
+        token = self.peek()
+        return token.kind == "op" and token.value in ops
+
+    def at_word(self, *words: str, case: bool = True) -> bool:
+        token = self.peek()
+        if token.kind != "word":
+            return False
+        return (token.value if case else token.value.upper()) in words
+
+    def done(self) -> bool:
+        return self.peek().kind == "end"
+
+    def expect_op(self, op: str) -> Token:
+        if not self.at_op(op):
+            self.fail(f"expected '{op}'")
+        return self.next()
+
+    def name(self) -> str:
+        """A field name: bare word or 'quoted'."""
+        token = self.next()
+        if token.kind not in ("word", "field"):
+            self.fail("expected a field name", token)
+        return token.value
+
+    def bare(self) -> str:
+        """Adjacent tokens glued back together: 5m, -1h, 10.0.0.*, web-*."""
+        token = self.next()
+        if token.kind == "str":
+            return token.value
+        if token.kind == "end" or (token.kind == "op" and token.value in "|(),[]"):
+            self.fail("expected a value", token)
+        text = str(token.value) if token.kind != "field" else token.value
+        while True:
+            following = self.peek()
+            if (following.start != token.end or following.kind in ("end", "str")
+                    or (following.kind == "op" and following.value in "|(),[]=<>!")):
+                break
+            token = self.next()
+            text += str(token.value)
+        return text
+
+    def fail(self, message: str, token: Optional[Token] = None):
+        token = token or self.peek()
+        where = "end of command" if token.kind == "end" else repr(token.value)
+        raise SPLError(f"{self.command}: {message} at {where}")
+
+
+# ── Scalar semantics ─────────────────────────────────────────
+def _num(v):
+    """Numeric value of `v`, or None."""
+    cls = v.__class__
+    if cls is int or cls is float:
+        return v
+    if cls is str:
+        try:
+            return float(v) if ("." in v or "e" in v.lower()) else int(v)
+        except ValueError:
+            return None
+    return None
+
+
+def _str(v) -> Optional[str]:
+    if v is None:
+        return None
+    if v.__class__ is float:
+        return str(int(v)) if v.is_integer() else "%.15g" % v
+    if v.__class__ is list:
+        return ",".join(_str(x) for x in v)
+    return v if v.__class__ is str else str(v)
+
+
+def _compare(a, b) -> Optional[int]:
+    """-1/0/1 like Splunk: numerically if both are numbers, else as strings."""
+    if a is None or b is None:
+        return None
+    x, y = _num(a), _num(b)
+    if x is None or y is None:
+        x, y = _str(a), _str(b)
+    return (x > y) - (x < y)
+
+
+def _equal(a, b) -> bool:
+    if a is None or b is None:
+        return False
+    if a.__class__ is b.__class__:
+        return a == b
+    x, y = _num(a), _num(b)
+    if x is not None and y is not None:
+        return x == y
+    return _str(a) == _str(b)
+
+
+def _sort_key(v, missing: int = 2):
+    if v is None:
+        return (missing, 0)
+    x = _num(v)
+    return (0, x) if x is not None else (1, _str(v))
+
+
+def _round(x, digits=0):
+    x = _num(x)
+    if x is None:
+        return None
+    scale = 10 ** int(digits)
+    result = math.floor(abs(x) * scale + 0.5) / scale
+    result = math.copysign(result, x)
+    return int(result) if not digits else result
+
+
+@lru_cache(maxsize=65536)
+def _ip_int(ip: str) -> Optional[int]:
+    parts = ip.split(".")
+    if len(parts) != 4:
+        return None
+    try:
+        octets = [int(p) for p in parts]
+    except ValueError:
+        return None
+    if any(o < 0 or o > 255 for o in octets):
+        return None
+    return (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
+
+
+# ── Expressions ──────────────────────────────────────────────
+# A compiled expression is either a _Const or a function Table → column.
+class _Const:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+Expr = Union[_Const, Callable[[Table], Sequence]]
+
+
+def _column(expr: Expr, table: Table) -> Sequence:
+    if isinstance(expr, _Const):
+        return [expr.value] * table.length
+    return expr(table)
+
+
+def _field(name: str) -> Expr:
+    return lambda table: table.column(name)
+
+
+def _apply(fn: Callable, col: Sequence) -> list:
+    """
+    `fn` over one column, computed once per distinct value: field values
+    repeat heavily (sourcetypes, IPs, usernames), so this is mostly
+    C-level set/dict work instead of a Python call per row.
+    """
+    try:
+        cache = {v: fn(v) for v in set(col)}
+    except TypeError:  # multivalue (list) cells are not hashable
+        return [fn(v) for v in col]
+    return list(map(cache.__getitem__, col))
+
+
+def _map(fn: Callable, *args: Expr) -> Expr:
+    """Apply a scalar `fn` row-wise, folding constants and broadcasting them."""
+    if all(isinstance(a, _Const) for a in args):
+        return _Const(fn(*(a.value for a in args)))
+    if len(args) == 1:
+        (a,) = args
+        return lambda table: _apply(fn, a(table))
+    if len(args) == 2:
+        a, b = args
+        if isinstance(b, _Const):
+            c = b.value
+            return lambda table: _apply(lambda x: fn(x, c), a(table))
+        if isinstance(a, _Const):
+            c = a.value
+            return lambda table: _apply(lambda y: fn(c, y), b(table))
+        return lambda table: [fn(x, y) for x, y in zip(a(table), b(table))]
+    return lambda table: [fn(*row) for row in zip(*(_column(a, table) for a in args))]
+
+
+def _arith(op: str) -> Callable:
+    def apply(a, b):
+        x, y = _num(a), _num(b)
+        if x is None or y is None:
+            if op == "+" and a.__class__ is str and b.__class__ is str:
+                return a + b
+            return None
+        if op == "+":
+            return x + y
+        if op == "-":
+            return x - y
+        if op == "*":
+            return x * y
+        if y == 0:
+            return None
+        return x / y if op == "/" else x % y
+    return apply
+
+
+def _concat(a, b):
+    if a is None or b is None:
+        return None
+    return _str(a) + _str(b)
+
+
+_COMPARISONS = {
+    "=": _equal,
+    "==": _equal,
+    "!=": lambda a, b: a is not None and b is not None and not _equal(a, b),
+    "<": lambda a, b: (_compare(a, b) or 0) < 0,
+    "<=": lambda a, b: a is not None and b is not None and _compare(a, b) <= 0,
+    ">": lambda a, b: (_compare(a, b) or 0) > 0,
+    ">=": lambda a, b: a is not None and b is not None and _compare(a, b) >= 0,
+}
+
+
+def _and(a: Expr, b: Expr) -> Expr:
+    if isinstance(a, _Const) or isinstance(b, _Const):
+        return _map(lambda x, y: bool(x and y), a, b)
+    return lambda table: [True if x and y else False for x, y in zip(a(table), b(table))]
+
+
+def _or(a: Expr, b: Expr) -> Expr:
+    if isinstance(a, _Const) or isinstance(b, _Const):
+        return _map(lambda x, y: bool(x or y), a, b)
+    return lambda table: [True if x or y else False for x, y in zip(a(table), b(table))]
+
+
+def _not(a: Expr) -> Expr:
+    if isinstance(a, _Const):
+        return _Const(not a.value)
+    return lambda table: [not x for x in a(table)]
+
+
+def _all(terms: List[Expr]) -> Expr:
+    expr = terms[0]
+    for term in terms[1:]:
+        expr = _and(expr, term)
+    return expr
+
+
+def _narrow(terms: List[Expr]) -> Callable[[Table], Table]:
+    """
+    Filter by a conjunction one term at a time, so each term is only
+    evaluated on the rows the previous ones kept.
+    """
+    def run(table):
+        for term in terms:
+            if not table.length:
+                break
+            table = table.filter(_column(term, table))
+        return table
+    return run
+
+
+def _const_arg(args: List[Expr], i: int, function: str):
+    if i >= len(args) or not isinstance(args[i], _Const):
+        raise SPLError(f"{function}(): argument {i + 1} must be a literal")
+    return args[i].value
+
+
+def _arity(function: str, args: List[Expr], low: int, high: Optional[int] = None) -> None:
+    high = low if high is None else high
+    if not low <= len(args) <= high:
+        expected = str(low) if low == high else f"{low}-{high}"
+        raise SPLError(f"{function}() takes {expected} arguments, got {len(args)}")
+
+
+def _fn_if(args):
+    _arity("if", args, 3)
+    cond, then, other = args
+    if isinstance(cond, _Const):
+        return then if cond.value else other
+    return lambda table: [t if c else o for c, t, o in
+                          zip(cond(table), _column(then, table), _column(other, table))]
+
+
+def _fn_case(args):
+    if not args or len(args) % 2:
+        raise SPLError("case() takes condition/value pairs")
+    pairs = [(args[i], args[i + 1]) for i in range(0, len(args), 2)]
+
+    def run(table):
+        result = [None] * table.length
+        pending = list(range(table.length))
+        for cond, value in pairs:
+            if not pending:
+                break
+            conds = _column(cond, table)
+            values_ = _column(value, table)
+            still = []
+            for i in pending:
+                if conds[i]:
+                    result[i] = values_[i]
+                else:
+                    still.append(i)
+            pending = still
+        return result
+    return run
+
+
+def _fn_coalesce(args):
+    if not args:
+        raise SPLError("coalesce() takes at least one argument")
+    return _map(lambda *xs: next((x for x in xs if x is not None), None), *args)
+
+
+def _fn_cidrmatch(args):
+    _arity("cidrmatch", args, 2)
+    cidr = _const_arg(args, 0, "cidrmatch")
+    network, _, bits = cidr.partition("/")
+    base = _ip_int(network)
+    if base is None or not bits.isdigit() or int(bits) > 32:
+        raise SPLError(f"cidrmatch(): invalid CIDR '{cidr}'")
+    mask = (0xFFFFFFFF << (32 - int(bits))) & 0xFFFFFFFF
+    base &= mask
+
+    def matches(ip):
+        value = _ip_int(ip) if ip.__class__ is str else None
+        return value is not None and value & mask == base
+    return _map(matches, args[1])
+
+
+def _regex_arg(args, i, function):
+    pattern = _const_arg(args, i, function)
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise SPLError(f"{function}(): invalid regex {pattern!r} ({e})")
+
+
+def _fn_match(args):
+    _arity("match", args, 2)
+    regex = _regex_arg(args, 1, "match")
+    return _map(lambda v: v is not None and regex.search(_str(v)) is not None, args[0])
+
+
+def _fn_like(args):
+    _arity("like", args, 2)
+    pattern = _const_arg(args, 1, "like")
+    regex = re.compile("".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern) + r"\Z",
+                       re.S)
+    return _map(lambda v: v is not None and regex.match(_str(v)) is not None, args[0])
+
+
+def _fn_replace(args):
+    _arity("replace", args, 3)
+    regex = _regex_arg(args, 1, "replace")
+    replacement = re.sub(r"\\(\d)", r"\\g<\1>", _const_arg(args, 2, "replace"))
+    return _map(lambda v: None if v is None else regex.sub(replacement, _str(v)), args[0])
+
+
+def _fn_strftime(args):
+    _arity("strftime", args, 2)
+    fmt = _const_arg(args, 1, "strftime")
+    cache: Dict[int, str] = {}
+    sub_second = "%f" in fmt or "%Q" in fmt
+
+    def strftime(t):
+        t = _num(t)
+        if t is None:
+            return None
+        if sub_second:
+            return datetime.fromtimestamp(t, timezone.utc).strftime(fmt)
+        second = int(t // 1)
+        text = cache.get(second)
+        if text is None:
+            text = cache[second] = datetime.fromtimestamp(second, timezone.utc).strftime(fmt)
+        return text
+    return _map(strftime, args[0])
+
+
+def _fn_strptime(args):
+    _arity("strptime", args, 2)
+    fmt = _const_arg(args, 1, "strptime")
+
+    def strptime(text):
+        if text.__class__ is not str:
+            return None  # like Splunk, a number (e.g. an epoch from latest(_time)) does not parse
+        try:
+            return calendar.timegm(time.strptime(text, fmt))
+        except ValueError:
+            return None
+    return _map(strptime, args[0])
+
+
+def _fn_round(args):
+    _arity("round", args, 1, 2)
+    return _map(_round, *args)
+
+
+def _fn_substr(args):
+    _arity("substr", args, 2, 3)
+
+    def substr(s, start, length=None):
+        s, start = _str(s), _num(start)
+        if s is None or start is None:
+            return None
+        begin = int(start) - 1 if start > 0 else len(s) + int(start)
+        return s[begin:] if length is None else s[begin:begin + int(_num(length) or 0)]
+    return _map(substr, *args)
+
+
+def _numeric(fn: Callable) -> Callable:
+    def apply(v):
+        x = _num(v)
+        return None if x is None else fn(x)
+    return apply
+
+
+def _extreme(pick: Callable) -> Callable:
+    def apply(*xs):
+        present = [x for x in xs if x is not None]
+        if not present:
+            return None
+        numbers = [_num(x) for x in present]
+        if all(x is not None for x in numbers):
+            return pick(numbers)
+        return pick(_str(x) for x in present)
+    return apply
+
+
+def _unary(function: str, fn: Callable) -> Callable[[List[Expr]], Expr]:
+    def build(args):
+        _arity(function, args, 1)
+        return _map(fn, args[0])
+    return build
+
+
+def _variadic(function: str, fn: Callable) -> Callable[[List[Expr]], Expr]:
+    def build(args):
+        if not args:
+            raise SPLError(f"{function}() takes at least one argument")
+        return _map(fn, *args)
+    return build
+
+
+def _nullary(function: str, value: Callable[[Table], Any]) -> Callable[[List[Expr]], Expr]:
+    def build(args):
+        _arity(function, args, 0)
+        return lambda table: [value(table)] * table.length
+    return build
+
+
+FUNCTIONS: Dict[str, Callable[[List[Expr]], Expr]] = {
+    "if": _fn_if,
+    "case": _fn_case,
+    "coalesce": _fn_coalesce,
+    "cidrmatch": _fn_cidrmatch,
+    "match": _fn_match,
+    "like": _fn_like,
+    "replace": _fn_replace,
+    "strftime": _fn_strftime,
+    "strptime": _fn_strptime,
+    "round": _fn_round,
+    "substr": _fn_substr,
+    "abs": _unary("abs", _numeric(abs)),
+    "floor": _unary("floor", _numeric(math.floor)),
+    "ceil": _unary("ceil", _numeric(math.ceil)),
+    "ceiling": _unary("ceiling", _numeric(math.ceil)),
+    "len": _unary("len", lambda v: None if v is None else len(_str(v))),
+    "lower": _unary("lower", lambda v: None if v is None else _str(v).lower()),
+    "upper": _unary("upper", lambda v: None if v is None else _str(v).upper()),
+    "isnull": _unary("isnull", lambda v: v is None),
+    "isnotnull": _unary("isnotnull", lambda v: v is not None),
+    "tostring": _unary("tostring", _str),
+    "tonumber": _unary("tonumber", _num),
+    "urldecode": _unary("urldecode", lambda v: None if v is None else unquote_plus(_str(v))),
+    "min": _variadic("min", _extreme(min)),
+    "max": _variadic("max", _extreme(max)),
+    "null": _nullary("null", lambda table: None),
+    "true": _nullary("true", lambda table: True),
+    "false": _nullary("false", lambda table: False),
+    "now": _nullary("now", lambda table: table.now),
+}
+
+
+def _fold(build: Callable[[List[Expr]], Expr], args: List[Expr]) -> Expr:
+    """Evaluate an all-constant call once, on a one-row table."""
+    expr = build(args)
+    if args and all(isinstance(a, _Const) for a in args) and not isinstance(expr, _Const):
+        return _Const(expr(Table({}, 1, now=0))[0])
+    return expr
+
+
+def parse_expression(cur: _Cursor) -> Expr:
+    """eval/where expression: OR < AND < NOT < comparison < + - . < * / % < unary."""
+    return _all(_parse_conjuncts(cur))
+
+
+def _parse_conjuncts(cur: _Cursor) -> List[Expr]:
+    """A top-level `a AND b AND c` as [a, b, c]; anything with a top-level OR as one term."""
+    terms = [_parse_not(cur)]
+    while cur.at_word("AND"):
+        cur.next()
+        terms.append(_parse_not(cur))
+    if not cur.at_word("OR"):
+        return terms
+    expr = _all(terms)
+    while cur.at_word("OR"):
+        cur.next()
+        expr = _or(expr, _parse_and(cur))
+    return [expr]
+
+
+def _parse_and(cur: _Cursor) -> Expr:
+    expr = _parse_not(cur)
+    while cur.at_word("AND"):
+        cur.next()
+        expr = _and(expr, _parse_not(cur))
+    return expr
+
+
+def _parse_not(cur: _Cursor) -> Expr:
+    if cur.at_word("NOT"):
+        cur.next()
+        return _not(_parse_not(cur))
+    return _parse_comparison(cur)
+
+
+def _parse_comparison(cur: _Cursor) -> Expr:
+    left = _parse_additive(cur)
+    if cur.at_op(*_COMPARISONS):
+        op = cur.next().value
+        left = _map(_COMPARISONS[op], left, _parse_additive(cur))
+    elif cur.at_word("LIKE"):
+        cur.next()
+        left = _fn_like([left, _parse_additive(cur)])
+    return left
+
+
+def _parse_additive(cur: _Cursor) -> Expr:
+    expr = _parse_multiplicative(cur)
+    while cur.at_op("+", "-", "."):
+        op = cur.next().value
+        right = _parse_multiplicative(cur)
+        expr = _map(_concat if op == "." else _arith(op), expr, right)
+    return expr
+
+
+def _parse_multiplicative(cur: _Cursor) -> Expr:
+    expr = _parse_unary(cur)
+    while cur.at_op("*", "/", "%"):
+        op = cur.next().value
+        expr = _map(_arith(op), expr, _parse_unary(cur))
+    return expr
+
+
+def _parse_unary(cur: _Cursor) -> Expr:
+    if cur.at_op("-"):
+        cur.next()
+        return _map(_numeric(lambda x: -x), _parse_unary(cur))
+    return _parse_primary(cur)
+
+
+def _parse_primary(cur: _Cursor) -> Expr:
+    token = cur.next()
+    if token.kind in ("num", "str"):
+        return _Const(token.value)
+    if token.kind == "field":
+        return _field(token.value)
+    if token.kind == "op" and token.value == "(":
+        expr = parse_expression(cur)
+        cur.expect_op(")")
+        return expr
+    if token.kind == "word":
+        if cur.at_op("(") and cur.peek().start == token.end:
+            build = FUNCTIONS.get(token.value.lower())
+            if build is None:
+                cur.fail(f"unsupported eval function '{token.value}'", token)
+            cur.next()
+            args = []
+            if not cur.at_op(")"):
+                args.append(parse_expression(cur))
+                while cur.at_op(","):
+                    cur.next()
+                    args.append(parse_expression(cur))
+            cur.expect_op(")")
+            return _fold(build, args)
+        return _field(token.value)
+    cur.fail("expected an expression", token)
+
+
+# ── Base search (filter) syntax ──────────────────────────────
+_TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def _relative_time(text: str, command: str) -> Callable[[Table], float]:
+    """earliest=/latest= value → function of the table's "now"."""
+    if text == "now":
+        return lambda table: table.now
+    m = re.fullmatch(r"([+-]?\d+)(s|m|h|d|w)", text)
+    if m is None:
+        if re.fullmatch(r"\d+(\.\d+)?", text):
+            return lambda table: float(text)
+        raise SPLError(f"{command}: unsupported time modifier '{text}' (use e.g. -1h, -30d, now)")
+    offset = int(m.group(1)) * _TIME_UNITS[m.group(2)]
+    return lambda table: table.now + offset
+
+
+def _search_term(field: str, op: str, value: str, command: str) -> Expr:
+    if field in ("earliest", "latest") and op == "=":
+        bound = _relative_time(value, command)
+
+        def in_range(table):
+            limit = bound(table)
+            if field == "earliest":
+                return [t >= limit for t in table.column("_time")]
+            return [t <= limit for t in table.column("_time")]
+        return in_range
+    if op in ("=", "!="):
+        if "*" in value:
+            regex = re.compile(fnmatch.translate(value), re.I)
+
+            def test(v):
+                return v is not None and regex.match(_str(v)) is not None
+        else:
+            folded = value.lower()
+            number = _num(value)
+
+            def test(v):
+                if v is None:
+                    return False
+                if number is not None and v.__class__ is not str:
+                    return _num(v) == number
+                return _str(v).lower() == folded
+        if op == "!=":
+            return lambda table: _apply(lambda v: v is not None and not test(v), table.column(field))
+        return lambda table: _apply(test, table.column(field))
+    compare = _COMPARISONS[op]
+    return lambda table: _apply(lambda v: compare(v, value), table.column(field))
+
+
+def parse_filter(cur: _Cursor) -> List[Expr]:
+    """
+    Base search terms, as the list of conjuncts. As in Splunk, OR binds
+    tighter than the implicit AND between terms: `a b OR c` is
+    `a AND (b OR c)`.
+    """
+    terms = []
+    while not cur.done() and not cur.at_op(")"):
+        if cur.at_word("AND"):
+            cur.next()
+            continue
+        terms.append(_parse_filter_or(cur))
+    return terms
+
+
+def _parse_filter_or(cur: _Cursor) -> Expr:
+    expr = _parse_filter_term(cur)
+    while cur.at_word("OR"):
+        cur.next()
+        expr = _or(expr, _parse_filter_term(cur))
+    return expr
+
+
+def _parse_filter_term(cur: _Cursor) -> Expr:
+    if cur.at_word("NOT"):
+        cur.next()
+        return _not(_parse_filter_term(cur))
+    if cur.at_op("("):
+        cur.next()
+        terms = parse_filter(cur)
+        cur.expect_op(")")
+        if not terms:
+            cur.fail("empty parentheses")
+        return _all(terms)
+    if cur.at_op("["):
+        cur.fail("subsearches are not supported")
+    token = cur.peek()
+    if token.kind not in ("word", "field"):
+        cur.fail("expected field=value")
+    field = cur.name()
+    if not cur.at_op(*_COMPARISONS):
+        cur.fail(f"free-text search term '{field}' is not supported (use field=value)", token)
+    op = cur.next().value
+    value = cur.bare()
+    return _search_term(field, op, value, cur.command)
+
+
+# ── Commands ─────────────────────────────────────────────────
+Stage = Callable[[Table], Table]
+
+
+def _cmd_search(cur: _Cursor) -> Stage:
+    terms = parse_filter(cur)
+    if not cur.done():
+        cur.fail("unexpected token")
+    return _narrow(terms)
+
+
+def _cmd_where(cur: _Cursor) -> Stage:
+    terms = _parse_conjuncts(cur)
+    if not cur.done():
+        cur.fail("unexpected token")
+    return _narrow(terms)
+
+
+def _cmd_eval(cur: _Cursor) -> Stage:
+    assignments = []
+    while True:
+        target = cur.name()
+        cur.expect_op("=")
+        assignments.append((target, parse_expression(cur)))
+        if cur.done():
+            break
+        cur.expect_op(",")
+
+    def run(table):
+        columns = dict(table.columns)
+        for target, expr in assignments:  # each assignment sees the previous ones
+            columns[target] = _column(expr, table.derive(columns))
+        return table.derive(columns)
+    return run
+
+
+def _cmd_bin(cur: _Cursor) -> Stage:
+    field = "_time"
+    span = None
+    while not cur.done():
+        if cur.at_word("span") and cur.peek(1).kind == "op" and cur.peek(1).value == "=":
+            cur.next()
+            cur.next()
+            text = cur.bare()
+            span = float(text) if _num(text) is not None else parse_span(text)
+        elif cur.peek(1).kind == "op" and cur.peek(1).value == "=":
+            cur.fail(f"unsupported option '{cur.peek().value}'")
+        else:
+            field = cur.name()
+            if cur.at_word("AS", case=False):
+                cur.fail("bin ... AS is not supported")
+    if not span:
+        cur.fail("span= is required")
+
+    def run(table):
+        col = table.column(field)
+        if field == "_time":
+            binned = array("d", (t - t % span for t in col))
+        else:
+            binned = [None if x is None else x - x % span for x in (_num(v) for v in col)]
+        return table.derive({**table.columns, field: binned})
+    return run
+
+
+_STATS_ALIASES = {"c": "count", "distinct_count": "dc", "mean": "avg"}
+_STATS_FUNCTIONS = {"count", "dc", "values", "list", "earliest", "latest", "sum", "avg", "min", "max",
+                    "stdev", "range"}
+
+
+class _StatsAgg(NamedTuple):
+    function: str
+    field: Optional[str]
+    expr: Optional[Expr]
+    out: str
+
+
+def _parse_agg(cur: _Cursor) -> _StatsAgg:
+    token = cur.next()
+    if token.kind != "word":
+        cur.fail("expected a stats function", token)
+    function = _STATS_ALIASES.get(token.value.lower(), token.value.lower())
+    if function not in _STATS_FUNCTIONS:
+        cur.fail(f"unsupported stats function '{token.value}'", token)
+    field = expr = None
+    out = function
+    if cur.at_op("(") and cur.peek().start == token.end:
+        open_paren = cur.next()
+        if cur.at_word("eval") and cur.peek(1).kind == "op" and cur.peek(1).value == "(":
+            cur.next()
+            cur.next()
+            expr = parse_expression(cur)
+            cur.expect_op(")")
+            if function in ("earliest", "latest"):
+                cur.fail(f"{function}(eval(...)) is not supported")
+        else:
+            field = cur.name()
+        close = cur.expect_op(")")
+        out = function + cur.source[open_paren.start:close.end]  # Splunk's default name, e.g. dc(username)
+    elif function != "count":
+        cur.fail(f"{function} needs a field")
+    if cur.at_word("AS", case=False):
+        cur.next()
+        out = cur.name()
+    return _StatsAgg(function, field, expr, out)
+
+
+def _reduce(agg: _StatsAgg, table: Table, members: List[List[int]]) -> list:
+    """One output value per group for `agg`."""
+    function = agg.function
+    if function == "count" and agg.field is None and agg.expr is None:
+        return [len(m) for m in members]
+    if agg.expr is not None:
+        vals = [None if v is None or v is False else v for v in _column(agg.expr, table)]
+    else:
+        vals = table.column(agg.field)
+
+    if function == "count":
+        return [sum(1 for i in m if vals[i] is not None) for m in members]
+    if function in ("dc", "values"):
+        result = []
+        for m in members:
+            distinct = set()
+            for i in m:
+                v = vals[i]
+                if v.__class__ is list:
+                    distinct.update(v)
+                elif v is not None:
+                    distinct.add(v)
+            result.append(len(distinct) if function == "dc" else sorted(distinct, key=_str))
+        return result
+    if function == "list":
+        return [[vals[i] for i in m if vals[i] is not None] for m in members]
+    if function in ("earliest", "latest"):
+        times = table.column("_time")
+        pick = min if function == "earliest" else max
+        result = []
+        for m in members:
+            present = [i for i in m if vals[i] is not None]
+            result.append(vals[pick(present, key=times.__getitem__)] if present else None)
+        return result
+
+    nums = [_num(v) for v in vals]
+    result = []
+    for m in members:
+        xs = [nums[i] for i in m if nums[i] is not None]
+        if function in ("min", "max") and not xs:
+            strs = [_str(vals[i]) for i in m if vals[i] is not None]
+            result.append((min if function == "min" else max)(strs) if strs else None)
+        elif not xs:
+            result.append(None)
+        elif function == "sum":
+            result.append(sum(xs))
+        elif function == "avg":
+            result.append(sum(xs) / len(xs))
+        elif function == "min":
+            result.append(min(xs))
+        elif function == "max":
+            result.append(max(xs))
+        elif function == "range":
+            result.append(max(xs) - min(xs))
+        else:  # stdev
+            result.append(stdev(xs) if len(xs) > 1 else None)
+    return result
+
+
+# Mergeable partial states, for StatsStage.partial(): one per group and
+# function, combined slice by slice, finished into what _reduce gives
+def _partial(agg: _StatsAgg, table: Table, members: List[List[int]]) -> list:
+    function = agg.function
+    if function == "count" and agg.field is None and agg.expr is None:
+        return [len(m) for m in members]
+    if agg.expr is not None:
+        vals = [None if v is None or v is False else v for v in _column(agg.expr, table)]
+    else:
+        vals = table.column(agg.field)
+
+    if function == "count":
+        return [sum(1 for i in m if vals[i] is not None) for m in members]
+    if function in ("dc", "values"):
+        result = []
+        for m in members:
+            distinct = set()
+            for i in m:
+                v = vals[i]
+                if v.__class__ is list:
+                    distinct.update(v)
+                elif v is not None:
+                    distinct.add(v)
+            result.append(distinct)
+        return result
+    if function == "list":
+        return [[vals[i] for i in m if vals[i] is not None] for m in members]
+    if function in ("earliest", "latest"):
+        times = table.column("_time")
+        pick = min if function == "earliest" else max
+        result = []
+        for m in members:
+            present = [i for i in m if vals[i] is not None]
+            i = pick(present, key=times.__getitem__) if present else None
+            result.append(None if i is None else (times[i], vals[i]))
+        return result
+
+    nums = [_num(v) for v in vals]
+    result = []
+    for m in members:
+        xs = [nums[i] for i in m if nums[i] is not None]
+        if function in ("sum", "avg"):
+            result.append((sum(xs), len(xs)))
+        elif function in ("min", "max"):
+            pick = min if function == "min" else max
+            strs = [_str(vals[i]) for i in m if vals[i] is not None and nums[i] is None]
+            result.append((pick(xs) if xs else None, pick(strs) if strs else None))
+        elif function == "range":
+            result.append((min(xs), max(xs)) if xs else None)
+        else:  # stdev: count, mean, sum of squared deviations
+            mean = sum(xs) / len(xs) if xs else 0.0
+            result.append((len(xs), mean, sum((x - mean) ** 2 for x in xs)))
+    return result
+
+
+def _initial(function: str):
+    if function in ("dc", "values"):
+        return set()
+    if function == "list":
+        return []
+    if function in ("earliest", "latest", "range"):
+        return None
+    if function in ("sum", "avg"):
+        return (0, 0)
+    if function in ("min", "max"):
+        return (None, None)
+    if function == "stdev":
+        return (0, 0.0, 0.0)
+    return 0
+
+
+def _combine(function: str, a, b):
+    """`a` merged with the later slice's `b`; sets and lists are updated in place."""
+    if function == "count":
+        return a + b
+    if function in ("dc", "values"):
+        a |= b
+        return a
+    if function == "list":
+        a += b
+        return a
+    if b is None:
+        return a
+    if function in ("earliest", "latest"):
+        if a is None or (b[0] < a[0] if function == "earliest" else b[0] > a[0]):
+            return b
+        return a
+    if function in ("sum", "avg"):
+        return (a[0] + b[0], a[1] + b[1])
+    if function in ("min", "max"):
+        pick = min if function == "min" else max
+        return tuple(x if y is None else y if x is None else pick(x, y) for x, y in zip(a, b))
+    if function == "range":
+        return b if a is None else (min(a[0], b[0]), max(a[1], b[1]))
+    # stdev: Chan et al.'s pairwise update
+    n = a[0] + b[0]
+    if not n:
+        return a
+    delta = b[1] - a[1]
+    return (n, a[1] + delta * b[0] / n, a[2] + b[2] + delta * delta * a[0] * b[0] / n)
+
+
+def _finish(function: str, state):
+    if function == "dc":
+        return len(state)
+    if function == "values":
+        return sorted(state, key=_str)
+    if function in ("earliest", "latest"):
+        return None if state is None else state[1]
+    if function == "sum":
+        return state[0] if state[1] else None
+    if function == "avg":
+        return state[0] / state[1] if state[1] else None
+    if function in ("min", "max"):
+        return state[0] if state[0] is not None else state[1]
+    if function == "range":
+        return None if state is None else state[1] - state[0]
+    if function == "stdev":
+        return math.sqrt(state[2] / (state[0] - 1)) if state[0] > 1 else None
+    return state
+
+
+class StatsStage:
+    """
+    `stats`. Besides running over a whole table, it splits into per-group
+    partial aggregates: `partial()` of any slice of the rows, `merge()`d
+    slice by slice in time order and `finish()`ed, gives the table
+    running it over the union of those rows would.
+    """
+
+    def __init__(self, aggs: List[_StatsAgg], by: List[str]):
+        self.aggs = aggs
+        self.by = by
+
+    def _groups(self, table: Table):
+        if not self.by:
+            return [()], [list(range(table.length))]
+        index = defaultdict(list)
+        for i, key in enumerate(zip(*(table.column(f) for f in self.by))):
+            index[key].append(i)
+        # events missing a BY field are dropped
+        groups = [(k, m) for k, m in index.items() if None not in k]
+        return [k for k, _ in groups], [m for _, m in groups]
+
+    def _table(self, table: Table, keys: List[tuple], columns: Dict[str, Sequence]) -> Table:
+        """Result rows in BY order."""
+        order = sorted(range(len(keys)), key=lambda i: [_sort_key(v) for v in keys[i]])
+        result = {f: [keys[i][j] for i in order] for j, f in enumerate(self.by)}
+        for name, col in columns.items():
+            result[name] = [col[i] for i in order]
+        return table.derive(result, len(keys))
+
+    def __call__(self, table: Table) -> Table:
+        keys, members = self._groups(table)
+        return self._table(table, keys, {agg.out: _reduce(agg, table, members) for agg in self.aggs})
+
+    def partial(self, table: Table) -> Dict[tuple, list]:
+        """{BY values: [state per aggregation]} of the rows of `table`."""
+        keys, members = self._groups(table)
+        if not self.by and not table.length:
+            return {}
+        states = [_partial(agg, table, members) for agg in self.aggs]
+        return {key: [col[g] for col in states] for g, key in enumerate(keys)}
+
+    def merge(self, into: Dict[tuple, list], partial: Dict[tuple, list]) -> None:
+        """Fold a later slice's `partial` into `into` (which `merge` owns)."""
+        functions = [agg.function for agg in self.aggs]
+        for key, states in partial.items():
+            acc = into.get(key)
+            if acc is None:
+                acc = into[key] = [_initial(f) for f in functions]
+            for j, (f, state) in enumerate(zip(functions, states)):
+                acc[j] = _combine(f, acc[j], state)
+
+    def finish(self, merged: Dict[tuple, list], table: Table) -> Table:
+        """The stats result of the merged slices; `table` supplies "now"."""
+        if not self.by and not merged:
+            merged = {(): [_initial(agg.function) for agg in self.aggs]}
+        keys = list(merged)
+        columns = {agg.out: [_finish(agg.function, merged[k][j]) for k in keys]
+                   for j, agg in enumerate(self.aggs)}
+        return self._table(table, keys, columns)
+
+
+def _cmd_stats(cur: _Cursor) -> Stage:
+    aggs: List[_StatsAgg] = []
+    by: List[str] = []
+    while not cur.done():
+        if cur.at_op(","):
+            cur.next()
+            continue
+        if cur.at_word("BY", case=False):
+            cur.next()
+            while not cur.done():
+                by.append(cur.name())
+                if cur.at_op(","):
+                    cur.next()
+            break
+        aggs.append(_parse_agg(cur))
+    if not aggs:
+        cur.fail("at least one stats function is required")
+    return StatsStage(aggs, by)
+
+
+def _field_list(cur: _Cursor) -> List[str]:
+    names = []
+    while not cur.done():
+        if cur.at_op(","):
+            cur.next()
+            continue
+        names.append(cur.bare())
+    return names
+
+
+def _cmd_table(cur: _Cursor) -> Stage:
+    patterns = _field_list(cur)
+    if not patterns:
+        cur.fail("at least one field is required")
+
+    def run(table):
+        columns = {}
+        for pattern in patterns:
+            if "*" in pattern:
+                for name in table.columns:
+                    if fnmatch.fnmatchcase(name, pattern):
+                        columns.setdefault(name, table.columns[name])
+            else:
+                columns.setdefault(pattern, table.column(pattern))
+        return table.derive(columns)
+    return run
+
+
+def _cmd_sort(cur: _Cursor) -> Stage:
+    limit = None
+    if cur.peek().kind == "num":
+        limit = int(cur.next().value) or None
+    keys = []
+    while not cur.done():
+        if cur.at_op(","):
+            cur.next()
+            continue
+        descending = False
+        if cur.at_op("-", "+"):
+            descending = cur.next().value == "-"
+        if cur.at_word("num", "str", "auto", "ip") and cur.peek(1).kind == "op" and cur.peek(1).value == "(":
+            cur.next()
+            cur.next()
+            field = cur.name()
+            cur.expect_op(")")
+        else:
+            field = cur.name()
+        keys.append((field, descending))
+    if not keys:
+        cur.fail("expected sort fields")
+
+    def run(table):
+        order = list(range(table.length))
+        for field, descending in reversed(keys):  # stable sorts, last key first
+            col = table.column(field)
+            missing = -1 if descending else 2  # nulls sort last either way
+            order.sort(key=lambda i: _sort_key(col[i], missing), reverse=descending)
+        return table.take(order[:limit] if limit else order)
+    return run
+
+
+def _cmd_head(cur: _Cursor) -> Stage:
+    count = 10
+    if cur.peek().kind == "num":
+        count = int(cur.next().value)
+    if not cur.done():
+        cur.fail("only `head N` is supported")
+    return lambda table: table.take(range(min(count, table.length)))
+
+
+COMMANDS: Dict[str, Callable[[_Cursor], Stage]] = {
+    "search": _cmd_search,
+    "where": _cmd_where,
+    "eval": _cmd_eval,
+    "bin": _cmd_bin,
+    "bucket": _cmd_bin,
+    "stats": _cmd_stats,
+    "table": _cmd_table,
+    "sort": _cmd_sort,
+    "head": _cmd_head,
+}
+
+
+# ── Pipelines ────────────────────────────────────────────────
+def _split_pipes(tokens: List[Token]) -> List[List[Token]]:
+    stages, current, depth = [], [], 0
+    for token in tokens:
+        if token.kind == "op":
+            if token.value == "[":
+                depth += 1
+            elif token.value == "]":
+                depth -= 1
+            elif token.value == "|" and depth == 0:
+                stages.append(current)
+                current = []
+                continue
+        current.append(token)
+    stages.append(current)
+    return stages
+
+
+class Pipeline:
+    """
+    A compiled search: `run(table)` applies each stage in order.
+
+    Attributes:
+        fields: Every name the search mentions — the columns `load_table`
+                must read — or None when a `table` wildcard needs them all
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        source = _COMMENT.sub(" ", text)
+        tokens = tokenize(source)
+        self.stages: List[tuple] = []
+        for i, stage_tokens in enumerate(_split_pipes(tokens)):
+            if i == 0:
+                if stage_tokens and stage_tokens[0].kind == "word" and stage_tokens[0].value.lower() == "search":
+                    stage_tokens = stage_tokens[1:]
+                name = "search"
+            else:
+                if not stage_tokens or stage_tokens[0].kind != "word":
+                    raise SPLError(f"Empty or malformed command after pipe #{i}")
+                name = stage_tokens[0].value.lower()
+                stage_tokens = stage_tokens[1:]
+            build = COMMANDS.get(name)
+            if build is None:
+                raise SPLError(f"Unsupported command '{name}'")
+            self.stages.append((name, build(_Cursor(stage_tokens, name, source))))
+
+        self.fields: Optional[Set[str]] = {t.value for t in tokens if t.kind in ("word", "field")}
+        if any(t.kind == "op" and t.value == "*" for stage in _split_pipes(tokens)
+               if stage and stage[0].value == "table" for t in stage):
+            self.fields = None
+
+    def run(self, table: Table) -> Table:
+        for _, stage in self.stages:
+            table = stage(table)
+        return table
+
+
+def compile_search(text: str) -> Pipeline:
+    return Pipeline(text)
+
+
+# ── .spl files ───────────────────────────────────────────────
+class Search(NamedTuple):
+    number: int
+    title: str
+    text: str
+    source: str
+
+
+_SEARCH_MARKER = re.compile(r"---\s*SEARCH\s+(\d+):\s*(.*?)\s*---")
+
+
+def split_searches(text: str, source: str = "") -> List[Search]:
+    """
+    Searches of one .spl file. Each search is whatever follows a
+    `comment("--- SEARCH N: Title ---")` marker; other comments are
+    stripped.
+    """
+    searches = []
+    pieces = _COMMENT.split(text)  # text, comment, text, comment, ...
+    title, number = "", 0
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            marker = _SEARCH_MARKER.search(piece)
+            if marker:
+                number, title = int(marker.group(1)), marker.group(2)
+            continue
+        body = piece.strip()
+        if body:
+            number = number or len(searches) + 1
+            searches.append(Search(number, title or f"Search {number}", body, source))
+            title, number = "", 0
+    return searches
+
+
+def parse_file(path: Union[str, Path]) -> List[Search]:
+    path = Path(path)
+    return split_searches(path.read_text(), path.name)
@@ -0,0 +1,290 @@
+"""
+threshold_sweep.py — Single-Pass Threshold / Window Sweeps for Tuning
+
+The tuning guidance in the .spl files is a range, not a value: "10
+failures in 5 min is aggressive ... production SOCs may set 20-50".
+Trying each (threshold, window) pair as its own search repeats the
+same grouping over and over. A sweep instead aggregates once and scores
+the whole grid against the `is_malicious` labels.
+
+A sweep is one `bin _time span=X | stats <metric> BY ... | where
+<metric> >= N` search with two knobs:
+
+    1. One pass over the events: every event matching the base search
+       goes into a (bucket, BY key) group at the base span (the gcd of
+       the spans swept), which keeps the metric (count, sum or dc of a
+       field, over the events passing `where`) and how many of its
+       events are malicious for the targeted techniques.
+    2. Each span rolls the base groups up into its own buckets (counts
+       and sums add, dc sets union).
+    3. Each span sorts its groups by metric once. A threshold is then a
+       binary search, and suffix sums give the alerted groups with their
+       TP/FP and covered malicious events.
+
+Every (window, entity) group is one sample. It is positive when it holds
+a malicious event of a targeted technique, so each row of the table is
+a point on an ROC curve:
+
+    TPR (recall)   malicious groups alerted / malicious groups
+    FPR            benign groups alerted / benign groups
+    precision      malicious groups alerted / groups alerted
+    event recall   malicious events in alerted groups / malicious events
+
+Usage:
+    from detection_engine.threshold_sweep import SWEEPS, run_sweeps
+
+    sweeps = [SWEEPS["brute_force"]()]
+    run_sweeps(sweeps, events)
+    table = sweeps[0].evaluate()
+"""
+
+import math
+from bisect import bisect_left
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import config
+from detection_engine.base import parse_span, to_epoch
+from detection_engine.scoring import technique_matches
+
+METRICS = ("count", "sum", "dc")
+MB = 1_048_576
+
+
+class Sweep:
+    """
+    One `stats <metric> BY ... | where <metric> >= threshold` search over
+    a grid of spans and thresholds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        by: Sequence[str],
+        metric: str,
+        spans: Sequence[str],
+        thresholds: Sequence[float],
+        techniques: Sequence[str],
+        field: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        scale: float = 1.0,
+        unit: str = "",
+        default: Optional[Tuple[str, float]] = None,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (expected one of {', '.join(METRICS)})")
+        if metric != "count" and field is None:
+            raise ValueError(f"{metric} needs a field")
+        self.name = name
+        self.by = tuple(by)
+        self.metric = metric
+        self.field = field
+        self.match = list((match or {}).items())
+        self.where = where
+        self.scale = scale
+        self.unit = unit
+        self.techniques = tuple(techniques)
+        self.default = (parse_span(default[0]), default[1]) if default else None
+        self.spans = sorted({parse_span(s) for s in spans})
+        self.thresholds = sorted(set(thresholds))
+        self.base = math.gcd(*self.spans)
+
+        # (base bucket, BY key) → [metric state, events, malicious events]
+        self._groups: Dict[Tuple, list] = {}
+        self.events = 0
+        self.malicious = 0
+        self._labels: Dict[str, bool] = {}  # mitre_technique → targeted?
+
+    def set_grid(self, spans: Optional[Sequence[str]] = None, thresholds: Optional[Sequence[float]] = None) -> None:
+        """Replace the spans and/or thresholds swept (before any events are added)."""
+        if self._groups:
+            raise ValueError("The grid cannot change once events have been added")
+        if spans:
+            self.spans = sorted({parse_span(s) for s in spans})
+            self.base = math.gcd(*self.spans)
+        if thresholds:
+            self.thresholds = sorted(set(thresholds))
+
+    @property
+    def description(self) -> str:
+        metric = "count" if self.metric == "count" else f"{self.metric}({self.field})"
+        return f"{metric} BY {', '.join(self.by)}"
+
+    def add(self, event: Dict[str, Any], t: float) -> None:
+        for field, value in self.match:
+            if event.get(field) != value:
+                return
+        key = tuple(event.get(f) for f in self.by)
+        if None in key:  # like SPL stats BY
+            return
+        self.events += 1
+        bad = 0
+        if event.get("is_malicious") is True:
+            technique = event.get("mitre_technique") or ""
+            targeted = self._labels.get(technique)
+            if targeted is None:
+                targeted = self._labels[technique] = any(technique_matches(technique, x) for x in self.techniques)
+            bad = 1 if targeted else 0
+            self.malicious += bad
+
+        group_key = (int(t // self.base) * self.base, key)
+        group = self._groups.get(group_key)
+        if group is None:
+            group = self._groups[group_key] = [set() if self.metric == "dc" else 0, 0, 0]
+        group[1] += 1
+        group[2] += bad
+        if self.where is not None and not self.where(event):
+            return
+        if self.metric == "count":
+            group[0] += 1
+            return
+        value = event.get(self.field)
+        if value is None:
+            return
+        if self.metric == "sum":
+            group[0] += value * self.scale
+        else:
+            group[0].add(value)
+
+    def _rollup(self, span: int) -> List[Tuple[float, int]]:
+        """(metric, malicious events) per group at `span`."""
+        if span == self.base:
+            groups = self._groups
+        else:
+            groups = {}
+            for (bucket, key), (state, n, bad) in self._groups.items():
+                rolled_key = (bucket - bucket % span, key)
+                rolled = groups.get(rolled_key)
+                if rolled is None:
+                    groups[rolled_key] = [set(state) if self.metric == "dc" else state, n, bad]
+                else:
+                    if self.metric == "dc":
+                        rolled[0] |= state
+                    else:
+                        rolled[0] += state
+                    rolled[1] += n
+                    rolled[2] += bad
+        if self.metric == "dc":
+            return [(len(state), bad) for state, _, bad in groups.values()]
+        return [(state, bad) for state, _, bad in groups.values()]
+
+    def evaluate(self) -> Dict[int, Dict[str, Any]]:
+        """
+        {span seconds: {"groups", "malicious_groups", "rows": [one per
+        threshold]}} with alerts, tp, fp, precision, tpr, fpr and
+        event_recall per row.
+        """
+        results = {}
+        for span in self.spans:
+            samples = sorted(self._rollup(span))
+            metrics = [m for m, _ in samples]
+            # suffix sums: groups from i upward alert when threshold <= metrics[i]
+            n = len(samples)
+            positive_above = [0] * (n + 1)
+            bad_above = [0] * (n + 1)
+            for i in range(n - 1, -1, -1):
+                bad = samples[i][1]
+                positive_above[i] = positive_above[i + 1] + (1 if bad else 0)
+                bad_above[i] = bad_above[i + 1] + bad
+            positives = positive_above[0]
+            negatives = n - positives
+
+            rows = []
+            for threshold in self.thresholds:
+                i = bisect_left(metrics, threshold)
+                alerts = n - i
+                tp = positive_above[i]
+                fp = alerts - tp
+                precision = tp / alerts if alerts else None
+                tpr = tp / positives if positives else None
+                rows.append({
+                    "threshold": threshold,
+                    "alerts": alerts,
+                    "tp": tp,
+                    "fp": fp,
+                    "precision": precision,
+                    "tpr": tpr,
+                    "fpr": fp / negatives if negatives else None,
+                    "f1": 2 * precision * tpr / (precision + tpr) if precision and tpr else 0.0,
+                    "event_recall": bad_above[i] / self.malicious if self.malicious else None,
+                    "default": self.default == (span, threshold),
+                })
+            results[span] = {"groups": n, "malicious_groups": positives, "rows": rows}
+        return results
+
+
+def run_sweeps(sweeps: Sequence[Sweep], events: Iterable[Dict[str, Any]]) -> int:
+    """Feed every sweep from one pass over `events`; returns the events read."""
+    n = 0
+    for event in events:
+        t = to_epoch(event["timestamp"])
+        for sweep in sweeps:
+            sweep.add(event, t)
+        n += 1
+    return n
+
+
+# ── Sweeps of the lab's searches ─────────────────────────────
+def _external(event: Dict[str, Any]) -> bool:
+    dst_ip = event.get("dst_ip") or ""
+    return not dst_ip.startswith(("10.", "192.168.")) and not _in_172_16(dst_ip)
+
+
+def _in_172_16(ip: str) -> bool:
+    parts = ip.split(".")
+    return len(parts) == 4 and parts[0] == "172" and parts[1].isdigit() and 16 <= int(parts[1]) <= 31
+
+
+def brute_force_sweep() -> Sweep:
+    """brute_force_detection.spl SEARCH 1: failures per source/destination (shipped: 10 in 5m)."""
+    return Sweep(
+        "Brute Force Threshold", by=("src_ip", "dst_ip", "hostname"), metric="count",
+        match={"event_type": "authentication", "action": "failure"},
+        spans=("1m", "5m", "10m", "15m", "30m"), thresholds=(3, 5, 10, 15, 20, 30, 40, 50),
+        techniques=(config.MITRE_TECHNIQUES["brute_force"]["id"],), unit="failures",
+        default=("5m", 10),
+    )
+
+
+def password_spraying_sweep() -> Sweep:
+    """brute_force_detection.spl SEARCH 3: distinct accounts failed per source (shipped: 10 in 15m)."""
+    return Sweep(
+        "Password Spraying", by=("src_ip",), metric="dc", field="username",
+        match={"event_type": "authentication", "action": "failure"},
+        spans=("5m", "15m", "30m", "1h"), thresholds=(2, 3, 5, 8, 10, 15, 20),
+        techniques=(config.MITRE_TECHNIQUES["brute_force"]["id"],), unit="accounts",
+        default=("15m", 10),
+    )
+
+
+def exfil_volume_sweep() -> Sweep:
+    """data_exfiltration.spl SEARCH 1: MB sent externally in 5MB+ transfers (shipped: 10 MB)."""
+    return Sweep(
+        "Exfiltration Volume", by=("src_ip", "hostname"), metric="sum", field="bytes_out",
+        match={"event_type": "network_flow"},
+        where=lambda e: (e.get("bytes_out") or 0) >= 5 * MB and _external(e),
+        scale=1 / MB, unit="MB",
+        spans=("15m", "30m", "1h", "4h"), thresholds=(5, 10, 25, 50, 100, 250, 500, 1000),
+        techniques=(config.MITRE_TECHNIQUES["exfil_http"]["id"], "T1048"),
+        default=("30m", 10),
+    )
+
+
+def dns_tunneling_sweep() -> Sweep:
+    """data_exfiltration.spl SEARCH 4: queries with subdomains over 20 chars (shipped: 10)."""
+    return Sweep(
+        "DNS Tunneling", by=("src_ip", "hostname"), metric="count",
+        match={"event_type": "dns_query"},
+        where=lambda e: (e.get("subdomain_length") or 0) > 20,
+        spans=("5m", "15m", "1h", "4h"), thresholds=(2, 5, 10, 20, 50, 100),
+        techniques=(config.MITRE_TECHNIQUES["c2_dns"]["id"], config.MITRE_TECHNIQUES["exfil_dns"]["id"]),
+        unit="queries", default=("1h", 10),
+    )
+
+
+SWEEPS = {
+    "brute_force": brute_force_sweep,
+    "password_spraying": password_spraying_sweep,
+    "exfil_volume": exfil_volume_sweep,
+    "dns_tunneling": dns_tunneling_sweep,
+}
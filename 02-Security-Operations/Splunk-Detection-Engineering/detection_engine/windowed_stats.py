@@ -0,0 +1,289 @@
+"""
+windowed_stats.py — Incremental `bin _time span=X | stats ... BY ... | where ...`
+
+Streaming equivalent of the tumbling-window aggregation most SPL
+detections in this lab are built on:
+
+    | bin _time span=5m
+    | stats count AS failure_count, dc(username) AS targeted_accounts, ...
+          BY src_ip, dst_ip, hostname
+    | where failure_count >= 10
+    | eval ...
+
+Events are aggregated into per-window, per-key accumulators as they
+arrive. A window is evaluated (where/eval) and dropped as soon as the
+event-time watermark passes its end plus `lateness`, so only the open
+windows are ever held in memory; events for a window that has already
+closed are counted as late and ignored.
+
+Stats functions (`stats_fn AS out` in SPL):
+    count(out)                      count
+    count(out, where=(f, v))        count(eval(f="v"))
+    dc(field, out)                  dc(field)
+    values(field, out)              values(field)      (sorted, like Splunk)
+    earliest(out, field="_time")    earliest(field)
+    latest(out, field="_time")      latest(field)
+    sum/min/max/avg(field, out)
+
+Usage:
+    from detection_engine.windowed_stats import TumblingWindowSearch, count, dc
+
+    search = TumblingWindowSearch(
+        "Failures", span="5m", by=("src_ip",),
+        aggs=[count("failure_count"), dc("username", "accounts")],
+        where=lambda row: row["failure_count"] >= 10,
+        match={"action": "failure"}, mitre_technique="T1110",
+    )
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+from detection_engine.base import Detection, parse_span
+
+Row = Dict[str, Any]
+
+
+# ── Stats functions ──────────────────────────────────────────
+class Agg:
+    """
+    One stats function. `state` is the accumulator slot it reads; slots
+    are shared between functions over the same data (dc and values of
+    one field keep a single set).
+    """
+
+    def __init__(self, kind: str, out: str, field: Optional[str] = None, where: Optional[Tuple[str, Any]] = None):
+        self.kind = kind
+        self.out = out
+        self.field = field
+        self.where = where
+
+    @property
+    def state(self) -> Tuple:
+        if self.kind in ("dc", "values"):
+            return ("distinct", self.field)
+        if self.kind in ("earliest", "latest"):
+            return (self.kind, self.field)
+        return (self.kind, self.field, self.where)
+
+    def initial(self):
+        kind = self.state[0]
+        if kind == "distinct":
+            return set()
+        if kind in ("earliest", "latest"):
+            return None
+        if kind == "avg":
+            return [0.0, 0]
+        if kind in ("min", "max"):
+            return None
+        return 0
+
+    def updater(self, slot: int) -> Callable[[list, Row, float], None]:
+        """A specialized update function writing accumulator `slot`."""
+        kind, field = self.state[0], self.field
+
+        if kind == "count":
+            if self.where is None:
+                def update(acc, event, t):
+                    acc[slot] += 1
+            else:
+                f, v = self.where
+
+                def update(acc, event, t):
+                    if event.get(f) == v:
+                        acc[slot] += 1
+        elif kind == "distinct":
+            def update(acc, event, t):
+                value = event.get(field)
+                if value is not None:
+                    acc[slot].add(value)
+        elif kind in ("earliest", "latest"):
+            later = kind == "latest"
+
+            def update(acc, event, t):
+                value = t if field == "_time" else event.get(field)
+                if value is None:
+                    return
+                current = acc[slot]
+                if current is None or (t >= current[0] if later else t < current[0]):
+                    acc[slot] = (t, value)
+        elif kind == "sum":
+            def update(acc, event, t):
+                value = event.get(field)
+                if value is not None:
+                    acc[slot] += value
+        elif kind == "avg":
+            def update(acc, event, t):
+                value = event.get(field)
+                if value is not None:
+                    acc[slot][0] += value
+                    acc[slot][1] += 1
+        elif kind in ("min", "max"):
+            pick = min if kind == "min" else max
+
+            def update(acc, event, t):
+                value = event.get(field)
+                if value is not None:
+                    current = acc[slot]
+                    acc[slot] = value if current is None else pick(current, value)
+        else:
+            raise ValueError(f"Unknown stats function '{self.kind}'")
+        return update
+
+    def result(self, value):
+        if self.kind == "dc":
+            return len(value)
+        if self.kind == "values":
+            return sorted(value, key=str)
+        if self.kind in ("earliest", "latest"):
+            return None if value is None else value[1]
+        if self.kind == "avg":
+            return value[0] / value[1] if value[1] else None
+        return value
+
+
+def count(out: str = "count", where: Optional[Tuple[str, Any]] = None) -> Agg:
+    return Agg("count", out, where=where)
+
+
+def dc(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("dc", out or f"dc({field})", field)
+
+
+def values(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("values", out or f"values({field})", field)
+
+
+def earliest(out: str, field: str = "_time") -> Agg:
+    return Agg("earliest", out, field)
+
+
+def latest(out: str, field: str = "_time") -> Agg:
+    return Agg("latest", out, field)
+
+
+def sum_(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("sum", out or f"sum({field})", field)
+
+
+def min_(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("min", out or f"min({field})", field)
+
+
+def max_(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("max", out or f"max({field})", field)
+
+
+def avg(field: str, out: Optional[str] = None) -> Agg:
+    return Agg("avg", out or f"avg({field})", field)
+
+
+# ── Search ───────────────────────────────────────────────────
+class TumblingWindowSearch(Detection):
+    """
+    `bin span | stats BY | where | eval` over an event stream, one alert
+    per (window, key) row that passes `where`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        span,
+        by: Sequence[str],
+        aggs: Sequence[Agg],
+        where: Optional[Callable[[Row], bool]] = None,
+        evals: Optional[Callable[[Row], Row]] = None,
+        match: Optional[Dict[str, Any]] = None,
+        lateness: float = 0,
+        mitre_technique: str = "",
+        severity: str = "high",
+    ):
+        super().__init__(name, mitre_technique, severity, match, entity=by)
+        self.span = parse_span(span)
+        self.by = tuple(by)
+        self.aggs = list(aggs)
+        self.where = where
+        self.evals = evals
+        self.lateness = lateness
+
+        slots: Dict[Tuple, int] = {}
+        for agg in self.aggs:
+            slots.setdefault(agg.state, len(slots))
+        self._slots = [slots[agg.state] for agg in self.aggs]
+        first = {}
+        for agg in self.aggs:
+            first.setdefault(agg.state, agg)
+        self._initial = [first[state] for state in slots]  # one Agg per slot builds its initial value
+        self._updates = [first[state].updater(slot) for state, slot in slots.items()]
+
+        # bucket start → {key tuple → accumulator list}
+        self._windows: Dict[int, Dict[Tuple, list]] = {}
+        self._current: Optional[int] = None
+        self._next_close = float("inf")
+        self._closed_before = float("-inf")  # buckets below this have been emitted
+        self.events_late = 0
+        self.windows_closed = 0
+
+    def state_size(self) -> int:
+        return sum(len(window) for window in self._windows.values())
+
+    def process(self, event: Row, t: float) -> List[Row]:
+        alerts = []
+        if t >= self._next_close:
+            alerts = self._close(t)
+
+        span = self.span
+        bucket = int(t // span) * span
+        if bucket < self._closed_before:
+            self.events_late += 1
+            return alerts
+
+        key = tuple(event.get(f) for f in self.by)
+        if None in key:  # like SPL stats BY: events missing a BY field are dropped
+            return alerts
+
+        if bucket != self._current:
+            if bucket not in self._windows:
+                self._windows[bucket] = {}
+                self._next_close = min(self._next_close, bucket + span + self.lateness)
+            self._current = bucket
+        window = self._windows[bucket]
+        acc = window.get(key)
+        if acc is None:
+            acc = window[key] = [agg.initial() for agg in self._initial]
+        for update in self._updates:
+            update(acc, event, t)
+        return alerts
+
+    def _close(self, watermark: float) -> List[Row]:
+        """Emit and drop every window whose end + lateness is at or before `watermark`."""
+        self.peak_keys = max(self.peak_keys, self.state_size())
+        alerts = []
+        closing = sorted(b for b in self._windows if b + self.span + self.lateness <= watermark)
+        for bucket in closing:
+            alerts.extend(self._emit(bucket, self._windows.pop(bucket)))
+            self._closed_before = max(self._closed_before, bucket + self.span)
+        if self._current in closing:
+            self._current = None
+        self._next_close = min((b + self.span + self.lateness for b in self._windows), default=float("inf"))
+        return alerts
+
+    def _emit(self, bucket: int, window: Dict[Tuple, list]) -> List[Row]:
+        self.windows_closed += 1
+        alerts = []
+        by, aggs, slots, where, evals = self.by, self.aggs, self._slots, self.where, self.evals
+        for key, acc in window.items():
+            row = dict(zip(by, key))
+            for agg, slot in zip(aggs, slots):
+                row[agg.out] = agg.result(acc[slot])
+            if where is not None and not where(row):
+                continue
+            if evals is not None:
+                row.update(evals(row))
+            alerts.append(self.alert(bucket, detected_at=bucket + self.span + self.lateness, **row))
+        return alerts
+
+    def evidence(self, alert: Row) -> Tuple[Tuple, float, float]:
+        return tuple(alert[f] for f in self.by), alert["_time"], alert["_time"] + self.span
+
+    def flush(self) -> List[Row]:
+        return self._close(float("inf"))
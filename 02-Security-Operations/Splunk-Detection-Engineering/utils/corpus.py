@@ -0,0 +1,144 @@
+"""
+corpus.py — Memory-Mapped Wordlist Corpora
+
+Serves multi-million-line wordlists (SecLists-style payload and
+credential files) to the attack simulators without reading them into
+Python lists.
+
+How it works:
+    - The wordlist is mmap'd read-only; lines are decoded only when
+      sampled.
+    - A sidecar index (`<wordlist>.idx`) holds the byte offset of every
+      non-empty line as packed uint64s. It is built once, written
+      atomically, and itself mmap'd and viewed through a memoryview —
+      so opening a corpus is O(1) and every worker process shares the
+      same page-cache pages instead of holding a private copy.
+    - The index header records the wordlist's size and mtime; a changed
+      wordlist triggers a rebuild.
+
+A corpus supports len() and indexing, so `random.choice(corpus)` works
+exactly as it does on the built-in payload lists.
+
+Usage:
+    from utils.corpus import open_corpus
+
+    passwords = open_corpus("/opt/SecLists/Passwords/rockyou.txt")
+    payload = random.choice(passwords)
+"""
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+INDEX_MAGIC = b"CORPIDX1" if sys.byteorder == "little" else b"CORPIDXB"
+INDEX_HEADER = struct.Struct("=8sQQQ")  # magic, source size, source mtime_ns, line count
+_CHUNK_LINES = 1 << 16
+
+
+class MmapCorpus:
+    """
+    Read-only, offset-indexed view of a newline-delimited wordlist.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        stat = self.path.stat()
+        if stat.st_size == 0:
+            raise ValueError(f"Corpus file is empty: {self.path}")
+
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        if not self._index_is_current(stat):
+            self._build_index(stat)
+
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = memoryview(self._index)[INDEX_HEADER.size:].cast("Q")
+        self._size = len(self._data)
+        if len(self._offsets) == 0:
+            raise ValueError(f"Corpus has no non-empty lines: {self.path}")
+
+    # ── Index maintenance ────────────────────────────────────
+    def _index_is_current(self, stat: os.stat_result) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        expected_len = INDEX_HEADER.size + count * 8
+        return (
+            magic == INDEX_MAGIC
+            and size == stat.st_size
+            and mtime_ns == stat.st_mtime_ns
+            and self.index_path.stat().st_size == expected_len
+        )
+
+    def _build_index(self, stat: os.stat_result) -> None:
+        """Scan the wordlist once and write line offsets to a temp file, then rename."""
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        count = 0
+        with open(self.path, "rb") as src, open(tmp, "wb") as out:
+            data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                out.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, 0))
+                chunk = array("Q")
+                for start in self._line_starts(data):
+                    chunk.append(start)
+                    if len(chunk) >= _CHUNK_LINES:
+                        chunk.tofile(out)
+                        count += len(chunk)
+                        chunk = array("Q")
+                chunk.tofile(out)
+                count += len(chunk)
+                out.seek(0)
+                out.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+            finally:
+                data.close()
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _line_starts(data: mmap.mmap) -> Iterator[int]:
+        """Offsets of non-empty lines (blank and CR-only lines are skipped)."""
+        size = len(data)
+        pos = 0
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = size
+            if end > pos and not (end - pos == 1 and data[pos] == 0x0D):
+                yield pos
+            pos = end + 1
+
+    # ── Sequence protocol ────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, i: int) -> str:
+        start = self._offsets[i]
+        end = self._data.find(b"\n", start)
+        if end == -1:
+            end = self._size
+        if end > start and self._data[end - 1] == 0x0D:
+            end -= 1
+        return self._data[start:end].decode("utf-8", errors="replace")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._index.close()
+        self._data.close()
+
+
+@lru_cache(maxsize=None)
+def open_corpus(path: str) -> MmapCorpus:
+    """Open (and cache per process) the corpus at `path`."""
+    return MmapCorpus(path)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+dataset_cache.py — Content-Addressed Cache of Generated Log Files
+
+Seeded generator runs are deterministic, so a log file produced once can
+be reused by every later run with the same parameters. Each entry is
+keyed by a SHA-256 over:
+    - generator class and kwargs
+    - seed, event count, time span, benign ratio and timeline end
+    - log format and sampling rules
+    - a code version: a digest of the generator/formatter sources,
+      config.py and the external inputs they read (corpus files,
+      inventory size), so any change that could alter output misses
+
+A hit is materialized as a hardlink (or a copy, across filesystems or
+with mode="copy") instead of regenerating. Total size is capped and the
+least recently used entries are evicted.
+
+Layout:
+    <root>/objects/<k[:2]>/<key>.log    # the cached file
+    <root>/objects/<k[:2]>/<key>.json   # params, counts, size, last use
+
+Writers in this repo replace their output files instead of truncating
+them, so a hardlinked cache object is never modified in place.
+
+Usage:
+    python utils/dataset_cache.py --list
+    python utils/dataset_cache.py --evict --max-mb 512
+    python utils/dataset_cache.py --clear
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+CACHE_MODES = ("hardlink", "copy")
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Digest of everything besides the key parameters that shapes generated output."""
+    digest = hashlib.sha256()
+    digest.update(("%d.%d" % sys.version_info[:2]).encode())   # random's algorithms
+    sources = [config.PROJECT_ROOT / "config.py"]
+    for package in ("data_generators", "utils"):
+        sources.extend(sorted((config.PROJECT_ROOT / package).glob("*.py")))
+    for path in sources:
+        digest.update(path.relative_to(config.PROJECT_ROOT).as_posix().encode())
+        digest.update(path.read_bytes())
+    for name, path in sorted(config.PAYLOAD_CORPORA.items()):
+        if path and os.path.exists(path):
+            st = os.stat(path)
+            digest.update(f"{name}={path}:{st.st_size}:{st.st_mtime_ns}".encode())
+    digest.update(f"inventory={config.INVENTORY_HOST_COUNT}:{config.INVENTORY_USER_COUNT}".encode())
+    return digest.hexdigest()[:16]
+
+
+class DatasetCache:
+    """
+    Content-addressed store of generated log files with LRU eviction.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_bytes: int = config.DATASET_CACHE_MAX_BYTES,
+        mode: str = config.DATASET_CACHE_MODE,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode '{mode}'. Choose from: {CACHE_MODES}")
+        self.root = Path(root or config.DATASET_CACHE_DIR)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    # ── Keys ─────────────────────────────────────────────────
+    @staticmethod
+    def key(generator_class: type, **params) -> str:
+        """Content address for one generator output; params must be JSON-serializable."""
+        identity = {
+            "generator": f"{generator_class.__module__}.{generator_class.__qualname__}",
+            "version": code_version(),
+            **params,
+        }
+        canonical = json.dumps(identity, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _paths(self, key: str):
+        folder = self.objects / key[:2]
+        return folder / f"{key}.log", folder / f"{key}.json"
+
+    # ── Lookup / insert ──────────────────────────────────────
+    def _materialize(self, src: Path, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.unlink(missing_ok=True)
+        if self.mode == "hardlink":
+            try:
+                os.link(src, dest)
+                return
+            except OSError:
+                pass  # cross-device or unsupported — fall back to a copy
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+
+    def fetch(self, key: str, dest: Path) -> Optional[Dict[str, Any]]:
+        """Place the cached file for `key` at `dest`; return its metadata, or None on a miss."""
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            size = data_path.stat().st_size
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if size != meta.get("size"):
+            print(f"  [WARNING] Cache entry {key[:12]} is damaged — discarding")
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._materialize(data_path, Path(dest))
+        meta["last_used"] = time.time()
+        self._write_meta(meta_path, meta)
+        self.hits += 1
+        self.bytes_served += size
+        return meta
+
+    def store(self, key: str, src: Path, meta: Dict[str, Any]) -> None:
+        """Add a freshly generated file to the cache, then evict down to `max_bytes`."""
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        self._materialize(Path(src), data_path)
+        now = time.time()
+        self._write_meta(meta_path, {
+            **meta, "key": key, "size": data_path.stat().st_size,
+            "created": now, "last_used": now,
+        })
+        self.evict()
+
+    @staticmethod
+    def _write_meta(path: Path, meta: Dict[str, Any]) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta, indent=2, default=str))
+        os.replace(tmp, path)
+
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    # ── Maintenance ──────────────────────────────────────────
+    def entries(self) -> List[Dict[str, Any]]:
+        """Metadata of every entry, least recently used first."""
+        entries = []
+        for meta_path in self.objects.glob("*/*.json"):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(entries, key=lambda m: m.get("last_used", 0))
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Drop least recently used entries until the cache fits; return bytes freed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(m.get("size", 0) for m in entries)
+        freed = 0
+        for meta in entries:
+            if total - freed <= limit:
+                break
+            self._remove(meta["key"])
+            freed += meta.get("size", 0)
+        return freed
+
+    def clear(self) -> int:
+        return self.evict(max_bytes=0)
+
+    def print_stats(self) -> None:
+        print(f"  Dataset cache:  {self.hits} hits, {self.misses} misses "
+              f"({self.bytes_served / 1e6:.1f} MB served by {self.mode})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the generated dataset cache")
+    parser.add_argument("--dir", type=str, default=str(config.DATASET_CACHE_DIR))
+    parser.add_argument("--list", action="store_true", help="List entries, least recently used first")
+    parser.add_argument("--evict", action="store_true", help="Evict down to --max-mb")
+    parser.add_argument("--max-mb", type=float, default=config.DATASET_CACHE_MAX_BYTES / 1e6)
+    parser.add_argument("--clear", action="store_true", help="Remove every entry")
+    args = parser.parse_args()
+
+    cache = DatasetCache(Path(args.dir))
+    if args.clear:
+        print(f"  Removed {cache.clear() / 1e6:.1f} MB")
+    elif args.evict:
+        print(f"  Evicted {cache.evict(int(args.max_mb * 1e6)) / 1e6:.1f} MB")
+
+    entries = cache.entries()
+    if args.list:
+        for meta in entries:
+            params = meta.get("params", {})
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta.get("last_used", 0)))
+            print(f"  {meta['key'][:12]}  {meta.get('name', '?'):18s} {params.get('format', '?'):6s} "
+                  f"seed={params.get('seed')} events={meta.get('events', '?'):<9} "
+                  f"{meta.get('size', 0) / 1e6:8.1f} MB  used {used}")
+    print(f"  {len(entries)} entries, {sum(m.get('size', 0) for m in entries) / 1e6:.1f} MB in {cache.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+entropy_pool.py — Preallocated Random Character Pools
+
+Generating encoded-looking data one character at a time
+(`random.choices(alphabet, k=n)` + `"".join`) dominates the cost of C2
+beacon and DNS tunnel events. An EntropyPool draws a large buffer of
+random characters once; each request is then a slice at a random
+offset — a zero-copy memoryview, or a single short decode when a str
+is required.
+
+The pool is filled from the global `random` module, so seeded runs
+(daemon mode, cached datasets) remain reproducible.
+
+Usage:
+    from utils.entropy_pool import get_pool
+
+    hex_pool = get_pool(string.hexdigits.lower()[:16])
+    label = hex_pool.text(40)        # str, e.g. for a DNS label
+    blob = hex_pool.view(2048)       # memoryview, no copy
+"""
+
+import random
+from functools import lru_cache
+
+
+class EntropyPool:
+    """
+    Fixed buffer of random characters from `alphabet`, sliced on demand.
+    """
+
+    def __init__(self, alphabet: str, size: int = 1 << 20):
+        if not alphabet:
+            raise ValueError("EntropyPool needs a non-empty alphabet")
+        self.alphabet = alphabet
+        self.size = size
+        self._buffer = "".join(random.choices(alphabet, k=size)).encode("ascii")
+        self._view = memoryview(self._buffer)
+
+    def _offset(self, length: int) -> int:
+        if length > self.size:
+            raise ValueError(f"Requested {length} chars from a {self.size}-char pool")
+        return random.randrange(self.size - length + 1)
+
+    def view(self, length: int) -> memoryview:
+        """A read-only window of `length` random characters (no copy)."""
+        start = self._offset(length)
+        return self._view[start : start + length]
+
+    def text(self, length: int) -> str:
+        """`length` random characters as a str."""
+        start = self._offset(length)
+        return self._buffer[start : start + length].decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def get_pool(alphabet: str, size: int = 1 << 20) -> EntropyPool:
+    """The process-wide pool for `alphabet` (created on first use)."""
+    return EntropyPool(alphabet, size)
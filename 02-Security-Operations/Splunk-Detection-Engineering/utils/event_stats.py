@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+event_stats.py — Streaming Distribution Report for Generated Events
+
+Summarizes an event stream in one pass and fixed memory:
+    - distinct counts of src_ip, dst_ip, username, domain, hostname (HyperLogLog)
+    - percentiles of bytes_out, bytes_in, response_size, subdomain_length (t-digest)
+    - counts per label, per MITRE technique and per hour
+
+Generators feed their own EventStats as they emit events; reports from
+separate generators, worker processes or runs merge into one because
+every section is either a counter or a mergeable sketch (the raw
+sketches are kept in the report for exactly that purpose). When events
+carry `sample_weight` (see utils/sampler.py), counts and percentiles are
+weighted back to the unsampled volume; distinct counts cover the events
+actually emitted.
+
+Usage:
+    python utils/event_stats.py output/logs/*.log                   # report for existing logs
+    python utils/event_stats.py shard_a.json shard_b.json -o all.json   # merge reports
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.sketches import HyperLogLog, TDigest
+
+CARDINALITY_FIELDS = ("src_ip", "dst_ip", "username", "domain", "hostname")
+PERCENTILE_FIELDS = ("bytes_out", "bytes_in", "response_size", "subdomain_length")
+QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+EXACT_LIMIT = 4096  # recently seen values per field that skip re-hashing
+
+
+def _num(value: float):
+    return int(value) if float(value).is_integer() else round(value, 3)
+
+
+class EventStats:
+    """
+    One-pass, mergeable summary of an event stream.
+    """
+
+    def __init__(self):
+        self.events = 0
+        self.weighted_events = 0.0
+        self.labels: Counter = Counter()
+        self.techniques: Counter = Counter()
+        self.hours: Counter = Counter()
+        self.cardinality = {field: HyperLogLog() for field in CARDINALITY_FIELDS}
+        self.percentiles = {field: TDigest() for field in PERCENTILE_FIELDS}
+        self._bind()
+
+    def _bind(self) -> None:
+        # HLL updates are idempotent, so values seen recently need no hash
+        self._distinct = [(f, set(), self.cardinality[f].add) for f in CARDINALITY_FIELDS]
+        self._numeric = [(f, self.percentiles[f].add) for f in PERCENTILE_FIELDS]
+
+    def add(self, event: Dict[str, Any]) -> None:
+        weight = event.get("sample_weight", 1)
+        self.events += 1
+        self.weighted_events += weight
+        self.labels["malicious" if event.get("is_malicious") else "benign"] += weight
+        technique = event.get("mitre_technique")
+        if technique:
+            self.techniques[technique] += weight
+        timestamp = event.get("timestamp")
+        if timestamp:
+            self.hours[timestamp[:13]] += weight
+
+        get = event.get
+        for field, recent, add in self._distinct:
+            value = get(field)
+            if value is None or value in recent:
+                continue
+            if len(recent) >= EXACT_LIMIT:
+                recent.clear()
+            recent.add(value)
+            add(value)
+
+        for field, add in self._numeric:
+            value = get(field)
+            if type(value) is int or type(value) is float:
+                add(value, weight)
+
+    def update(self, events: Iterable[Dict[str, Any]]) -> "EventStats":
+        for event in events:
+            self.add(event)
+        return self
+
+    def merge(self, other: "EventStats") -> "EventStats":
+        self.events += other.events
+        self.weighted_events += other.weighted_events
+        self.labels.update(other.labels)
+        self.techniques.update(other.techniques)
+        self.hours.update(other.hours)
+        for field, hll in other.cardinality.items():
+            self.cardinality[field].merge(hll)
+        for field, digest in other.percentiles.items():
+            self.percentiles[field].merge(digest)
+        return self
+
+    # ── Report form ──────────────────────────────────────────
+    def to_dict(self) -> Dict[str, Any]:
+        cardinality = {f: hll.estimate() for f, hll in self.cardinality.items() if any(hll.registers)}
+        percentiles = {}
+        for field, digest in self.percentiles.items():
+            digest_state = digest.to_dict()
+            if not digest.count:
+                continue
+            percentiles[field] = {
+                "count": _num(digest.count),
+                "min": _num(digest_state["min"]),
+                "mean": round(digest.mean(), 1),
+                **{f"p{q * 100:g}": round(digest.quantile(q), 1) for q in QUANTILES},
+                "max": _num(digest_state["max"]),
+            }
+        return {
+            "events": self.events,
+            "weighted_events": _num(self.weighted_events),
+            "labels": {k: _num(v) for k, v in sorted(self.labels.items())},
+            "cardinality": cardinality,
+            "percentiles": percentiles,
+            "mitre_techniques": {k: _num(v) for k, v in self.techniques.most_common()},
+            "hourly": {f"{hour}:00Z": _num(v) for hour, v in sorted(self.hours.items())},
+            "sketches": {
+                "hll": {f: hll.to_dict() for f, hll in self.cardinality.items() if f in cardinality},
+                "tdigest": {f: d.to_dict() for f, d in self.percentiles.items() if f in percentiles},
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventStats":
+        stats = cls()
+        stats.events = data["events"]
+        stats.weighted_events = data["weighted_events"]
+        stats.labels.update(data["labels"])
+        stats.techniques.update(data["mitre_techniques"])
+        stats.hours.update({hour[:13]: v for hour, v in data["hourly"].items()})
+        for field, state in data["sketches"]["hll"].items():
+            stats.cardinality[field] = HyperLogLog.from_dict(state)
+        for field, state in data["sketches"]["tdigest"].items():
+            stats.percentiles[field] = TDigest.from_dict(state)
+        stats._bind()
+        return stats
+
+    def print_summary(self, indent: str = "    ") -> None:
+        report = self.to_dict()
+        if report["cardinality"]:
+            print(f"{indent}Distinct values:  " +
+                  ", ".join(f"{f}≈{n}" for f, n in report["cardinality"].items()))
+        for field, p in report["percentiles"].items():
+            print(f"{indent}{field + ':':18s}p50 {p['p50']:,.0f} | p95 {p['p95']:,.0f} | "
+                  f"p99 {p['p99']:,.0f} | max {p['max']:,}")
+        if report["mitre_techniques"]:
+            print(f"{indent}MITRE techniques: " +
+                  ", ".join(f"{t} {n}" for t, n in report["mitre_techniques"].items()))
+        if report["hourly"]:
+            busiest = max(report["hourly"].items(), key=lambda kv: kv[1])
+            print(f"{indent}Hourly volume:    {len(report['hourly'])} hours, "
+                  f"peak {busiest[1]} at {busiest[0]}")
+
+
+def write_report(path: Path, sections: Dict[str, EventStats]) -> Dict[str, Any]:
+    """Write per-section reports plus their merged total as JSON."""
+    total = EventStats()
+    for stats in sections.values():
+        total.merge(EventStats.from_dict(stats.to_dict()))  # copy: merging mutates
+    report = {
+        "generated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "sections": {name: stats.to_dict() for name, stats in sections.items()},
+        "total": total.to_dict(),
+    }
+    Path(path).write_text(json.dumps(report, indent=2))
+    return report
+
+
+def main():
+    from utils.log_reader import read_events
+
+    parser = argparse.ArgumentParser(description="Build or merge streaming event statistics reports")
+    parser.add_argument("inputs", nargs="+", help="Log files (*.log) and/or reports (*.json) to merge")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Write the JSON report here (default: print the summary only)")
+    args = parser.parse_args()
+
+    sections: Dict[str, EventStats] = {}
+    for name in args.inputs:
+        path = Path(name)
+        if path.suffix == ".json":
+            data = json.loads(path.read_text())
+            for section, state in data.get("sections", {path.stem: data}).items():
+                key = section if section not in sections else f"{path.stem}:{section}"
+                sections[key] = EventStats.from_dict(state)
+        else:
+            sections[path.stem] = EventStats().update(read_events(path))
+
+    for name, stats in sections.items():
+        print(f"\n  {name} ({stats.events} events)")
+        stats.print_summary()
+    if args.output:
+        write_report(Path(args.output), sections)
+        print(f"\n  Report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+hec_router.py — Per-Sourcetype Routing to Multiple HEC Destinations
+
+Splits one generation run across several Splunk indexes, tokens and
+endpoints. A routing table maps each sourcetype to a destination
+(url + token) and an index; "*" is the fallback route and any field it
+leaves out defaults to the global SPLUNK_HEC_URL / TOKEN / INDEX.
+
+Each distinct (url, token) destination gets its own batching buffer,
+a bounded queue of ready-to-POST payloads and a sender thread, so a
+slow indexer only backs up its own queue while the others keep
+flowing. Generators keep calling the `SplunkHECSender` methods
+(`send_batch`, `send_tagged_batch`, `serialize_event`,
+`send_serialized`); sends are asynchronous and `flush()` waits for
+every queue to drain.
+
+Routes file (JSON, values may reference environment variables):
+    {
+      "attack_sim:auth":  {"index": "auth",  "token": "${HEC_TOKEN_AUTH}"},
+      "attack_sim:proxy": {"index": "proxy", "url": "https://hec-proxy:8088", "token": "${HEC_TOKEN_PROXY}"},
+      "*":                {"index": "attack_sim"}
+    }
+
+Usage:
+    from utils.hec_router import HECRouter
+
+    router = HECRouter.from_file("routes/prod_indexes.json")
+    router.send_batch(events, sourcetype="attack_sim:auth")
+    router.close()
+"""
+
+import os
+import re
+import json
+import queue
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import config
+from utils.splunk_hec_sender import SplunkHECSender
+
+_ENVELOPE_SOURCETYPE = re.compile(rb'"sourcetype": ?"([^"]*)"')
+_STOP = None
+
+
+def load_routes(path: Union[str, Path]) -> Dict[str, Dict[str, str]]:
+    """Read a routes file, expanding ${VAR} references in its values."""
+    with open(path) as f:
+        routes = json.load(f)
+    if not isinstance(routes, dict):
+        raise ValueError(f"Routes file {path} must map sourcetypes to destinations")
+    for sourcetype, route in routes.items():
+        unknown = set(route) - {"url", "token", "index"}
+        if unknown:
+            raise ValueError(f"Route '{sourcetype}' has unknown key(s): {', '.join(sorted(unknown))}")
+        for key, value in route.items():
+            route[key] = os.path.expandvars(value)
+            if "${" in route[key] or not route[key]:
+                raise ValueError(f"Route '{sourcetype}': {key} is empty or unresolved ({value})")
+    return routes
+
+
+class _Destination:
+    """One HEC endpoint/token: a sender, its pending lines and a POST queue."""
+
+    def __init__(self, name: str, sender: SplunkHECSender, queue_depth: int):
+        self.name = name
+        self.sender = sender
+        self.queue_depth = queue_depth
+        self.pending: List[bytes] = []
+        self.queue: Optional[queue.Queue] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.queue = queue.Queue(maxsize=self.queue_depth)
+        self.thread = threading.Thread(target=self._drain, name=f"hec-{self.name}", daemon=True)
+        self.thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                payload, count = item
+                try:
+                    self.sender.send_serialized(payload, count)
+                except Exception as e:  # keep draining — a dead thread would hang flush()
+                    self.sender.events_failed += count
+                    print(f"  [HEC] {self.sender.hec_url}: {e}")
+            finally:
+                self.queue.task_done()
+
+
+class HECRouter:
+    """
+    Drop-in for SplunkHECSender that fans events out by sourcetype.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, Dict[str, str]],
+        default_url: str = config.SPLUNK_HEC_URL,
+        default_token: str = config.SPLUNK_HEC_TOKEN,
+        default_index: str = config.SPLUNK_INDEX,
+        batch_size: int = 50,
+        queue_depth: int = 8,
+    ):
+        self.batch_size = batch_size
+        fallback = routes.get("*", {})
+        self.index = fallback.get("index", default_index)
+
+        self._destinations: Dict[Tuple[str, str], _Destination] = {}
+        self._routes: Dict[str, Tuple[_Destination, str]] = {}
+        for sourcetype, route in routes.items():
+            url = route.get("url", fallback.get("url", default_url))
+            token = route.get("token", fallback.get("token", default_token))
+            index = route.get("index", self.index)
+            key = (url.rstrip("/"), token)
+            if key not in self._destinations:
+                sender = SplunkHECSender(hec_url=url, hec_token=token, index=index,
+                                         verify_ssl=config.SPLUNK_VERIFY_SSL, batch_size=batch_size)
+                self._destinations[key] = _Destination(f"{len(self._destinations)}", sender, queue_depth)
+            self._routes[sourcetype] = (self._destinations[key], index)
+        if "*" not in self._routes:
+            key = (default_url.rstrip("/"), default_token)
+            if key not in self._destinations:
+                sender = SplunkHECSender(hec_url=default_url, hec_token=default_token, index=self.index,
+                                         verify_ssl=config.SPLUNK_VERIFY_SSL, batch_size=batch_size)
+                self._destinations[key] = _Destination(f"{len(self._destinations)}", sender, queue_depth)
+            self._routes["*"] = (self._destinations[key], self.index)
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "HECRouter":
+        return cls(load_routes(path), **kwargs)
+
+    # ── Routing ──────────────────────────────────────────────
+    def route(self, sourcetype: str) -> Tuple[_Destination, str]:
+        return self._routes.get(sourcetype) or self._routes["*"]
+
+    def index_for(self, sourcetype: str) -> str:
+        return self.route(sourcetype)[1]
+
+    def _ensure_started(self) -> None:
+        # Threads do not survive fork: a router inherited by a child process
+        # (e.g. a parallel-runner writer) starts its own on first use
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            for dest in self._destinations.values():
+                dest.pending = []
+                dest.start()
+            self._pid = os.getpid()
+
+    def _enqueue(self, dest: _Destination, lines: List[bytes]) -> None:
+        """Buffer serialized envelopes for `dest`, queueing every full batch."""
+        self._ensure_started()
+        with self._lock:
+            dest.pending.extend(lines)
+            batches = []
+            while len(dest.pending) >= self.batch_size:
+                batches.append(dest.pending[: self.batch_size])
+                del dest.pending[: self.batch_size]
+        for batch in batches:
+            dest.queue.put((b"\n".join(batch), len(batch)))  # blocks when this destination lags
+
+    # ── SplunkHECSender interface ────────────────────────────
+    def serialize_event(
+        self,
+        event: Dict[str, Any],
+        sourcetype: str = "attack_sim",
+        source: str = "detection_lab",
+    ) -> str:
+        dest, index = self.route(sourcetype)
+        return dest.sender.serialize_event(event, sourcetype, source, index=index)
+
+    def send_event(
+        self,
+        event: Dict[str, Any],
+        sourcetype: str = "attack_sim",
+        source: str = "detection_lab",
+        host: Optional[str] = None,
+    ) -> bool:
+        if host:
+            event = {**event, "hostname": host}
+        self.send_batch([event], sourcetype, source)
+        return True
+
+    def send_batch(
+        self,
+        events: List[Dict[str, Any]],
+        sourcetype: str = "attack_sim",
+        source: str = "detection_lab",
+    ) -> Dict[str, int]:
+        """Queue events of one sourcetype; delivery is reported by get_stats() after flush()."""
+        dest, _ = self.route(sourcetype)
+        self._enqueue(dest, [self.serialize_event(e, sourcetype, source).encode() for e in events])
+        return {"sent": 0, "failed": 0, "queued": len(events)}
+
+    def send_tagged_batch(
+        self,
+        tagged_events: List[Tuple[str, Dict[str, Any]]],
+        source: str = "detection_lab",
+    ) -> Dict[str, int]:
+        """Queue a mixed-sourcetype stream; order is preserved per destination."""
+        grouped = defaultdict(list)
+        for sourcetype, event in tagged_events:
+            grouped[self.route(sourcetype)[0]].append(self.serialize_event(event, sourcetype, source).encode())
+        for dest, lines in grouped.items():
+            self._enqueue(dest, lines)
+        return {"sent": 0, "failed": 0, "queued": len(tagged_events)}
+
+    def send_serialized(self, payload, count: int) -> bool:
+        """
+        Queue pre-serialized envelopes (from serialize_event or with their
+        index already taken from index_for), routed by each line's sourcetype.
+        """
+        grouped = defaultdict(list)
+        for line in bytes(payload).split(b"\n"):
+            if not line:
+                continue
+            match = _ENVELOPE_SOURCETYPE.search(line)
+            grouped[self.route(match.group(1).decode() if match else "*")[0]].append(line)
+        for dest, lines in grouped.items():
+            self._enqueue(dest, lines)
+        return True
+
+    def flush(self) -> None:
+        """Queue partial batches and wait until every destination has posted them."""
+        if self._pid != os.getpid():
+            return
+        for dest in self._destinations.values():
+            with self._lock:
+                batch, dest.pending = dest.pending, []
+            if batch:
+                dest.queue.put((b"\n".join(batch), len(batch)))
+        for dest in self._destinations.values():
+            dest.queue.join()
+
+    def close(self) -> None:
+        """Flush, then stop the sender threads."""
+        self.flush()
+        if self._pid != os.getpid():
+            return
+        for dest in self._destinations.values():
+            dest.queue.put(_STOP)
+            dest.thread.join()
+        self._pid = None
+
+    # ── Metrics ──────────────────────────────────────────────
+    def get_stats(self) -> Dict[str, int]:
+        sent = sum(d.sender.events_sent for d in self._destinations.values())
+        failed = sum(d.sender.events_failed for d in self._destinations.values())
+        return {"events_sent": sent, "events_failed": failed, "total_attempted": sent + failed}
+
+    def destination_stats(self) -> List[Dict[str, Any]]:
+        """Per-destination counts with the sourcetypes and indexes routed to each."""
+        stats = []
+        for dest in self._destinations.values():
+            routes = sorted(f"{st}→{index}" for st, (d, index) in self._routes.items() if d is dest)
+            token = dest.sender.headers["Authorization"].split(" ", 1)[-1]
+            stats.append({
+                "endpoint": f"{dest.sender.hec_url} (token …{token[-4:]})",
+                "routes": routes,
+                **dest.sender.get_stats(),
+            })
+        return stats
@@ -29,6 +29,23 @@ class LogFormatter:
 
     SUPPORTED_FORMATS = ("syslog", "json", "cef")
 
+    # Event fields mapped to CEF extension keys (src, dst, act, msg, etc.)
+    CEF_KEY_MAP = {
+        "src_ip": "src",
+        "dst_ip": "dst",
+        "src_port": "spt",
+        "dst_port": "dpt",
+        "username": "duser",
+        "action": "act",
+        "message": "msg",
+        "protocol": "proto",
+        "hostname": "dhost",
+        "url": "request",
+        "bytes_out": "out",
+        "bytes_in": "in",
+        "sample_weight": "cfp1",
+    }
+
     def __init__(self, format_type: str = "json"):
         if format_type not in self.SUPPORTED_FORMATS:
             raise ValueError(
@@ -102,24 +119,9 @@ class LogFormatter:
         name = event.get("event_type", "SecurityEvent")
         severity = event.get("severity", 5)
 
-        # Build CEF extension from remaining fields
-        cef_key_map = {
-            "src_ip": "src",
-            "dst_ip": "dst",
-            "src_port": "spt",
-            "dst_port": "dpt",
-            "username": "duser",
-            "action": "act",
-            "message": "msg",
-            "protocol": "proto",
-            "hostname": "dhost",
-            "url": "request",
-            "bytes_out": "out",
-            "bytes_in": "in",
-        }
-
+        # Build CEF extension from mapped fields
         extensions = []
-        for event_key, cef_key in cef_key_map.items():
+        for event_key, cef_key in self.CEF_KEY_MAP.items():
             if event_key in event:
                 extensions.append(f"{cef_key}={event[event_key]}")
 
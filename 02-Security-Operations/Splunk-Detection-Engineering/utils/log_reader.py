@@ -0,0 +1,234 @@
+"""
+log_reader.py — Memory-Mapped Reader for Generated Log Files
+
+Reads the files written by the generators back in, in any of the three
+`LogFormatter` formats, without loading them into memory: lines are
+sliced out of an mmap as bytes.
+
+Two levels of access:
+    - Field extraction (`line_timestamp`, `line_field`) pulls a single
+      value out of a raw line with a couple of `find()` calls and no
+      parsing — the fast path for replaying or routing lines unchanged.
+    - `parse_line` / `read_events` rebuild event dicts for offline
+      analysis. JSON is exact; syslog and CEF are reconstructed from
+      their key=value extensions (numbers and booleans are restored,
+      fields CEF does not carry are absent).
+
+Usage:
+    from utils.log_reader import iter_lines, detect_format, read_events
+
+    for event in read_events(config.LOG_DIR / "brute_force.log"):
+        ...
+"""
+
+import re
+import json
+import mmap
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+import config
+from utils.log_formatter import LogFormatter
+
+FORMATS = LogFormatter.SUPPORTED_FORMATS
+CEF_FIELDS = {cef_key: event_key for event_key, cef_key in LogFormatter.CEF_KEY_MAP.items()}
+
+_SYSLOG_HEADER = re.compile(rb"^<(\d+)>(\S+) (\S+) ([^\[\s]+)\[(\d+)\]: ?")
+_SYSLOG_PAIR = re.compile(r'(?:^| )(\w+)=("[^"]*"|\S*)')
+_CEF_PAIR = re.compile(r"(?:^| )(" + "|".join(list(CEF_FIELDS) + ["rt"]) + r")=")
+_INT = re.compile(r"^-?\d+$")
+_FLOAT = re.compile(r"^-?\d+\.\d+$")
+
+
+# ── Log directory ────────────────────────────────────────────
+# The standalone simulators name their files after the generator; the
+# run_all_generators modes after the registry key. Both sets can sit in
+# LOG_DIR and hold the same traffic.
+SAME_TRAFFIC = {
+    "data_exfiltration.log": ("data_exfil.log",),
+    "malware_callback.log": ("malware_c2_http.log", "malware_c2_dns.log"),
+}
+
+
+def default_files(log_dir: Union[str, Path, None] = None) -> List[Path]:
+    """
+    Every generator log in `log_dir` (default: config.LOG_DIR), except
+    combined.log which duplicates them, and the older side of any
+    SAME_TRAFFIC pair present under both names.
+    """
+    log_dir = Path(log_dir) if log_dir else config.LOG_DIR
+    paths = {p.name: p for p in log_dir.glob("*.log") if p.name != "combined.log"}
+    for legacy, current in SAME_TRAFFIC.items():
+        present = [name for name in current if name in paths]
+        if legacy not in paths or not present:
+            continue
+        if paths[legacy].stat().st_mtime > max(paths[name].stat().st_mtime for name in present):
+            for name in present:
+                del paths[name]
+        else:
+            del paths[legacy]
+    return sorted(paths.values())
+
+
+# ── Raw line access ──────────────────────────────────────────
+def iter_lines(path: Union[str, Path]) -> Iterator[bytes]:
+    """Yield every non-empty line of `path` (without its newline) from an mmap."""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with data:
+            size = len(data)
+            pos = 0
+            find = data.find
+            while pos < size:
+                end = find(b"\n", pos)
+                if end == -1:
+                    end = size
+                if end > pos:
+                    line = data[pos:end]
+                    yield line[:-1] if line.endswith(b"\r") else line
+                pos = end + 1
+
+
+def last_line(path: Union[str, Path]) -> Optional[bytes]:
+    """The final non-empty line of `path` (the newest event of a time-ordered file)."""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+        with data:
+            end = len(data)
+            while end > 0 and data[end - 1] in b"\r\n":
+                end -= 1
+            if end == 0:
+                return None
+            start = data.rfind(b"\n", 0, end) + 1
+            return data[start:end]
+
+
+def detect_format(line: bytes) -> str:
+    """Identify the LogFormatter format of one line."""
+    if line.startswith(b"{"):
+        return "json"
+    if line.startswith(b"CEF:"):
+        return "cef"
+    if line.startswith(b"<"):
+        return "syslog"
+    raise ValueError(f"Unrecognized log line format: {line[:60]!r}")
+
+
+def line_timestamp(line: bytes, fmt: str) -> Optional[bytes]:
+    """The ISO-8601 event timestamp of a raw line, as bytes."""
+    if fmt == "json":
+        return _json_string(line, b'"timestamp": "')
+    if fmt == "syslog":
+        start = line.find(b">") + 1
+        end = line.find(b" ", start)
+        return line[start:end] if start and end != -1 else None
+    start = line.rfind(b" rt=")
+    if start == -1:
+        return None
+    end = line.find(b" ", start + 4)
+    return line[start + 4 :] if end == -1 else line[start + 4 : end]
+
+
+def line_field(line: bytes, key: str, fmt: str) -> Optional[bytes]:
+    """
+    A single string field of a raw line without parsing the rest, or None.
+    Values containing the field delimiter are not supported (use parse_line).
+    """
+    if fmt == "json":
+        return _json_string(line, b'"%s": "' % key.encode())
+    if fmt == "syslog" and key == "hostname":
+        match = _SYSLOG_HEADER.match(line)
+        return match.group(3) if match else None
+    if fmt == "cef":
+        key = LogFormatter.CEF_KEY_MAP.get(key, key)
+    marker = b" %s=" % key.encode()
+    start = line.find(marker)
+    if start == -1:
+        return None
+    start += len(marker)
+    if line[start : start + 1] == b'"':
+        end = line.find(b'"', start + 1)
+        return line[start + 1 : end] if end != -1 else None
+    end = line.find(b" ", start)
+    return line[start:] if end == -1 else line[start:end]
+
+
+def _json_string(line: bytes, marker: bytes) -> Optional[bytes]:
+    start = line.find(marker)
+    if start == -1:
+        return None
+    start += len(marker)
+    end = line.find(b'"', start)
+    return line[start:end] if end != -1 else None
+
+
+# ── Event reconstruction ─────────────────────────────────────
+def _coerce(value: str) -> Any:
+    if value in ("True", "False"):
+        return value == "True"
+    if _INT.match(value):
+        return int(value)
+    if _FLOAT.match(value):
+        return float(value)
+    return value
+
+
+def parse_line(line: Union[bytes, str], fmt: Optional[str] = None) -> Dict[str, Any]:
+    """Rebuild an event dict from one formatted line."""
+    if isinstance(line, str):
+        line = line.encode("utf-8")
+    fmt = fmt or detect_format(line)
+
+    if fmt == "json":
+        return json.loads(line)
+
+    if fmt == "syslog":
+        match = _SYSLOG_HEADER.match(line)
+        if not match:
+            raise ValueError(f"Malformed syslog line: {line[:60]!r}")
+        priority, timestamp, hostname, process, pid = match.groups()
+        rest = line[match.end():].decode("utf-8", errors="replace")
+        event = {
+            "timestamp": timestamp.decode(),
+            "hostname": hostname.decode(),
+            "process": process.decode(),
+            "pid": int(pid),
+            "severity": int(priority) % 8,
+        }
+        pairs = list(_SYSLOG_PAIR.finditer(rest))
+        event["message"] = rest[: pairs[0].start()].strip() if pairs else rest.strip()
+        for pair in pairs:
+            value = pair.group(2)
+            event[pair.group(1)] = value[1:-1] if value.startswith('"') else _coerce(value)
+        return event
+
+    # CEF:0|Vendor|Product|Version|SignatureID|Name|Severity|Extension
+    header = line.decode("utf-8", errors="replace").split("|", 7)
+    if len(header) != 8:
+        raise ValueError(f"Malformed CEF line: {line[:60]!r}")
+    event = {"event_type": header[5], "severity": _coerce(header[6])}
+    extension = header[7]
+    keys = list(_CEF_PAIR.finditer(extension))
+    for i, match in enumerate(keys):
+        end = keys[i + 1].start() if i + 1 < len(keys) else len(extension)
+        value = extension[match.end() : end]
+        key = match.group(1)
+        if key == "rt":
+            event["timestamp"] = value
+        else:
+            event[CEF_FIELDS[key]] = value if key == "msg" else _coerce(value)
+    return event
+
+
+def read_events(path: Union[str, Path], fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream event dicts from a generated log file (format detected from the first line)."""
+    for line in iter_lines(path):
+        if fmt is None:
+            fmt = detect_format(line)
+        yield parse_line(line, fmt)
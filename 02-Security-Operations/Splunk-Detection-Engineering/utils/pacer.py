@@ -0,0 +1,153 @@
+"""
+pacer.py — Real-Time Event Pacing
+
+Holds an event stream to a wall-clock schedule so generators can emit
+events stamped "now" at a steady, configurable events-per-second rate
+(indexer soak tests, alert-latency measurement).
+
+Pacing design:
+    - Every event has an absolute deadline (start + offset), so sleep
+      overshoot never accumulates into drift.
+    - Coarse waits use time.sleep(); the final stretch before a
+      deadline is busy-waited on perf_counter_ns() for microsecond
+      accuracy (configurable, set spin_us=0 to disable).
+    - If the producer falls behind, events are released immediately and
+      the lag is recorded; lag beyond `max_catchup_s` rebases the
+      schedule instead of bursting to catch up.
+    - Achieved EPS is measured over the schedule span (start to the last
+      release), so work after the last event (flushes, closing files,
+      summaries) does not count against the rate.
+
+Usage:
+    from utils.pacer import Pacer
+
+    pacer = Pacer(eps=500)
+    pacer.start()
+    for event in events:
+        pacer.wait_next()
+        send(event)
+    print(pacer.report())
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+
+class Pacer:
+    """
+    Release events on an absolute wall-clock schedule and measure how
+    closely the producer kept up with it.
+    """
+
+    def __init__(
+        self,
+        eps: Optional[float] = None,
+        spin_us: int = 200,
+        late_tolerance_us: int = 1000,
+        max_catchup_s: float = 5.0,
+    ):
+        if eps is not None and eps <= 0:
+            raise ValueError(f"Target EPS must be positive, got {eps}")
+        self.eps = eps
+        self.spin_ns = spin_us * 1000
+        self.late_tolerance_ns = late_tolerance_us * 1000
+        self.max_catchup_ns = int(max_catchup_s * 1e9)
+
+        self._start_ns = 0
+        self._anchor_ns = 0        # start() instant; rebases shift _start_ns only
+        self._last_release_ns = 0
+        self._last_offset_s = 0.0
+
+        # Tracking metrics
+        self.events = 0
+        self.late_events = 0
+        self.rebases = 0
+        self.max_lag_ns = 0
+        self.total_lag_ns = 0
+        self.total_error_ns = 0  # |release - deadline| for on-time events
+        self.total_wait_ns = 0   # time spent sleeping/spinning until deadlines
+        self.on_time_events = 0
+
+    def start(self) -> None:
+        """Anchor the schedule to the current instant."""
+        self._start_ns = self._anchor_ns = time.perf_counter_ns()
+
+    def wait_next(self) -> int:
+        """Wait for the next slot of the fixed-rate schedule (requires `eps`)."""
+        if self.eps is None:
+            raise ValueError("wait_next() needs a target eps; use wait_until() for explicit offsets")
+        return self.wait_until((self.events + 1) / self.eps)
+
+    def wait_until(self, offset_s: float) -> int:
+        """
+        Block until `offset_s` seconds after start().
+
+        Returns:
+            Lag in nanoseconds if the deadline had already passed, else 0
+        """
+        if not self._start_ns:
+            self.start()
+        self._last_offset_s = offset_s
+        self.events += 1
+
+        deadline = self._start_ns + int(offset_s * 1e9)
+        entered = time.perf_counter_ns()
+        remaining = deadline - entered
+
+        if remaining <= 0:
+            lag = -remaining
+            self._last_release_ns = deadline + lag
+            self.total_lag_ns += lag
+            self.max_lag_ns = max(self.max_lag_ns, lag)
+            if lag > self.late_tolerance_ns:
+                self.late_events += 1
+            if lag > self.max_catchup_ns:
+                # Too far behind: shift the schedule rather than burst
+                self._start_ns += lag
+                self.rebases += 1
+            return lag
+
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while time.perf_counter_ns() < deadline:
+            pass
+        self._last_release_ns = time.perf_counter_ns()
+        self.total_error_ns += self._last_release_ns - deadline
+        self.total_wait_ns += self._last_release_ns - entered
+        self.on_time_events += 1
+        return 0
+
+    def elapsed_s(self) -> float:
+        """Seconds since start()."""
+        return (time.perf_counter_ns() - self._anchor_ns) / 1e9 if self._anchor_ns else 0.0
+
+    def span_s(self) -> float:
+        """Seconds from start() to the last release."""
+        return (self._last_release_ns - self._anchor_ns) / 1e9 if self._last_release_ns else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """Achieved vs. target rate and schedule-keeping statistics."""
+        elapsed = self.elapsed_s()
+        span = self.span_s()
+        target = self.eps
+        if target is None and self._last_offset_s > 0:
+            target = self.events / self._last_offset_s
+        achieved = self.events / span if span > 0 else 0.0
+        return {
+            "events": self.events,
+            "elapsed_s": round(elapsed, 3),
+            "span_s": round(span, 3),
+            "wait_s": round(self.total_wait_ns / 1e9, 3),
+            "target_eps": round(target or 0.0, 1),
+            "achieved_eps": round(achieved, 1),
+            "achieved_pct": round(100 * achieved / target, 1) if target else 0.0,
+            "late_events": self.late_events,
+            "late_pct": round(100 * self.late_events / self.events, 2) if self.events else 0.0,
+            "max_lag_ms": round(self.max_lag_ns / 1e6, 3),
+            "mean_lag_ms": round(self.total_lag_ns / self.events / 1e6, 3) if self.events else 0.0,
+            "mean_release_error_us": (
+                round(self.total_error_ns / self.on_time_events / 1e3, 1)
+                if self.on_time_events else 0.0
+            ),
+            "rebases": self.rebases,
+        }
@@ -0,0 +1,138 @@
+"""
+sampler.py — Stratified Sampling / Thinning for High-Volume Traffic
+
+Keeps every malicious event (or whatever the rules say) and only a
+representative fraction of the background, so quick regression runs
+cost a tenth of the CPU, disk and license of a full run.
+
+Rules are per dimension and multiply:
+    label       benign / malicious           e.g. "benign=0.05"
+    sourcetype  the generator's sourcetype   e.g. "sourcetype:attack_sim:web=0.2"
+    host        the event's hostname         e.g. "host:dc-01=0.5", "host:*=0.1"
+
+Each kept event gets `sample_weight = 1 / rate` (the number of original
+events it stands for), so counts and sums can be re-scaled with
+`stats sum(sample_weight)` instead of `count`.
+
+Label and sourcetype are known before an event is built, so generators
+consult `admit()` first and skip generating events that would be thrown
+away; the host stage runs on the finished event.
+
+Usage:
+    from utils.sampler import StratifiedSampler
+
+    sampler = StratifiedSampler.from_specs(["benign=0.05"], seed=7)
+    generator.sampler = sampler            # thinning inside iter_events()
+    kept = list(sampler.filter(events, sourcetype="attack_sim:auth"))   # or on existing events
+"""
+
+import random
+from collections import Counter
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+LABELS = ("benign", "malicious")
+
+
+class StratifiedSampler:
+    """
+    Bernoulli thinning with per-stratum rates and recorded weights.
+    """
+
+    DIMENSIONS = ("label", "sourcetype", "host")
+
+    def __init__(self, rates: Dict[str, Dict[str, float]], seed: Optional[int] = None):
+        for dimension, table in rates.items():
+            if dimension not in self.DIMENSIONS:
+                raise ValueError(f"Unknown sampling dimension '{dimension}'. Choose from: {self.DIMENSIONS}")
+            for value, rate in table.items():
+                if not 0.0 < rate <= 1.0:
+                    raise ValueError(f"Sampling rate for {dimension}:{value} must be in (0, 1], got {rate}")
+        self.rates = {dim: dict(rates.get(dim, {})) for dim in self.DIMENSIONS}
+        self._rng = random.Random(seed)
+        self.seen: Counter = Counter()   # (sourcetype, label) → events offered
+        self.kept: Counter = Counter()   # (sourcetype, label) → events kept
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str], seed: Optional[int] = None) -> "StratifiedSampler":
+        """
+        Build from CLI-style rules: "benign=0.05", "label:malicious=1",
+        "sourcetype:attack_sim:web=0.2", "host:*=0.1".
+        """
+        rates: Dict[str, Dict[str, float]] = {}
+        for spec in specs:
+            key, sep, value = spec.rpartition("=")
+            if not sep or not key:
+                raise ValueError(f"Sampling rule must look like 'dimension:value=rate', got '{spec}'")
+            if key in LABELS:
+                dimension, stratum = "label", key
+            else:
+                dimension, _, stratum = key.partition(":")
+            try:
+                rate = float(value)
+            except ValueError:
+                raise ValueError(f"Sampling rate in '{spec}' is not a number")
+            rates.setdefault(dimension, {})[stratum] = rate
+        return cls(rates, seed=seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Restart the decision sequence (per generator, for reproducible seeded runs)."""
+        self._rng.seed(seed)
+
+    @property
+    def active(self) -> bool:
+        return any(self.rates.values())
+
+    def rate(self, dimension: str, value: Optional[str]) -> float:
+        table = self.rates[dimension]
+        if not table:
+            return 1.0
+        return table.get(value, table.get("*", 1.0))
+
+    # ── Two-stage API (used inside generators) ───────────────
+    def admit(self, malicious: bool, sourcetype: str) -> Optional[float]:
+        """
+        Decide before generation. Returns the rate applied so far if the
+        event should be generated, or None to skip it.
+        """
+        label = LABELS[malicious]
+        self.seen[(sourcetype, label)] += 1
+        rate = self.rate("label", label) * self.rate("sourcetype", sourcetype)
+        if rate < 1.0 and self._rng.random() >= rate:
+            return None
+        return rate
+
+    def finalize(self, event: Dict[str, Any], rate: float, sourcetype: str) -> Optional[Dict[str, Any]]:
+        """Apply the host stage to a generated event and record its weight."""
+        host_rate = self.rate("host", event.get("hostname"))
+        if host_rate < 1.0 and self._rng.random() >= host_rate:
+            return None
+        rate *= host_rate
+        self.kept[(sourcetype, LABELS[bool(event.get("is_malicious"))])] += 1
+        event["sample_weight"] = round(1.0 / rate, 6)
+        return event
+
+    # ── One-shot API (already generated events) ──────────────
+    def sample(self, event: Dict[str, Any], sourcetype: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Keep or drop one existing event; kept events get `sample_weight`."""
+        sourcetype = sourcetype or event.get("sourcetype", "")
+        rate = self.admit(bool(event.get("is_malicious")), sourcetype)
+        return None if rate is None else self.finalize(event, rate, sourcetype)
+
+    def filter(self, events: Iterable[Dict[str, Any]], sourcetype: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        for event in events:
+            kept = self.sample(event, sourcetype)
+            if kept is not None:
+                yield kept
+
+    # ── Reporting ────────────────────────────────────────────
+    def report(self) -> List[Tuple[str, str, int, int]]:
+        """(sourcetype, label, seen, kept) per stratum, sorted."""
+        return [(st, label, self.seen[(st, label)], self.kept[(st, label)])
+                for st, label in sorted(self.seen)]
+
+    def print_report(self) -> None:
+        seen, kept = sum(self.seen.values()), sum(self.kept.values())
+        print(f"  Sampling:       kept {kept} of {seen} events "
+              f"({kept / max(seen, 1):.1%}, weights recorded in sample_weight)")
+        for sourcetype, label, s, k in self.report():
+            print(f"    {sourcetype:22s} {label:9s} {k:>9d} / {s:<9d} ({k / max(s, 1):.1%})")
@@ -0,0 +1,286 @@
+"""
+shm_ring.py — Shared-Memory Ring Buffer for Serialized Log Data
+
+Moves already-serialized log lines from generator worker processes to
+writer/sender processes without pickling. Each ring lives in one
+`multiprocessing.shared_memory` block: the producer copies a batch of
+bytes in once, and the consumer gets a memoryview straight into shared
+memory, which it can hand to `file.write()` without another copy.
+
+Design:
+    - Single producer, single consumer per ring. Parallel pipelines use
+      one ring per worker; a writer process may drain several rings.
+    - Records are variable-length and 16-byte aligned:
+          [length u32][count u32][stream u16][kind u8][pad] payload
+      A record that would straddle the end of the buffer is preceded by
+      a WRAP marker and written at offset 0 instead, so every payload
+      is contiguous (one memoryview, no reassembly).
+    - `head` (written only by the producer) and `tail` (written only by
+      the consumer) are monotonically increasing byte counters on
+      separate cache lines. Payload bytes are stored before `head` is
+      published, so the consumer never observes a partial record. This
+      relies on aligned 8-byte stores and store ordering, which x86-64
+      provides.
+    - Backpressure: `put()` blocks with exponential backoff while the
+      ring is full and records how long it waited, so a slow sink
+      throttles generation instead of growing memory.
+    - Shutdown: the producer calls `close_writer()` once it is done; the
+      consumer sees `drained` after reading the last record. Either side
+      (or the parent) can `abort()`, which makes blocked producers raise
+      RingClosed and consumers stop, so no process is left waiting.
+
+Usage:
+    from utils.shm_ring import ShmRing, KIND_LINES
+
+    ring = ShmRing.create(capacity=16 * 1024 * 1024)      # parent
+    producer = ShmRing.attach(ring.name)                  # worker
+    producer.put(b"line 1\\nline 2\\n", stream=0, count=2)
+    producer.close_writer()
+
+    for record in ShmRing.attach(ring.name).records():    # writer
+        out_file.write(record.data)
+    ring.unlink()
+"""
+
+import time
+import struct
+from collections import namedtuple
+from multiprocessing import shared_memory
+from typing import Iterator, Optional
+
+RING_MAGIC = 0x52494E4731484D53  # "SMH1GNIR"
+RECORD_HEADER = struct.Struct("=IIHB5x")  # payload length, line count, stream id, kind
+ALIGN = RECORD_HEADER.size  # 16
+CONTROL_BYTES = 256
+
+# Control words (uint64 indexes into the control block)
+_HEAD, _WRITER_DONE = 0, 1          # producer-owned cache line
+_TAIL, _ABORT = 8, 9                # consumer-owned cache line
+_MAGIC, _CAPACITY = 16, 17          # written once at creation
+
+# Record kinds (callers may define their own values below KIND_WRAP)
+KIND_LINES = 0
+KIND_HEC = 1
+KIND_WRAP = 0xFF
+
+RingRecord = namedtuple("RingRecord", ["stream", "kind", "count", "data"])
+
+
+class RingClosed(Exception):
+    """Raised by a producer when the ring was aborted."""
+
+
+class ShmRing:
+    """
+    Byte ring in a named shared-memory block, for exactly one producer
+    process and one consumer process.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self._ctrl = shm.buf[:CONTROL_BYTES].cast("Q")
+        if self._ctrl[_MAGIC] != RING_MAGIC:
+            self._ctrl.release()
+            raise ValueError(f"Shared memory block '{shm.name}' is not a ring buffer")
+        self.capacity = self._ctrl[_CAPACITY]
+        self._data = shm.buf[CONTROL_BYTES : CONTROL_BYTES + self.capacity]
+        self._pending = 0  # bytes of the record handed out by try_read()
+        self._pending_view = None
+
+        # Per-process backpressure/idle statistics
+        self.full_waits = 0
+        self.blocked_s = 0.0
+        self.empty_polls = 0
+
+    @classmethod
+    def create(cls, capacity: int = 16 * 1024 * 1024) -> "ShmRing":
+        """Allocate a new ring; the creator is responsible for `unlink()`."""
+        capacity = -(-capacity // ALIGN) * ALIGN
+        if capacity < 4 * ALIGN:
+            raise ValueError(f"Ring capacity too small: {capacity} bytes")
+        shm = shared_memory.SharedMemory(create=True, size=CONTROL_BYTES + capacity)
+        ctrl = shm.buf[:CONTROL_BYTES].cast("Q")
+        for i in range(len(ctrl)):
+            ctrl[i] = 0
+        ctrl[_CAPACITY] = capacity
+        ctrl[_MAGIC] = RING_MAGIC
+        ctrl.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRing":
+        """Map an existing ring created by another process."""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    # ── State ────────────────────────────────────────────────
+    @property
+    def used(self) -> int:
+        return self._ctrl[_HEAD] - self._ctrl[_TAIL]
+
+    @property
+    def aborted(self) -> bool:
+        return bool(self._ctrl[_ABORT])
+
+    @property
+    def writer_closed(self) -> bool:
+        """True once the producer called close_writer() (it never does if it was killed)."""
+        return bool(self._ctrl[_WRITER_DONE])
+
+    @property
+    def drained(self) -> bool:
+        """True once the producer has finished and every record was consumed."""
+        # Check the flag before head: a record published just before the
+        # flag was set is then guaranteed to be visible.
+        return bool(self._ctrl[_WRITER_DONE]) and self._ctrl[_HEAD] == self._ctrl[_TAIL]
+
+    def close_writer(self) -> None:
+        """Producer side: no more records will be written."""
+        self._ctrl[_WRITER_DONE] = 1
+
+    def abort(self) -> None:
+        """Stop both sides; blocked producers raise RingClosed."""
+        self._ctrl[_ABORT] = 1
+
+    # ── Producer ─────────────────────────────────────────────
+    def put(self, data, stream: int = 0, count: int = 1, kind: int = KIND_LINES,
+            timeout: Optional[float] = None) -> bool:
+        """
+        Append one record, blocking while the ring is full.
+
+        Args:
+            data:    bytes-like payload (typically many newline-terminated lines)
+            stream:  Caller-defined stream id (e.g. generator index)
+            count:   Number of events in the payload, for consumer accounting
+            kind:    Caller-defined record type (KIND_LINES, KIND_HEC, ...)
+            timeout: Give up after this many seconds of backpressure
+
+        Returns:
+            True if written, False on timeout
+
+        Raises:
+            RingClosed if the ring was aborted
+        """
+        length = len(data)
+        size = ALIGN + -(-length // ALIGN) * ALIGN
+        capacity = self.capacity
+        if size > capacity:
+            raise ValueError(f"Record of {length} bytes exceeds ring capacity {capacity}")
+
+        ctrl = self._ctrl
+        head = ctrl[_HEAD]
+        pos = head % capacity
+        contiguous = capacity - pos
+        needed = size if size <= contiguous else contiguous + size
+
+        if capacity - (head - ctrl[_TAIL]) < needed:
+            if not self._wait_for_space(needed, timeout):
+                return False
+        if ctrl[_ABORT]:
+            raise RingClosed(self.name)
+
+        if size > contiguous:
+            RECORD_HEADER.pack_into(self._data, pos, 0, 0, 0, KIND_WRAP)
+            head += contiguous
+            pos = 0
+        RECORD_HEADER.pack_into(self._data, pos, length, count, stream, kind)
+        self._data[pos + ALIGN : pos + ALIGN + length] = data
+        ctrl[_HEAD] = head + size  # publish
+        return True
+
+    def _wait_for_space(self, needed: int, timeout: Optional[float]) -> bool:
+        ctrl = self._ctrl
+        capacity = self.capacity
+        delay = 20e-6
+        start = time.perf_counter()
+        self.full_waits += 1
+        try:
+            while capacity - (ctrl[_HEAD] - ctrl[_TAIL]) < needed:
+                if ctrl[_ABORT]:
+                    raise RingClosed(self.name)
+                if timeout is not None and time.perf_counter() - start >= timeout:
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 2e-3)
+            return True
+        finally:
+            self.blocked_s += time.perf_counter() - start
+
+    # ── Consumer ─────────────────────────────────────────────
+    def try_read(self) -> Optional[RingRecord]:
+        """
+        Return the next record without blocking, or None if the ring is
+        empty. `record.data` is a view into shared memory and is only
+        valid until `release()` is called.
+        """
+        if self._pending:
+            raise RuntimeError("release() the previous record before reading the next")
+        ctrl = self._ctrl
+        capacity = self.capacity
+        while True:
+            tail = ctrl[_TAIL]
+            if ctrl[_HEAD] == tail:
+                self.empty_polls += 1
+                return None
+            pos = tail % capacity
+            length, count, stream, kind = RECORD_HEADER.unpack_from(self._data, pos)
+            if kind == KIND_WRAP:
+                ctrl[_TAIL] = tail + (capacity - pos)
+                continue
+            self._pending = ALIGN + -(-length // ALIGN) * ALIGN
+            self._pending_view = self._data[pos + ALIGN : pos + ALIGN + length]
+            return RingRecord(stream, kind, count, self._pending_view)
+
+    def release(self) -> None:
+        """
+        Hand the space of the last record returned by try_read() back to
+        the producer. The record's view is released with it.
+        """
+        if self._pending:
+            self._pending_view.release()
+            self._pending_view = None
+            self._ctrl[_TAIL] = self._ctrl[_TAIL] + self._pending
+            self._pending = 0
+
+    def records(self, poll_max_s: float = 2e-3) -> Iterator[RingRecord]:
+        """
+        Blocking iterator over records until the producer finishes (or
+        the ring is aborted). Each record's view is released when the
+        loop advances, so do not keep references to `record.data`.
+        """
+        delay = 20e-6
+        while not self.aborted:
+            record = self.try_read()
+            if record is None:
+                if self.drained:
+                    return
+                time.sleep(delay)
+                delay = min(delay * 2, poll_max_s)
+                continue
+            delay = 20e-6
+            try:
+                yield record
+            finally:
+                self.release()
+
+    # ── Teardown ─────────────────────────────────────────────
+    def close(self) -> None:
+        """Unmap the ring in this process."""
+        self.release()
+        self._data.release()
+        self._ctrl.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Close and destroy the shared-memory block (creator only)."""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def stats(self) -> dict:
+        return {
+            "full_waits": self.full_waits,
+            "blocked_s": round(self.blocked_s, 3),
+            "empty_polls": self.empty_polls,
+        }
@@ -20,7 +20,7 @@ Usage:
 import json
 import time
 import requests
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 import urllib3
@@ -88,12 +88,9 @@ class SplunkHECSender:
         }
 
         # Use event timestamp if available
-        if "timestamp" in event:
-            try:
-                dt = datetime.fromisoformat(event["timestamp"].replace("Z", "+00:00"))
-                payload["time"] = dt.timestamp()
-            except (ValueError, AttributeError):
-                pass  # Let Splunk use ingestion time
+        event_time = self._event_time(event)
+        if event_time is not None:
+            payload["time"] = event_time
 
         return self._post_with_retry(json.dumps(payload))
 
@@ -141,7 +138,100 @@ class SplunkHECSender:
         self.events_failed += results["failed"]
         return results
 
-    def _post_with_retry(self, payload: str) -> bool:
+    def send_tagged_batch(
+        self,
+        tagged_events: List[Tuple[str, Dict[str, Any]]],
+        source: str = "detection_lab",
+    ) -> Dict[str, int]:
+        """
+        Send a time-ordered stream that mixes sourcetypes, preserving
+        event order inside each POST.
+
+        Args:
+            tagged_events: (sourcetype, event) pairs, e.g. from
+                           utils.stream_merge.merge_event_streams()
+
+        Returns:
+            Dictionary with 'sent' and 'failed' counts
+        """
+        results = {"sent": 0, "failed": 0}
+
+        for i in range(0, len(tagged_events), self.batch_size):
+            batch = tagged_events[i : i + self.batch_size]
+            payload_lines = []
+
+            for sourcetype, event in batch:
+                payload_lines.append(self.serialize_event(event, sourcetype, source))
+
+            if self._post_with_retry("\n".join(payload_lines)):
+                results["sent"] += len(batch)
+            else:
+                results["failed"] += len(batch)
+
+        self.events_sent += results["sent"]
+        self.events_failed += results["failed"]
+        return results
+
+    def serialize_event(
+        self,
+        event: Dict[str, Any],
+        sourcetype: str = "attack_sim",
+        source: str = "detection_lab",
+        index: Optional[str] = None,
+    ) -> str:
+        """
+        Build the HEC JSON envelope for one event, so it can be produced
+        in one process and POSTed later by another (see send_serialized).
+        """
+        entry = {
+            "index": index or self.index,
+            "sourcetype": sourcetype,
+            "source": source,
+            "host": event.get("hostname", "detection-lab"),
+            "event": event,
+        }
+        event_time = self._event_time(event)
+        if event_time is not None:
+            entry["time"] = event_time
+        return json.dumps(entry)
+
+    def send_serialized(self, payload, count: int) -> bool:
+        """
+        POST a batch that was already serialized with serialize_event()
+        and newline-joined (bytes-like, e.g. a shared-memory view).
+
+        Args:
+            payload: Newline-delimited HEC envelopes
+            count:   Number of events in the payload, for the send metrics
+
+        Returns:
+            True if Splunk accepted the batch
+        """
+        if self._post_with_retry(bytes(payload)):
+            self.events_sent += count
+            return True
+        self.events_failed += count
+        return False
+
+    def index_for(self, sourcetype: str) -> str:
+        """Index events of `sourcetype` go to (one index for all; see HECRouter)."""
+        return self.index
+
+    def flush(self) -> None:
+        """Sends are synchronous — nothing to wait for (HECRouter queues them)."""
+
+    @staticmethod
+    def _event_time(event: Dict[str, Any]) -> Optional[float]:
+        """Epoch seconds from the event's ISO timestamp, or None to use ingestion time."""
+        if "timestamp" not in event:
+            return None
+        try:
+            dt = datetime.fromisoformat(event["timestamp"].replace("Z", "+00:00"))
+            return dt.timestamp()
+        except (ValueError, AttributeError):
+            return None
+
+    def _post_with_retry(self, payload) -> bool:
         """POST to HEC with exponential backoff retry on failure."""
         for attempt in range(1, self.max_retries + 1):
             try:
@@ -0,0 +1,48 @@
+"""
+stream_merge.py — Time-Ordered Merge of Generator Streams
+
+Combines several individually sorted event streams into one stream
+ordered by timestamp using a k-way heap merge: only one pending event
+per input is held in memory, so the merged feed never needs a global
+re-sort.
+
+Timestamps are the fixed-width ISO-8601 strings the generators emit
+("%Y-%m-%dT%H:%M:%S.%fZ"), so lexicographic order is time order.
+
+Usage:
+    from utils.stream_merge import merge_event_streams
+
+    streams = {"attack_sim:auth": auth_gen.iter_events(),
+               "attack_sim:web":  web_gen.iter_events()}
+    for sourcetype, event in merge_event_streams(streams):
+        ...
+"""
+
+import heapq
+from typing import Dict, Any, Iterable, Iterator, Tuple
+
+
+def _tagged(tag: str, events: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for event in events:
+        yield tag, event
+
+
+def merge_event_streams(
+    streams: Dict[str, Iterable[Dict[str, Any]]],
+    time_field: str = "timestamp",
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Merge sorted event streams into a single time-ordered stream.
+
+    Args:
+        streams:    Mapping of tag (e.g. generator name) → sorted event iterable
+        time_field: Event key holding the sortable timestamp
+
+    Yields:
+        (tag, event) pairs in ascending timestamp order; ties keep the
+        order in which the streams were given
+    """
+    return heapq.merge(
+        *(_tagged(tag, events) for tag, events in streams.items()),
+        key=lambda pair: pair[1][time_field],
+    )
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+syslog_receiver.py — Local Syslog Receiver for Benchmarking
+
+A minimal UDP/TCP syslog collector that only counts what arrives, used
+to measure `SyslogSender` throughput and loss without a real rsyslog or
+Splunk instance. TCP streams are de-framed (RFC 6587 octet counting or
+LF, detected per message) so the message count is exact; framing
+errors are reported separately.
+
+Usage:
+    python utils/syslog_receiver.py --protocol tcp --port 5514
+    python utils/syslog_receiver.py --protocol udp --port 5514 --rcvbuf 8388608 --duration 60
+"""
+
+import time
+import socket
+import argparse
+import selectors
+from typing import Dict, Optional
+
+UDP_MAX_DATAGRAM = 65535
+TCP_READ_BYTES = 1 << 20
+
+
+class SyslogReceiver:
+    """
+    Count syslog messages and bytes received over UDP or TCP.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5514,
+        protocol: str = "tcp",
+        rcvbuf: Optional[int] = None,
+    ):
+        if protocol not in ("udp", "tcp"):
+            raise ValueError(f"Unsupported protocol '{protocol}'. Choose from: ('udp', 'tcp')")
+        self.protocol = protocol
+        self.messages = 0
+        self.bytes = 0
+        self.framing_errors = 0
+        self.connections = 0
+
+        sock_type = socket.SOCK_DGRAM if protocol == "udp" else socket.SOCK_STREAM
+        self._sock = socket.socket(socket.AF_INET, sock_type)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if rcvbuf:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        self._sock.bind((host, port))
+        if protocol == "tcp":
+            self._sock.listen(64)
+        self._sock.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._sock, selectors.EVENT_READ)
+        self._buffers: Dict[socket.socket, bytearray] = {}
+        self._udp_buf = bytearray(UDP_MAX_DATAGRAM)
+
+    # ── Receive paths ────────────────────────────────────────
+    def _on_udp(self) -> None:
+        recv_into = self._sock.recv_into
+        while True:
+            try:
+                n = recv_into(self._udp_buf)
+            except BlockingIOError:
+                return
+            self.messages += 1
+            self.bytes += n
+
+    def _on_accept(self) -> None:
+        conn, _ = self._sock.accept()
+        conn.setblocking(False)
+        self._buffers[conn] = bytearray()
+        self._selector.register(conn, selectors.EVENT_READ)
+        self.connections += 1
+
+    def _on_tcp(self, conn: socket.socket) -> None:
+        try:
+            data = conn.recv(TCP_READ_BYTES)
+        except (BlockingIOError, InterruptedError):
+            return
+        except ConnectionError:
+            data = b""
+        if not data:
+            if self._buffers[conn]:
+                self.framing_errors += 1  # truncated trailing frame
+            self._selector.unregister(conn)
+            del self._buffers[conn]
+            conn.close()
+            return
+        self.bytes += len(data)
+        buf = self._buffers[conn]
+        buf += data
+        consumed = self._deframe(buf)
+        del buf[:consumed]
+
+    def _deframe(self, buf: bytearray) -> int:
+        """Count complete frames in `buf`; return the number of bytes consumed."""
+        pos, size = 0, len(buf)
+        while pos < size:
+            if 0x30 <= buf[pos] <= 0x39:
+                # Octet counting: "<len> <msg>"
+                space = buf.find(b" ", pos, pos + 12)
+                if space == -1:
+                    if size - pos >= 12:
+                        self.framing_errors += 1
+                        nl = buf.find(b"\n", pos)
+                        pos = size if nl == -1 else nl + 1
+                        continue
+                    break
+                try:
+                    length = int(buf[pos:space])
+                except ValueError:
+                    self.framing_errors += 1
+                    pos = space + 1
+                    continue
+                end = space + 1 + length
+                if end > size:
+                    break
+                pos = end
+            else:
+                # Non-transparent framing: message ends at LF
+                nl = buf.find(b"\n", pos)
+                if nl == -1:
+                    break
+                pos = nl + 1
+            self.messages += 1
+        return pos
+
+    # ── Main loop ────────────────────────────────────────────
+    def serve(self, duration: Optional[float] = None, report_interval: float = 1.0) -> None:
+        start = last = time.perf_counter()
+        last_messages, last_bytes = 0, 0
+        try:
+            while duration is None or time.perf_counter() - start < duration:
+                for key, _ in self._selector.select(timeout=report_interval):
+                    if key.fileobj is not self._sock:
+                        self._on_tcp(key.fileobj)
+                    elif self.protocol == "udp":
+                        self._on_udp()
+                    else:
+                        self._on_accept()
+                now = time.perf_counter()
+                if now - last >= report_interval:
+                    dt = now - last
+                    if self.messages != last_messages:
+                        print(f"  {(self.messages - last_messages) / dt:>12,.0f} msg/s  "
+                              f"{(self.bytes - last_bytes) / dt / 1e6:>8.1f} MB/s  "
+                              f"total {self.messages:,}")
+                    last, last_messages, last_bytes = now, self.messages, self.bytes
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+        self._print_summary(time.perf_counter() - start)
+
+    def close(self) -> None:
+        for conn in list(self._buffers):
+            conn.close()
+        self._buffers.clear()
+        self._selector.close()
+        self._sock.close()
+
+    def _print_summary(self, elapsed: float) -> None:
+        print(f"\n{'='*60}")
+        print(f"  Syslog receiver ({self.protocol.upper()}) summary")
+        print(f"    Messages:        {self.messages:,}")
+        print(f"    Bytes:           {self.bytes / 1e6:,.1f} MB")
+        print(f"    Connections:     {self.connections}")
+        print(f"    Framing errors:  {self.framing_errors}")
+        print(f"    Elapsed:         {elapsed:.1f}s")
+        print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count syslog messages for sender benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5514)
+    parser.add_argument("--protocol", choices=["udp", "tcp"], default="tcp")
+    parser.add_argument("--rcvbuf", type=int, default=None,
+                        help="SO_RCVBUF in bytes (raise it for UDP bursts)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after N seconds (default: until Ctrl+C)")
+    args = parser.parse_args()
+
+    receiver = SyslogReceiver(args.host, args.port, args.protocol, args.rcvbuf)
+    print(f"  Listening on {args.protocol}://{args.host}:{args.port} (Ctrl+C to stop)")
+    receiver.serve(duration=args.duration)
+
+
+if __name__ == "__main__":
+    main()